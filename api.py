@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""HTTP JSON/markdown API over the screening schedule (stdlib only).
+
+Endpoints (all GET):
+    /screenings   filtered screenings as JSON
+    /schedule.md  the same filter rendered as schedule markdown
+    /cinemas      cinema names with screening counts
+    /health       dataset size and age
+
+Filters: from, to (YYYY-MM-DD; default today .. today+6), min_time,
+max_time (HH:MM), cinema (repeatable or comma-separated), title
+(case-insensitive substring).
+
+Usage: python api.py [--host 127.0.0.1] [--port 8000] [--reload MINUTES]
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core import fetch_all_screenings
+from formatting import render_markdown
+from index import ScreeningIndex
+from schedule import build_schedule_view
+from screening import parse_minutes
+from titles import canonical_map
+
+QUERY_CACHE_SIZE = 256
+
+
+class BadRequest(ValueError):
+    """A query parameter could not be parsed."""
+
+
+class Dataset:
+    """
+    Screenings loaded once, their query index, and a per-query response cache.
+
+    Every load bumps version; cached responses and ETags of older versions
+    are dropped, so clients revalidating after a reload get the new data.
+    """
+
+    def __init__(self, loader=fetch_all_screenings):
+        self.loader = loader
+        self.version = 0
+        self.index = ScreeningIndex([])
+        self.titles = {}
+        self.status = []
+        self.loaded_at = 0.0
+        self._cache = OrderedDict()  # (version, key) -> (etag, content_type, body)
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        screenings, status = self.loader()
+        index = ScreeningIndex(screenings)
+        titles = canonical_map(screenings)
+        with self._lock:
+            self.index = index
+            self.titles = titles
+            self.status = status
+            self.loaded_at = time.time()
+            self.version += 1
+            self._cache.clear()
+
+    def response(self, path: str, query: str) -> tuple[str, str, bytes]:
+        """Return (etag, content_type, body) for a request, cached per query."""
+        params = parse_qs(query, keep_blank_values=False)
+        # The default date range moves at midnight, so the day is part of the key
+        normalized = tuple(sorted((name, tuple(values)) for name, values in params.items()))
+        key = (path, date.today(), normalized)
+        with self._lock:
+            version, index, titles = self.version, self.index, self.titles
+            cached = self._cache.get((version, key))
+            if cached is not None:
+                self._cache.move_to_end((version, key))
+                return cached
+
+        content_type, body = render(path, params, index, titles, self.loaded_at)
+        etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:20]}"'
+        entry = (etag, content_type, body)
+        with self._lock:
+            if version == self.version:
+                self._cache[(version, key)] = entry
+                while len(self._cache) > QUERY_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return entry
+
+
+def _one(params: dict, name: str) -> str | None:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _date(params: dict, name: str, default: date) -> date:
+    value = _one(params, name)
+    if value is None:
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"{name}: expected YYYY-MM-DD, got {value!r}")
+
+
+def _time(params: dict, name: str) -> str | None:
+    value = _one(params, name)
+    if value is not None and parse_minutes(value) < 0:
+        raise BadRequest(f"{name}: expected HH:MM, got {value!r}")
+    return value
+
+
+def select(params: dict, index: ScreeningIndex) -> tuple[date, date, list]:
+    """Apply the query-string filters to the index."""
+    today = date.today()
+    from_date = _date(params, "from", today)
+    to_date = _date(params, "to", from_date + timedelta(days=6))
+    cinemas = {name.strip() for value in params.get("cinema", []) for name in value.split(",")}
+    cinemas.discard("")
+
+    screenings = index.query(
+        from_date, to_date, _time(params, "min_time"), _time(params, "max_time"), cinemas or None
+    )
+    title = _one(params, "title")
+    if title:
+        title = title.lower()
+        screenings = [s for s in screenings if title in s.title.lower()]
+    return from_date, to_date, screenings
+
+
+def render(path: str, params: dict, index: ScreeningIndex, titles: dict[str, str],
+           loaded_at: float) -> tuple[str, bytes]:
+    """Build the (content_type, body) for an endpoint."""
+    if path == "/screenings":
+        from_date, to_date, screenings = select(params, index)
+        data = {
+            "from": from_date.isoformat(),
+            "to": to_date.isoformat(),
+            "count": len(screenings),
+            "screenings": [s.to_dict() for s in screenings],
+        }
+    elif path == "/schedule.md":
+        from_date, to_date, screenings = select(params, index)
+        text = render_markdown(build_schedule_view(screenings, from_date, to_date, titles))
+        return "text/markdown; charset=utf-8", text.encode("utf-8")
+    elif path == "/cinemas":
+        data = {cinema: len(index.by_cinema[cinema].records) for cinema in index.cinemas}
+    elif path == "/health":
+        data = {"screenings": len(index), "loaded_at": loaded_at}
+    else:
+        raise LookupError(path)
+    return "application/json", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for repeat clients
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            etag, content_type, body = self.server.dataset.response(url.path, url.query)
+        except BadRequest as e:
+            self._send(400, "application/json", json.dumps({"error": str(e)}).encode("utf-8"))
+            return
+        except LookupError:
+            self._send(404, "application/json", b'{"error": "not found"}')
+            return
+
+        if etag in (self.headers.get("If-None-Match") or ""):
+            self._send(304, None, b"", etag)
+        else:
+            self._send(200, content_type, body, etag)
+
+    def _send(self, code: int, content_type: str | None, body: bytes, etag: str | None = None):
+        self.send_response(code)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if code != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if code != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(dataset: Dataset, host: str = "127.0.0.1", port: int = 8000,
+                verbose: bool = False) -> ThreadingHTTPServer:
+    """Create (but do not start) an API server over a loaded Dataset."""
+    server = ThreadingHTTPServer((host, port), APIHandler)
+    server.daemon_threads = True
+    server.dataset = dataset
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reload", type=float, default=0, metavar="MINUTES",
+                        help="re-fetch all cinemas every MINUTES (0 = never)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    dataset = Dataset()
+    print("Fetching...")
+    dataset.load()
+    for msg in dataset.status:
+        print(f"  {msg}")
+
+    if args.reload > 0:
+        def reload_forever():
+            while True:
+                time.sleep(args.reload * 60)
+                dataset.load()
+        threading.Thread(target=reload_forever, daemon=True).start()
+
+    server = make_server(dataset, args.host, args.port, args.verbose)
+    print(f"Serving {len(dataset.index)} screenings on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
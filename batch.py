@@ -0,0 +1,261 @@
+"""Batch mode: many schedule queries against one fetched, indexed dataset.
+
+A spec file is JSON, either a list of queries or {"defaults": {...},
+"queries": [...]}, where defaults apply to every query. A query has:
+
+    name       used in reports and for the default output "<name>.md"
+    from, to   "YYYY-MM-DD", "today" or "+N" (days from today);
+               from defaults to today, to to six days after from
+    min_time, max_time   "HH:MM"
+    cinemas    list of cinema names as displayed, e.g. ["Mikro", "Kijów"] (default: all)
+    weekdays   list of short Polish weekday names, e.g. ["Pt", "So", "Nd"]
+    title      search text, matched like the GUI search box (search.py)
+    output     path or list of paths, format from the suffix (see export.py),
+               relative to the spec file
+
+Example:
+
+    {"defaults": {"from": "today", "to": "+27"},
+     "queries": [
+        {"name": "weekends", "weekdays": ["So", "Nd"]},
+        {"name": "evenings", "min_time": "18:00", "output": ["evenings.md", "evenings.ics"]},
+        {"name": "mikro", "cinemas": ["Mikro"], "to": "+6"}]}
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+from dates import WEEKDAYS_SHORT
+from export import FORMATS, export_files
+from index import ScreeningIndex
+from parsers import specs
+from schedule import build_schedule_view
+from screening import Screening, parse_minutes
+from search import TitleIndex
+from titles import canonical_map
+
+KEYS = {"name", "from", "to", "min_time", "max_time", "cinemas", "weekdays", "title", "output"}
+
+
+@dataclass
+class Query:
+    """One schedule to produce."""
+
+    name: str
+    from_date: date
+    to_date: date
+    outputs: list[Path]
+    min_time: str | None = None
+    max_time: str | None = None
+    cinemas: set[str] | None = None
+    weekdays: set[int] | None = None  # date.weekday() values
+    title: str | None = None
+
+
+@dataclass
+class QueryResult:
+    """What a query produced and how long it took (seconds)."""
+
+    query: Query
+    movies: int = 0
+    screenings: int = 0
+    stages: dict = field(default_factory=dict)  # filter / group / write
+    total: float = 0.0
+    error: str | None = None
+
+
+def _day(value: str, today: date, what: str) -> date:
+    if not isinstance(value, str):
+        raise ValueError(f"{what}: expected a string, got {value!r}")
+    if value == "today":
+        return today
+    if value.startswith("+") and value[1:].isdigit():
+        return today + timedelta(days=int(value[1:]))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{what}: expected YYYY-MM-DD, 'today' or '+N', got {value!r}") from None
+
+
+def _time(value: str | None, what: str) -> str | None:
+    if value is not None and (not isinstance(value, str) or parse_minutes(value) < 0):
+        raise ValueError(f"{what}: expected HH:MM, got {value!r}")
+    return value
+
+
+def _strings(value, what: str) -> list[str]:
+    """A list of strings, or one string as a list of one."""
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{what}: expected a string or a list of strings, got {value!r}")
+    return value
+
+
+def parse_query(entry: dict, base_dir: Path, today: date) -> Query:
+    """Build a Query from one spec entry (defaults already merged in)."""
+    name = entry.get("name")
+    if not name:
+        raise ValueError("every query needs a name")
+    if not isinstance(name, str):
+        raise ValueError(f"query name: expected a string, got {name!r}")
+    unknown = set(entry) - KEYS
+    if unknown:
+        raise ValueError(f"{name}: unknown keys {', '.join(sorted(unknown))}")
+
+    from_date = _day(entry.get("from", "today"), today, f"{name}.from")
+    to_date = _day(entry["to"], today, f"{name}.to") if "to" in entry else from_date + timedelta(days=6)
+
+    outputs = [base_dir / path for path in _strings(entry.get("output", f"{name}.md"), f"{name}.output")]
+    for path in outputs:
+        if path.suffix.lower() not in FORMATS:
+            raise ValueError(f"{name}.output: unknown format {path.name} (use {', '.join(FORMATS)})")
+
+    weekdays = None
+    if entry.get("weekdays"):
+        days = _strings(entry["weekdays"], f"{name}.weekdays")
+        short = [day.lower() for day in WEEKDAYS_SHORT]
+        try:
+            weekdays = {short.index(day.lower()) for day in days}
+        except ValueError:
+            raise ValueError(f"{name}.weekdays: use {', '.join(WEEKDAYS_SHORT)}") from None
+
+    cinemas = None
+    if entry.get("cinemas"):
+        cinemas = set(_strings(entry["cinemas"], f"{name}.cinemas"))
+        known = [spec.name for spec in specs().values()]
+        unknown = cinemas - set(known)
+        if unknown:
+            raise ValueError(f"{name}.cinemas: unknown {', '.join(sorted(unknown))} "
+                             f"(use {', '.join(known)})")
+
+    title = entry.get("title") or None
+    if title is not None and not isinstance(title, str):
+        raise ValueError(f"{name}.title: expected a string, got {title!r}")
+
+    return Query(
+        name=name,
+        from_date=from_date,
+        to_date=to_date,
+        outputs=outputs,
+        min_time=_time(entry.get("min_time"), f"{name}.min_time"),
+        max_time=_time(entry.get("max_time"), f"{name}.max_time"),
+        cinemas=cinemas,
+        weekdays=weekdays,
+        title=title,
+    )
+
+
+def load_specs(path: Path, today: date | None = None) -> list[Query]:
+    """
+    Read a spec file (see the module docstring).
+
+    Raises:
+        ValueError: If the file is not valid JSON or a query is invalid
+    """
+    today = today or date.today()
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    defaults = {}
+    if isinstance(spec, dict):
+        defaults = spec.get("defaults", {})
+        spec = spec.get("queries", [])
+    if not isinstance(defaults, dict):
+        raise ValueError("defaults: expected an object")
+    if not isinstance(spec, list):
+        raise ValueError("queries: expected a list of objects")
+    queries = []
+    for n, entry in enumerate(spec, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"query {n}: expected an object, got {entry!r}")
+        queries.append(parse_query({**defaults, **entry}, Path(path).parent, today))
+
+    names = [query.name for query in queries]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"duplicate query names: {', '.join(sorted(duplicates))}")
+    return queries
+
+
+class Batch:
+    """
+    Index a dataset once, then answer any number of queries from it.
+
+    The ScreeningIndex, canonical titles and (if a query searches titles)
+    the title search index are built once and shared, read-only, by all
+    queries, so queries may run on several threads.
+    """
+
+    def __init__(self, screenings: list[Screening]):
+        start = time.perf_counter()
+        self.index = ScreeningIndex(screenings)
+        self.titles = canonical_map(screenings)
+        self._search = None
+        self.setup = time.perf_counter() - start
+
+    def title_index(self) -> TitleIndex:
+        """Title search index, built on first use (only queries with a title need it)."""
+        if self._search is None:
+            self._search = TitleIndex(self.titles)
+        return self._search
+
+    def run_query(self, query: Query) -> QueryResult:
+        """Filter, group and write one query; errors are reported, not raised."""
+        result = QueryResult(query)
+        start = time.perf_counter()
+        try:
+            filtered = self.index.query(query.from_date, query.to_date, query.min_time,
+                                        query.max_time, query.cinemas)
+            if query.weekdays is not None:
+                # Ordinal 1 (0001-01-01) is a Monday
+                filtered = [s for s in filtered if (s.ordinal - 1) % 7 in query.weekdays]
+            if query.title:
+                matched = set(self.title_index().search(query.title))
+                filtered = [s for s in filtered if s.title in matched]
+            mark = time.perf_counter()
+            result.stages["filter"] = mark - start
+
+            view = build_schedule_view(filtered, query.from_date, query.to_date, self.titles)
+            result.movies, result.screenings = view.movie_count, view.screening_count
+            result.stages["group"] = time.perf_counter() - mark
+            mark = time.perf_counter()
+
+            for path in query.outputs:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            export_files(view, query.outputs)
+            result.stages["write"] = time.perf_counter() - mark
+        except OSError as e:
+            result.error = str(e)
+        result.total = time.perf_counter() - start
+        return result
+
+    def run(self, queries: list[Query], max_workers: int = 1) -> list[QueryResult]:
+        """Run every query, on max_workers threads; results in query order."""
+        if max_workers <= 1 or len(queries) <= 1:
+            return [self.run_query(query) for query in queries]
+        # Build the shared search index before the threads race to do it
+        if any(query.title for query in queries):
+            self.title_index()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.run_query, queries))
+
+
+def format_results(results: list[QueryResult], setup: float, total: float) -> list[str]:
+    """Per-query table of counts and milliseconds per stage, then the totals."""
+    width = max([len(r.query.name) for r in results] + [5])
+    lines = [f"{'query':<{width}}  {'movies':>6}  {'shows':>6}  "
+             f"{'filter':>7}  {'group':>7}  {'write':>7}  {'total':>7}"]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.query.name:<{width}}  failed: {r.error}")
+            continue
+        ms = {stage: f"{seconds * 1000:7.1f}" for stage, seconds in r.stages.items()}
+        lines.append(f"{r.query.name:<{width}}  {r.movies:>6}  {r.screenings:>6}  "
+                     f"{ms['filter']}  {ms['group']}  {ms['write']}  {r.total * 1000:7.1f}")
+    lines.append(f"{len(results)} queries in {total * 1000:.0f} ms "
+                 f"(index built once in {setup * 1000:.0f} ms, "
+                 f"sum of queries {sum(r.total for r in results) * 1000:.0f} ms)")
+    return lines
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Load test for the HTTP API with concurrent keep-alive clients.
+
+Loads screenings from the stand-in server, starts api.py on a free port and
+runs --clients threads, each sending --requests GETs drawn from a mix of
+JSON and markdown queries. Three passes: with the per-query cache disabled,
+with it enabled, and with clients revalidating via If-None-Match (304s).
+Checks one JSON answer against core.filter_screenings first.
+
+Usage: python benchmarks/bench_api.py [--count N] [--clients N] [--requests N]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from pages import TITLES
+from standin import StandIn
+
+import api
+import core
+
+
+def query_mix(start, cinemas: list[str], size: int, seed: int = 1) -> list[str]:
+    """size distinct-ish API paths over the loaded date range."""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(size):
+        from_date = start + timedelta(days=rng.randrange(0, 20))
+        params = {"from": from_date.isoformat(),
+                  "to": (from_date + timedelta(days=rng.choice([0, 2, 6]))).isoformat()}
+        if rng.random() < 0.5:
+            params["min_time"] = rng.choice(["12:00", "17:00", "19:00"])
+        if rng.random() < 0.3:
+            params["max_time"] = "21:00"
+        if rng.random() < 0.4:
+            params["cinema"] = ",".join(rng.sample(cinemas, rng.randint(1, 3)))
+        if rng.random() < 0.3:
+            params["title"] = rng.choice(TITLES)[:4].lower()
+        endpoint = "/schedule.md" if rng.random() < 0.3 else "/screenings"
+        paths.append(f"{endpoint}?{urlencode(params)}")
+    return paths
+
+
+def client(port: int, paths: list[str], requests: int, revalidate: bool, seed: int,
+           latencies: list, statuses: dict, lock: threading.Lock):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags = {}
+    mine = []
+    counts = {}
+    for _ in range(requests):
+        path = rng.choice(paths)
+        headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        mine.append(time.perf_counter() - start)
+        counts[response.status] = counts.get(response.status, 0) + 1
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+    conn.close()
+    with lock:
+        latencies.extend(mine)
+        for status, n in counts.items():
+            statuses[status] = statuses.get(status, 0) + n
+
+
+def run(port: int, paths: list[str], clients: int, requests: int, revalidate: bool) -> dict:
+    latencies, statuses, lock = [], {}, threading.Lock()
+    threads = [
+        threading.Thread(target=client, args=(port, paths, requests, revalidate, i,
+                                              latencies, statuses, lock))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500, help="screenings per cinema")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--queries", type=int, default=60, help="distinct queries in the mix")
+    args = parser.parse_args()
+
+    with StandIn(count=args.count).installed():
+        dataset = api.Dataset()
+        dataset.load()
+        server = api.make_server(dataset, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_port
+
+        screenings = list(dataset.index)
+        start = min(s.date_value for s in screenings)
+        paths = query_mix(start, dataset.index.cinemas, args.queries)
+
+        # Sanity check against the library
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", f"/screenings?from={start}&to={start + timedelta(days=6)}&min_time=17:00")
+        answer = json.loads(conn.getresponse().read())
+        expected = core.filter_screenings(screenings, start, start + timedelta(days=6), "17:00")
+        conn.close()
+        if answer["screenings"] != [s.to_dict() for s in expected]:
+            raise SystemExit("API answer differs from filter_screenings")
+
+        print(f"{len(screenings)} screenings, {len(paths)} distinct queries, "
+              f"{args.clients} clients x {args.requests} requests")
+        cache_size = api.QUERY_CACHE_SIZE
+        for label, size, revalidate in [("no cache", 0, False),
+                                        ("cached", cache_size, False),
+                                        ("cached+304", cache_size, True)]:
+            api.QUERY_CACHE_SIZE = size
+            dataset.load()  # start each pass with an empty cache
+            result = run(port, paths, args.clients, args.requests, revalidate)
+            print(f"  {label:<11} {result['rps']:8,.0f} req/s   p50 {result['p50']:6.2f} ms   "
+                  f"p95 {result['p95']:6.2f} ms   {result['statuses']}")
+
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Batch queries on one shared index vs one full run per query.
+
+Fetches the stand-in pages once, then answers --queries schedule queries
+(weekends, evenings, per-cinema, title searches over several windows) two
+ways: as separate runs that each fetch, parse and index everything again
+(what invoking cinema.py once per schedule costs, minus start-up), and as
+one batch.Batch, on 1 thread and on --jobs threads. Checks every batch
+output matches its separate run.
+
+Usage: python benchmarks/bench_batch.py [--count N] [--queries N] [--jobs N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from standin import StandIn
+
+import core
+import fetch
+import parse_cache
+from batch import Batch, format_results, load_specs
+
+CINEMAS = ["KIKA", "Mikro", "Agrafka", "Paradox", "Barany", "Kijów"]
+
+
+def spec(count: int) -> dict:
+    kinds = [
+        {"weekdays": ["Pt", "So", "Nd"]},
+        {"min_time": "18:00"},
+        {"max_time": "16:00", "weekdays": ["So", "Nd"]},
+        {"title": "zolw"},
+        {"min_time": "17:00", "output_extra": ".ics"},
+    ]
+    queries = []
+    for i in range(count):
+        query = dict(kinds[i % len(kinds)])
+        extra = query.pop("output_extra", None)
+        query["name"] = f"q{i:02d}"
+        query["from"] = f"+{(i // len(kinds)) * 7}"
+        query["to"] = f"+{(i // len(kinds)) * 7 + 13}"
+        if i % 3 == 0:
+            query["cinemas"] = [CINEMAS[i % len(CINEMAS)]]
+        query["output"] = [f"out/{query['name']}.md"] + ([f"out/{query['name']}{extra}"] if extra else [])
+        queries.append(query)
+    return {"queries": queries}
+
+
+def separate_runs(queries) -> float:
+    """Each query on its own: fetch and parse (from the page cache) and index everything."""
+    start = time.perf_counter()
+    for query in queries:
+        parse_cache._memory.clear()
+        for cinema in core.PARSERS:
+            fetch.parsed_cache_path(cinema).unlink(missing_ok=True)
+        report = core.fetch_report()
+        Batch(report.screenings).run_query(query)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="screenings per page")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    with StandIn(count=args.count).installed(), tempfile.TemporaryDirectory() as tmp:
+        spec_path = Path(tmp) / "spec.json"
+        spec_path.write_text(json.dumps(spec(args.queries)), encoding="utf-8")
+        queries = load_specs(spec_path)
+        screenings = core.fetch_report().screenings
+        print(f"{len(screenings)} screenings, {len(queries)} queries")
+
+        separate = separate_runs(queries)
+        expected = {path: path.read_bytes() for query in queries for path in query.outputs}
+        print(f"  separate runs        {separate * 1000:8.0f} ms")
+
+        for jobs in (1, args.jobs):
+            start = time.perf_counter()
+            batch = Batch(screenings)
+            results = batch.run(queries, jobs)
+            elapsed = time.perf_counter() - start
+            for path, data in expected.items():
+                # iCalendar files carry a DTSTAMP, which differs between runs
+                if path.suffix != ".ics" and path.read_bytes() != data:
+                    raise SystemExit(f"{path.name} differs from the separate run")
+            print(f"  batch, {jobs} thread(s)  {elapsed * 1000:8.0f} ms  ({separate / elapsed:.0f}x)")
+        print()
+        for line in format_results(results, batch.setup, elapsed)[-6:]:
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
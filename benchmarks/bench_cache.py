@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Wire bytes and disk footprint with and without compression.
+
+Fetches every cinema from a local stand-in server, once with plain
+responses and once with gzip, then stores the cache plain and compressed.
+Every mode must return the same HTML.
+
+Usage: python benchmarks/bench_cache.py [--count N] [--rounds N]
+"""
+
+import argparse
+import shutil
+import time
+
+from standin import StandIn
+
+import fetch
+
+
+def fetch_everything() -> dict[str, str]:
+    shutil.rmtree(fetch.CACHE_DIR, ignore_errors=True)
+    pages = {cinema: fetch.fetch_html(cinema) for cinema in fetch.CINEMAS}
+    if None in pages.values():
+        raise SystemExit(f"fetch failed: {fetch.cache_stats()}")
+    return pages
+
+
+def disk_usage() -> int:
+    return sum(p.stat().st_size for p in fetch.CACHE_DIR.glob("*.html*"))
+
+
+def time_hits(rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for cinema in fetch.CINEMAS:
+            fetch.fetch_html(cinema)
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="screenings per page")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    reference = None
+    for use_gzip in (False, True):
+        standin = StandIn(count=args.count, gzip=use_gzip)
+        with standin.installed():
+            for compress in (False, True):
+                fetch.CACHE_COMPRESS = compress
+                pages = fetch_everything()
+                if reference is None:
+                    reference = pages
+                elif pages != reference:
+                    raise SystemExit("HTML differs between transfer/cache modes")
+
+                transfer = "gzip" if use_gzip else "identity"
+                cache = "gz" if compress else "plain"
+                print(f"  transfer={transfer:<8} cache={cache:<5} "
+                      f"wire {standin.server.bytes_sent:>9} B  disk {disk_usage():>9} B  "
+                      f"cache hit {time_hits(args.rounds) * 1000:.2f} ms/all")
+                standin.server.bytes_sent = 0
+    fetch.CACHE_COMPRESS = False
+
+
+if __name__ == "__main__":
+    main()
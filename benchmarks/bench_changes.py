@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Change feed: fingerprint diff vs comparing the full listings.
+
+Builds one cinema's listing of --count screenings and a next fetch of it
+with --churn of the screenings cancelled, moved to another time or newly
+added (and the first day gone, as on a real page the next morning). Finds
+what changed by comparing the full lists, as a consumer without the feed
+would, and with changes.diff; checks both agree. Also diffs the two
+listings as hashed sets of records, which is linear as well but needs
+the whole previous listing. Then times changes.record end to end (load
+fingerprints, diff, log, save) and compares the size of the logged
+change with the full listing as JSON.
+
+Usage: python benchmarks/bench_changes.py [--count N] [--churn FRACTION]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+
+import changes
+import fetch
+from dates import WEEKDAYS_SHORT
+from screening import Screening
+
+TITLES = [f"Film {i:04d}" for i in range(400)]
+TIMES = ["10:00", "12:15", "14:30", "16:45", "18:00", "19:30", "20:15", "21:45"]
+
+
+def screening(title: str, day: date, time_str: str) -> Screening:
+    return Screening(title, day.isoformat(), time_str, WEEKDAYS_SHORT[day.weekday()], "Mikro")
+
+
+def listings(count: int, churn: float, seed: int = 1) -> tuple[list, list]:
+    rng = random.Random(seed)
+    first = date(2026, 1, 5)
+    days = max(count // len(TIMES), 1)
+    old = [screening(rng.choice(TITLES), first + timedelta(days=i % days), TIMES[(i // days) % len(TIMES)])
+           for i in range(count)]
+    old = list(dict.fromkeys(old))
+
+    new = []
+    for s in old:
+        if s.ordinal == first.toordinal():
+            continue  # the day is over
+        roll = rng.random()
+        if roll < churn / 3:
+            continue  # cancelled
+        if roll < 2 * churn / 3:
+            new.append(screening(s.title, s.date_value, rng.choice(TIMES)))  # moved
+        else:
+            new.append(s)
+    last = first + timedelta(days=days)
+    new.extend(screening(rng.choice(TITLES), last + timedelta(days=rng.randrange(7)), rng.choice(TIMES))
+               for _ in range(int(count * churn / 3)))
+    return old, list(dict.fromkeys(new))
+
+
+def full_compare(old: list[Screening], new: list[Screening]) -> tuple[set, set]:
+    """Without fingerprints: look every screening up in the other full list."""
+    start = min(s.ordinal for s in new)
+    added = {(s.date, s.time, s.title) for s in new if s not in old}
+    removed = {(s.date, s.time, s.title) for s in old if s not in new and s.ordinal >= start}
+    return added, removed
+
+
+def set_compare(old: list[Screening], new: list[Screening]) -> tuple[set, set]:
+    """Without fingerprints, but hashing: still needs the whole previous listing."""
+    start = min(s.ordinal for s in new)
+    old_set, new_set = set(old), set(new)
+    added = {(s.date, s.time, s.title) for s in new_set - old_set}
+    removed = {(s.date, s.time, s.title) for s in old_set - new_set if s.ordinal >= start}
+    return added, removed
+
+
+def timed(fn, rounds: int = 5) -> tuple[float, object]:
+    best, result = None, None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=3000, help="screenings per listing")
+    parser.add_argument("--churn", type=float, default=0.05, help="fraction of screenings changed")
+    args = parser.parse_args()
+
+    old, new = listings(args.count, args.churn)
+    previous, _, _ = changes.diff({}, old)
+
+    full_time, expected = timed(lambda: full_compare(old, new), rounds=1)
+    set_time, by_set = timed(lambda: set_compare(old, new))
+    if by_set != expected:
+        raise SystemExit("set comparison differs from the full comparison")
+    diff_time, (_, added, removed) = timed(lambda: changes.diff(previous, new))
+    if ({tuple(row[1:]) for row in added}, {tuple(row[1:]) for row in removed}) != expected:
+        raise SystemExit("fingerprint diff differs from the full comparison")
+    print(f"{len(old)} -> {len(new)} screenings: {len(added)} added, {len(removed)} removed")
+    print(f"  full comparison  {full_time * 1000:9.1f} ms")
+    print(f"  full sets        {set_time * 1000:9.1f} ms")
+    print(f"  fingerprint diff {diff_time * 1000:9.1f} ms  ({full_time / diff_time:.0f}x)")
+
+    original_cache = fetch.CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        fetch.CACHE_DIR = Path(tmp)
+        try:
+            rounds = []
+            for i in range(5):
+                changes._memory.clear()  # time the load from disk, as in a new process
+                changes.record("mikro", "Mikro", f"old{i}", old)
+                start = time.perf_counter()
+                change = changes.record("mikro", "Mikro", f"new{i}", new)
+                rounds.append(time.perf_counter() - start)
+            unchanged, _ = timed(lambda: changes.record("mikro", "Mikro", "new4", new))
+            logged = changes.recent(limit=1)[0]
+            if logged.added != change.added or logged.removed != change.removed:
+                raise SystemExit("logged change differs from the recorded one")
+        finally:
+            fetch.CACHE_DIR = original_cache
+
+    print(f"  record (load, diff, log, save) {min(rounds) * 1000:6.1f} ms, "
+          f"unchanged page {unchanged * 1000:.3f} ms")
+    entry = len(json.dumps(change.to_dict(), ensure_ascii=False).encode())
+    full = len(json.dumps([s.to_dict() for s in new], ensure_ascii=False).encode())
+    print(f"  log entry {entry / 1024:.1f} KB vs full listing {full / 1024:.1f} KB "
+          f"({entry / full:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""One urlopen connection per request vs the pooled keep-alive client.
+
+Runs --rounds forced fetches of every stand-in page over HTTP and over
+HTTPS (self-signed, needs the openssl command), first opening a fresh
+connection for each request as fetch_html used to, then through
+client.HTTPClient, and reports time and TCP connections opened. Over
+HTTPS, a third run closes the connection after each request, so every
+request reconnects but resumes the TLS session. Then checks that
+fetch_html and stream_html, which read the body with read1, and their
+304 revalidations keep reusing one connection, that 503s are
+retried until the page comes through, that redirects are followed across
+hosts (and too many of them fail the fetch), that requests go through
+HTTP and HTTPS proxies, and that the per-host limit holds requests back.
+
+Usage: python benchmarks/bench_client.py [--count N] [--rounds N]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+from standin import StandIn
+
+import fetch
+from client import MAX_REDIRECTS, HTTPClient
+
+
+def urlopen_round(context) -> int:
+    size = 0
+    for url, _ in fetch.CINEMAS.values():
+        request = Request(url, headers={"User-Agent": fetch.USER_AGENT})
+        with urlopen(request, timeout=30, context=context) as response:
+            size += len(response.read())
+    return size
+
+
+def pooled_round(client: HTTPClient, keep_alive: bool = True) -> int:
+    size = 0
+    for url, _ in fetch.CINEMAS.values():
+        with client.get(url, {"User-Agent": fetch.USER_AGENT}) as response:
+            size += len(response.read())
+        if not keep_alive:
+            client.close()  # a new connection each time, resuming the TLS session
+    return size
+
+
+def compare(tls: bool, count: int, rounds: int):
+    standin = StandIn(count=count, tls=tls)
+    context = standin.ssl_context() if tls else None
+    client = HTTPClient(ssl_context=context)
+    with standin.installed(client):
+        modes = [("urlopen", lambda: urlopen_round(context)),
+                 ("pooled", lambda: pooled_round(client))]
+        if tls:
+            modes.append(("resumed", lambda: pooled_round(client, keep_alive=False)))
+        for label, run in modes:
+            before = standin.server.connections
+            start = time.perf_counter()
+            for _ in range(rounds):
+                size = run()
+            elapsed = time.perf_counter() - start
+            requests = rounds * len(fetch.CINEMAS)
+            print(f"  {'https' if tls else 'http':<5} {label:<8} {elapsed / requests * 1000:6.2f} ms/request  "
+                  f"{standin.server.connections - before:4} connections for {requests} requests  "
+                  f"({size / 1024:.0f} KB per round)")
+
+
+def check_fetch_reuse(rounds: int = 5):
+    for gzip in (False, True):
+        standin = StandIn(count=200, gzip=gzip)
+        client = HTTPClient(proxies={})
+        with standin.installed(client):
+            for _ in range(rounds):
+                if fetch.fetch_html("mikro", force=True) is None:
+                    raise SystemExit("fetch_html failed")
+                "".join(fetch.stream_html("mikro", force=True))
+                fetch.fetch_html("mikro", max_age=0)  # revalidated: 304, no body
+                "".join(fetch.stream_html("mikro", max_age=0))
+            connections = standin.server.connections
+            not_modified = standin.server.not_modified
+        if not_modified != 2 * rounds:
+            raise SystemExit(f"expected {2 * rounds} revalidations, got {not_modified}")
+        if connections != 1:
+            raise SystemExit(f"{4 * rounds} fetches opened {connections} connections, expected 1 "
+                             f"(gzip={gzip}, {client.stats})")
+    print(f"  fetch reuse: {4 * rounds} fetch_html/stream_html calls (half 304s) on 1 connection, "
+          f"with and without gzip")
+
+
+def check_retries():
+    standin = StandIn(count=50, failures={"kika": 2, "mikro": 1})
+    client = HTTPClient(backoff_base=0.05)
+    with standin.installed(client):
+        pages = {cinema: fetch.fetch_html(cinema, force=True) for cinema in fetch.CINEMAS}
+    if any(html is None for html in pages.values()):
+        raise SystemExit("a page failed despite retries")
+    if client.stats["retries"] != 3:
+        raise SystemExit(f"expected 3 retries, got {client.stats}")
+    print(f"  retries: 503s retried until served  {client.stats}")
+
+
+def check_redirects():
+    standin = StandIn(count=50, redirects={"kika": 2, "mikro": 1, "agrafka": MAX_REDIRECTS + 1})
+    client = HTTPClient()
+    with standin.installed(client):
+        pages = {cinema: fetch.fetch_html(cinema, force=True) for cinema in ("kika", "mikro", "agrafka")}
+    if pages["kika"] is None or pages["mikro"] is None:
+        raise SystemExit("a redirected page failed")
+    if pages["agrafka"] is not None:
+        raise SystemExit(f"more than {MAX_REDIRECTS} redirects were followed")
+    if client.stats["redirects"] != 3 + MAX_REDIRECTS:
+        raise SystemExit(f"expected {3 + MAX_REDIRECTS} redirects, got {client.stats}")
+    print(f"  redirects: followed across hosts, more than {MAX_REDIRECTS} fail  {client.stats}")
+
+
+def check_proxies():
+    proxy = StandIn(count=50)
+    proxy_url = proxy.start()
+    try:
+        # Plain HTTP: the proxy gets the absolute URL (of a host that does not exist) and serves it
+        client = HTTPClient(proxies={"http": proxy_url})
+        with client.get("http://cinema.invalid/kika") as response:
+            if response.status != 200 or not response.read():
+                raise SystemExit(f"HTTP through the proxy failed: {response.status}")
+        client.close()
+
+        # HTTPS: tunnelled with CONNECT to the TLS stand-in
+        site = StandIn(count=50, tls=True)
+        client = HTTPClient(proxies={"https": proxy_url}, ssl_context=site.ssl_context())
+        with site.installed(client):
+            html = fetch.fetch_html("mikro", force=True)
+        if html is None or proxy.server.tunnels != 1:
+            raise SystemExit(f"HTTPS through the proxy failed ({proxy.server.tunnels} tunnels)")
+    finally:
+        proxy.stop()
+    print("  proxies: HTTP via absolute URL and HTTPS via CONNECT served")
+
+
+def check_host_limit():
+    delay = 0.2
+    standin = StandIn(count=50, delays={cinema: delay for cinema in fetch.CINEMAS})
+    client = HTTPClient(per_host=2)
+    with standin.installed(client):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(len(fetch.CINEMAS)) as pool:
+            list(pool.map(lambda cinema: fetch.fetch_html(cinema, force=True), fetch.CINEMAS))
+        elapsed = time.perf_counter() - start
+    waves = len(fetch.CINEMAS) / 2
+    if elapsed < waves * delay * 0.9:
+        raise SystemExit(f"per-host limit not applied: {elapsed:.2f}s")
+    print(f"  per-host limit 2: {len(fetch.CINEMAS)} concurrent fetches took {elapsed:.2f}s "
+          f"({waves:.0f} waves of {delay}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50, help="screenings per page")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    for tls in (False, True):
+        compare(tls, args.count, args.rounds)
+    check_fetch_reuse()
+    check_retries()
+    check_redirects()
+    check_proxies()
+    check_host_limit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Day-range collapsing: date objects vs ordinals vs one batch over all groups.
+
+Builds an archive of --days days for --titles films at several times per
+cinema, groups it into (movie, time, cinema) slots like the schedule view,
+and collapses every slot's days three ways: the old sorted(set(dates))
+walk over date objects built from ISO strings, collapse_ordinals per slot,
+and collapse_many for all slots at once (vectorized when NumPy is
+installed). Checks all three agree, then times ISO date parsing with and
+without the dates.iso_ordinal cache.
+
+Usage: python benchmarks/bench_dates.py [--titles N] [--days N]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+
+import dates
+from dates import WEEKDAYS_SHORT, collapse_many, collapse_ordinals
+
+CINEMAS = ["KIKA", "Mikro", "Agrafka", "Paradox", "Barany", "Kijów"]
+
+
+def legacy_collapse(days: list[date]) -> str:
+    """collapse_days before the ordinal fast path."""
+    if not days:
+        return ""
+    days = sorted(set(days))
+    runs = [[days[0]]]
+    for d in days[1:]:
+        if (d - runs[-1][-1]).days == 1:
+            runs[-1].append(d)
+        else:
+            runs.append([d])
+    parts = []
+    for run in runs:
+        if len(run) >= 2:
+            start = WEEKDAYS_SHORT[run[0].weekday()].lower()
+            parts.append(f"{start.capitalize()}-{WEEKDAYS_SHORT[run[-1].weekday()].lower()}")
+        else:
+            parts.append(WEEKDAYS_SHORT[run[0].weekday()])
+    return ", ".join(parts)
+
+
+def slots(titles: int, days: int, seed: int = 1) -> list[list[str]]:
+    """ISO dates of each (title, time, cinema) slot, in chronological order."""
+    rng = random.Random(seed)
+    first = date(2025, 1, 1)
+    result = []
+    for _ in range(titles):
+        # A film runs a few weeks, at a couple of times in a couple of cinemas
+        start = rng.randrange(days)
+        run = range(start, min(days, start + rng.randint(7, 42)))
+        for _ in range(rng.randint(1, 3) * rng.randint(1, 3)):
+            result.append([(first + timedelta(days=d)).isoformat() for d in run if rng.random() < 0.6])
+    return result
+
+
+def timed(fn, rounds: int = 3) -> tuple[float, object]:
+    best, result = None, None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    groups = slots(args.titles, args.days)
+    total = sum(len(group) for group in groups)
+    ordinals = [[dates.iso_ordinal(d) for d in group] for group in groups]
+    print(f"{len(groups)} slots, {total} screening dates, NumPy {'available' if dates._numpy() else 'missing'}")
+
+    legacy_time, expected = timed(lambda: [legacy_collapse([date.fromisoformat(d) for d in group])
+                                           for group in groups])
+    runs = [("ordinals", lambda: [collapse_ordinals(group) for group in ordinals])]
+    dates.USE_NUMPY = False
+    runs.append(("batch", lambda: collapse_many(ordinals)))
+    print(f"  {'date objects':<16} {legacy_time * 1000:8.1f} ms")
+    for label, fn in runs:
+        elapsed, result = timed(fn)
+        if result != expected:
+            raise SystemExit(f"{label} differs from the date-object collapse")
+        print(f"  {label:<16} {elapsed * 1000:8.1f} ms  ({legacy_time / elapsed:.1f}x)")
+    dates.USE_NUMPY = True
+    if dates._numpy() is not None:
+        elapsed, result = timed(lambda: collapse_many(ordinals))
+        if result != expected:
+            raise SystemExit("NumPy batch differs from the date-object collapse")
+        print(f"  {'batch (NumPy)':<16} {elapsed * 1000:8.1f} ms  ({legacy_time / elapsed:.1f}x)")
+
+    strings = [d for group in groups for d in group]
+    uncached, _ = timed(lambda: [date.fromisoformat(d).toordinal() for d in strings])
+    dates.iso_ordinal.cache_clear()
+    cached, _ = timed(lambda: [dates.iso_ordinal(d) for d in strings])
+    print(f"  ISO -> ordinal   {uncached * 1000:8.1f} ms uncached, {cached * 1000:.1f} ms cached "
+          f"({len(strings)} strings, {dates.iso_ordinal.cache_info().currsize} distinct)")
+
+
+if __name__ == "__main__":
+    main()
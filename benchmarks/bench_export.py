@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Export a large archive: render_markdown + write_text vs streaming writers.
+
+Builds a schedule view over --days days of screenings for every cinema and
+writes it as markdown the old way (one string, then write_text), then
+streams it with export.export_files, first as markdown alone and then as
+markdown, JSON Lines, CSV and iCalendar in one pass. Reports time and the
+peak memory allocated while writing (tracemalloc), and checks the streamed
+markdown matches render_markdown.
+
+Usage: python benchmarks/bench_export.py [--days N] [--per-day N]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+from bench_titles import films
+
+from export import export_files
+from formatting import render_markdown
+from schedule import build_schedule_view
+from screening import Screening
+
+CINEMAS = ["KIKA", "Mikro", "Agrafka", "Paradox", "Barany", "Kijów"]
+DAYS = ["poniedziałek", "wtorek", "środa", "czwartek", "piątek", "sobota", "niedziela"]
+
+
+def archive(days: int, per_day: int) -> tuple[list[Screening], date]:
+    first = date(2025, 1, 1)
+    names = films(max(50, days * 2))
+    screenings = []
+    for offset in range(days):
+        d = first + timedelta(days=offset)
+        for c, cinema in enumerate(CINEMAS):
+            for i in range(per_day):
+                # Films run for a few weeks at shifting times, as repertoires do
+                title = names[(offset // 7 * 3 + c * 5 + i * 11) % len(names)]
+                minutes = 600 + 75 * i + 15 * ((offset // 3 + c) % 4)
+                screenings.append(Screening.from_ordinal(
+                    title, d.toordinal(), minutes, DAYS[d.weekday()], cinema))
+    return screenings, first
+
+
+def measure(make_view, write) -> tuple[float, float]:
+    """Best of three untraced runs (seconds) and peak MB allocated (traced run) to write a fresh view."""
+    elapsed = None
+    for _ in range(3):
+        # Day ranges are cached on the view: every run starts from a new one
+        view = make_view()
+        start = time.perf_counter()
+        write(view)
+        took = time.perf_counter() - start
+        elapsed = took if elapsed is None else min(elapsed, took)
+
+    view = make_view()
+    tracemalloc.start()
+    write(view)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=10, help="screenings per cinema per day")
+    args = parser.parse_args()
+
+    screenings, first = archive(args.days, args.per_day)
+    last = first + timedelta(days=args.days - 1)
+
+    def make_view():
+        return build_schedule_view(screenings, first, last, {})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        old = tmp / "old.md"
+        paths = [tmp / f"schedule{suffix}" for suffix in (".md", ".jsonl", ".csv", ".ics")]
+        runs = [
+            ("render + write_text", lambda view: old.write_text(render_markdown(view), encoding="utf-8")),
+            ("streamed markdown", lambda view: export_files(view, paths[:1])),
+            ("streamed 4 formats", lambda view: export_files(view, paths)),
+        ]
+        view = make_view()
+        print(f"{len(screenings)} screenings, {view.movie_count} movies, "
+              f"{sum(len(movie.slots) for movie in view.movies)} slots")
+        for label, write in runs:
+            elapsed, peak = measure(make_view, write)
+            print(f"  {label:<20} {elapsed * 1000:8.1f} ms   peak {peak:7.2f} MB")
+            if label == "streamed markdown" and paths[0].read_bytes() != old.read_bytes():
+                raise SystemExit("streamed markdown differs from render_markdown")
+        print("  " + ", ".join(f"{p.suffix} {p.stat().st_size / 2**20:.1f} MB" for p in [old] + paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compare sequential and concurrent fetch_all_screenings on a cold cache.
+
+Finishes with an expired-cache run, which should revalidate every page with
+a 304 instead of downloading it again, and warm-cache runs with and without
+the parsed-screenings cache.
+
+Usage: python benchmarks/bench_fetch.py [--count N] [--rounds N]
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+from standin import StandIn
+
+import core
+import fetch
+import parse_cache
+
+# Simulated per-site latency (seconds); the slowest site bounds the concurrent run
+DELAYS = {
+    "kika": 0.30,
+    "mikro": 0.60,
+    "agrafka": 0.25,
+    "paradox": 0.20,
+    "baranami": 0.35,
+    "kijow": 0.40,
+}
+
+
+def cold_run(max_workers: int) -> tuple[float, int, list[str]]:
+    shutil.rmtree(fetch.CACHE_DIR, ignore_errors=True)
+    start = time.perf_counter()
+    screenings, status = core.fetch_all_screenings(max_workers=max_workers)
+    return time.perf_counter() - start, len(screenings), status
+
+
+def expired_run() -> float:
+    """Age every cached page past CACHE_MAX_AGE so the next fetch revalidates."""
+    stale = time.time() - fetch.CACHE_MAX_AGE - 1
+    for cinema in fetch.CINEMAS:
+        os.utime(fetch.cached_file(cinema), (stale, stale))
+    start = time.perf_counter()
+    core.fetch_all_screenings()
+    return time.perf_counter() - start
+
+
+def warm_run(reparse: bool) -> float:
+    """Fetch with every page cached; optionally drop parsed results first."""
+    if reparse:
+        parse_cache._memory.clear()
+        for cinema in fetch.CINEMAS:
+            fetch.parsed_cache_path(cinema).unlink(missing_ok=True)
+    start = time.perf_counter()
+    core.fetch_all_screenings()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500, help="screenings per page")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    standin = StandIn(count=args.count, delays=DELAYS)
+    with standin.installed():
+        print(f"{len(DELAYS)} cinemas, {args.count} screenings each, "
+              f"sum of delays {sum(DELAYS.values()):.2f}s, max {max(DELAYS.values()):.2f}s")
+
+        baseline = None
+        for label, workers in (("sequential", 1), ("concurrent", core.MAX_WORKERS)):
+            times = []
+            for _ in range(args.rounds):
+                elapsed, count, status = cold_run(workers)
+                times.append(elapsed)
+            if baseline is None:
+                baseline = status
+            elif status != baseline:
+                raise SystemExit("status order differs between sequential and concurrent runs")
+            best = min(times)
+            print(f"  {label:<11} workers={workers}  best {best:.3f}s  "
+                  f"mean {sum(times) / len(times):.3f}s  ({count} screenings)")
+
+        sent = standin.server.bytes_sent
+        fetch.reset_cache_stats()
+        elapsed = expired_run()
+        print(f"  expired     {elapsed:.3f}s  {standin.server.bytes_sent - sent} body bytes sent, "
+              f"cache {fetch.cache_stats()}")
+
+        reparsed = min(warm_run(reparse=True) for _ in range(args.rounds))
+        cached = min(warm_run(reparse=False) for _ in range(args.rounds))
+        print(f"  warm        {reparsed * 1000:.1f} ms re-parsing, "
+              f"{cached * 1000:.1f} ms from parsed cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Start-up cost of the CLI, API and core modules, measured with -X importtime.
+
+Each statement runs in a fresh interpreter (python -X importtime -c ...);
+reports the median total import time of the modules it imports, the slowest
+direct imports, and checks that importing core loads no parser module until
+a cinema is actually parsed. The "eager parsers" row imports every parser
+module up front, as the registry used to.
+
+Usage: python benchmarks/bench_import.py [--rounds N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STATEMENTS = {
+    "core": "import core",
+    "cinema (CLI)": "import cinema",
+    "api": "import api",
+    "eager parsers": "import core, parsers.kika, parsers.mikro, parsers.agrafka, "
+                     "parsers.paradox, parsers.baranami, parsers.kijow",
+    "list cinemas": "import core; list(core.PARSERS.items())",
+}
+
+LAZY_CHECK = (
+    "import sys, core\n"
+    "names = [n for _, (n, _) in core.PARSERS.items()]\n"
+    "assert not [m for m in sys.modules if m.startswith('parsers.')], 'parser imported early'\n"
+    "core.PARSERS['kika'][1]('')\n"
+    "assert [m for m in sys.modules if m.startswith('parsers.')] == ['parsers.kika'], 'not lazy'\n"
+)
+
+
+def importtime(statement: str) -> list[tuple[int, int, str]]:
+    """(self us, cumulative us, indented name) per module imported by statement."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--top", type=int, default=4, help="slowest direct imports to list")
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, "-c", LAZY_CHECK], cwd=ROOT, check=True)
+    print("Parser modules load lazily")
+
+    for label, statement in STATEMENTS.items():
+        totals = []
+        for _ in range(args.rounds):
+            rows = importtime(statement)
+            # Top-level entries (one space of indent) add up to the whole start-up
+            top = [row for row in rows if not row[2].startswith("  ")]
+            totals.append(sum(cumulative for _, cumulative, _ in top))
+        direct = sorted(
+            (row for row in rows if row[2].startswith("   ") and not row[2].startswith("    ")),
+            key=lambda row: row[1], reverse=True,
+        )
+        slowest = ", ".join(f"{name.strip()} {cumulative / 1000:.1f}" for _, cumulative, name in direct[:args.top])
+        print(f"  {label:<14} {statistics.median(totals) / 1000:7.1f} ms  "
+              f"{len(rows):4} modules   slowest: {slowest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Linear-scan filtering vs ScreeningIndex queries at growing archive sizes.
+
+Usage: python benchmarks/bench_index.py [--sizes 10000,100000,1000000]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+from pages import TITLES
+
+from index import ScreeningIndex
+from screening import Screening, parse_minutes
+
+CINEMAS = ["KIKA", "Mikro", "Agrafka", "Paradox", "Barany", "Kijów"]
+
+
+def archive(size: int) -> list[Screening]:
+    """size screenings spread over ~30 per cinema per day, in fetch order."""
+    rng = random.Random(size)
+    days = max(1, size // (30 * len(CINEMAS)))
+    first = date.today().toordinal() - days // 2
+    return [
+        Screening.from_ordinal(
+            rng.choice(TITLES), first + rng.randrange(days),
+            rng.randrange(10 * 60, 23 * 60, 15), "", rng.choice(CINEMAS),
+        )
+        for _ in range(size)
+    ]
+
+
+def linear_filter(screenings, from_date, to_date, min_time=None, max_time=None, cinemas=None):
+    """filter_screenings before the index: one pass over every record."""
+    from_ord = from_date.toordinal()
+    to_ord = to_date.toordinal()
+    min_minutes = parse_minutes(min_time) if min_time else None
+    max_minutes = parse_minutes(max_time) if max_time else None
+    filtered = []
+    for s in screenings:
+        if s.ordinal < from_ord or s.ordinal > to_ord:
+            continue
+        if min_minutes is not None and s.minutes < min_minutes:
+            continue
+        if max_minutes is not None and s.minutes > max_minutes:
+            continue
+        if cinemas and s.cinema not in cinemas:
+            continue
+        filtered.append(s)
+    return filtered
+
+
+def queries():
+    today = date.today()
+    week = (today, today + timedelta(days=6))
+    return {
+        "week": (*week, None, None, None),
+        "week evenings": (*week, "17:00", "22:00", None),
+        "week, 2 cinemas": (*week, None, None, {"KIKA", "Mikro"}),
+        "month evenings, 2 cinemas": (today, today + timedelta(days=30), "18:00", "21:00", {"Paradox", "Kijów"}),
+    }
+
+
+def timed(rounds: int, fn, *args):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in (int(n) for n in args.sizes.split(",")):
+        records = archive(size)
+        build_time, index = timed(1, ScreeningIndex, records)
+        print(f"{size} screenings (index build {build_time * 1000:.0f} ms)")
+
+        for label, query in queries().items():
+            linear_time, expected = timed(args.rounds, linear_filter, records, *query)
+            index_time, found = timed(args.rounds, index.query, *query)
+            if sorted(found, key=hash) != sorted(expected, key=hash):
+                raise SystemExit(f"{label}: index and linear scan disagree")
+            print(f"  {label:<27} linear {linear_time * 1000:8.2f} ms   index {index_time * 1000:7.3f} ms   "
+                  f"{linear_time / index_time:7.1f}x  ({len(found)} hits)")
+
+
+if __name__ == "__main__":
+    main()
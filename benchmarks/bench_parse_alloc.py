@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Parse time and tracemalloc peak per parser on a large synthetic page.
+
+Also writes a digest of every parser's records, so output can be compared
+across changes: run with --digest before and after and diff the two.
+
+Usage: python benchmarks/bench_parse_alloc.py [--count N] [--digest FILE]
+"""
+
+import argparse
+import hashlib
+import time
+import tracemalloc
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+from pages import page
+
+from parsers import PARSERS
+
+
+def measure(parse_fn, html: str, rounds: int) -> tuple[float, int, list]:
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parse_fn(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    records = parse_fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="screenings per page")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--digest", help="write per-parser record digests to this file")
+    args = parser.parse_args()
+
+    digests = []
+    for cinema, (name, parse_fn) in PARSERS.items():
+        html = page(cinema, args.count)
+        elapsed, peak, records = measure(parse_fn, html, args.rounds)
+        digest = hashlib.sha256(repr([tuple(s.items()) for s in records]).encode()).hexdigest()
+        digests.append(f"{cinema} {len(records)} {digest}")
+        print(f"  {name:<8} {len(html) / 1e6:5.2f} MB  {elapsed * 1000:7.1f} ms  "
+              f"peak {peak / 1e6:6.2f} MB  ({len(records)} screenings)")
+
+    if args.digest:
+        with open(args.digest, "w") as f:
+            f.write("\n".join(digests) + "\n")
+
+
+if __name__ == "__main__":
+    main()
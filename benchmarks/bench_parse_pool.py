@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Process-pool parsing vs parsing in the calling thread, by page size.
+
+For Mikro, Agrafka and Pod Baranami, builds synthetic pages of growing
+size (benchmarks/pages.py) and parses each serially and with
+parse_pool.parse on --processes workers (started beforehand; start-up is
+reported separately). Checks the running pool is kept when asked for
+another size and that a failing pool falls back to a serial parse, that
+the pool's records equal the serial ones,
+then reports the crossover: the smallest page from which the pool is
+faster at every larger size too, to tune parse_pool.MIN_CHARS. With a
+single core it can at best break even.
+
+Usage: python benchmarks/bench_parse_pool.py [--processes N] [--rounds N]
+"""
+
+import argparse
+import os
+import time
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+
+import parse_pool
+from pages import page
+from parsers import specs
+
+CINEMAS = ("mikro", "agrafka", "baranami")
+COUNTS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+
+def timed(fn, rounds: int) -> tuple[float, object]:
+    best, result = None, None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def check_fallback(processes: int):
+    running = parse_pool.pool(processes)
+    if parse_pool.pool(processes + 1) is not running:
+        raise SystemExit("pool restarted for another size")
+    html = page("mikro", 2000)
+    expected = specs()["mikro"].parse(html)
+    running.shutdown()  # as if another thread stopped it: submitting now raises RuntimeError
+    try:
+        if parse_pool.parse("mikro", html, processes) != expected:
+            raise SystemExit("fallback result differs from the serial parse")
+    finally:
+        parse_pool.shutdown()
+    print("pool kept at its size, falls back to a serial parse on errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=max(os.cpu_count() or 1, 2))
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    check_fallback(args.processes)
+    start = time.perf_counter()
+    warm = page("mikro", 50)
+    parse_pool.parse("mikro", warm, args.processes)  # starts the workers and imports a parser
+    print(f"{os.cpu_count()} CPU(s), {args.processes} processes, "
+          f"pool start-up {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    try:
+        for cinema in CINEMAS:
+            spec = specs()[cinema]
+            print(f"{spec.name}")
+            print(f"  {'screenings':>10} {'KB':>8} {'serial ms':>10} {'pool ms':>9} {'speedup':>8}")
+            crossover = None
+            for count in COUNTS:
+                html = page(cinema, count)
+                serial_time, expected = timed(lambda: spec.parse(html), args.rounds)
+                pool_time, result = timed(lambda: parse_pool.parse(cinema, html, args.processes),
+                                          args.rounds)
+                if result != expected or [s.to_dict() for s in result] != [s.to_dict() for s in expected]:
+                    raise SystemExit(f"{cinema}: pool result differs from the serial parse")
+                if pool_time >= serial_time:
+                    crossover = None
+                elif crossover is None:
+                    crossover = len(html)
+                print(f"  {count:>10} {len(html) / 1024:8.0f} {serial_time * 1000:10.1f} "
+                      f"{pool_time * 1000:9.1f} {serial_time / pool_time:7.2f}x")
+            if crossover is None:
+                print("  pool never faster up to the largest page\n")
+            else:
+                print(f"  crossover at about {crossover:,} characters\n")
+    finally:
+        parse_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Offline parser benchmark against checked-in pages and scaled copies.
+
+Every parser in parsers.PARSERS is run on benchmarks/synthetic/<cinema>.html
+and on copies scaled to 10x and 100x the screenings, by repeating the
+page's screening blocks. Reports screenings/s, MB/s and tracemalloc
+peak, and compares against benchmarks/parser_baseline.json: exits 1 when a
+parser's screening count changes or its throughput falls more than
+--tolerance below the baseline.
+
+The pages are synthetic, not captured from the cinemas' sites: they are
+pages.page(cinema, 60, date(2026, 1, 24)), checked in so that changes to
+pages.py do not move the baseline. They follow the markup the parsers
+expect, but not the real pages' size, noise or layout quirks. A captured
+page saved under the same name is scaled and measured the same way
+(refresh the baseline after swapping one in).
+
+Throughput is compared relative to a fixed regex calibration workload
+timed right before and after every parse, so the baseline carries over
+between machines and tolerates load on shared ones.
+
+Usage:
+    python benchmarks/bench_parsers.py [--rounds N] [--tolerance 0.5]
+    python benchmarks/bench_parsers.py --update-baseline
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+
+from parsers import PARSERS
+
+PAGES = Path(__file__).parent / "synthetic"
+BASELINE = Path(__file__).parent / "parser_baseline.json"
+SCALES = (1, 10, 100)
+
+# Start of each repeated screening block, per cinema
+MARKERS = {
+    "kika": re.compile(r'<div class="repertoire-once row '),
+    "mikro": re.compile(r'<div class="repertoire-separator">'),
+    "agrafka": re.compile(r'<table class="repertoire"'),
+    "paradox": re.compile(r'<div class="list-item__content__row" '),
+    "baranami": re.compile(r'<p class="rep_date">'),
+    "kijow": re.compile(r"\{'Id': "),
+}
+
+
+def calibrate(rounds: int = 3) -> float:
+    """Seconds for a fixed regex-and-allocation workload (best of rounds)."""
+    text = "".join(f'<div class="row {i}"><a title="x {i}">t</a> godz. 1{i % 10}:00</div>'
+                   for i in range(5000))
+    pattern = re.compile(r'<div class="row (\d+)"><a title="([^"]+)">.*?godz\.\s*(\d{1,2}:\d{2})')
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        [m.groups() for m in pattern.finditer(text)]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def scaled(html: str, marker: re.Pattern, factor: int) -> str:
+    """Repeat everything from the first to the last block marker factor times."""
+    starts = [m.start() for m in marker.finditer(html)]
+    if factor == 1 or len(starts) < 2:
+        return html
+    first, last = starts[0], starts[-1]
+    return html[:first] + html[first:last] * factor + html[last:]
+
+
+def measure(parse_fn, html: str, rounds: int) -> dict:
+    best = None
+    relative = []
+    for _ in range(rounds):
+        before = calibrate()
+        start = time.perf_counter()
+        records = parse_fn(html)
+        elapsed = time.perf_counter() - start
+        unit = min(before, calibrate())
+        best = elapsed if best is None else min(best, elapsed)
+        # Screenings parsed per calibration unit, timed under the same load
+        relative.append(len(records) / elapsed * unit)
+
+    tracemalloc.start()
+    parse_fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = len(html.encode("utf-8"))
+    return {
+        "screenings": len(records),
+        "seconds": best,
+        "screenings_per_s": len(records) / best,
+        "mb_per_s": size / 1e6 / best,
+        "peak_mb": peak / 1e6,
+        "relative": statistics.median(relative),
+    }
+
+
+def run(rounds: int) -> dict:
+    results = {}
+    for cinema, (name, parse_fn) in PARSERS.items():
+        path = PAGES / f"{cinema}.html"
+        if not path.exists() or cinema not in MARKERS:
+            print(f"  {name:<8} no page, skipped")
+            continue
+        html = path.read_text(encoding="utf-8")
+        for factor in SCALES:
+            page = scaled(html, MARKERS[cinema], factor)
+            result = measure(parse_fn, page, rounds)
+            results[f"{cinema}@{factor}x"] = result
+            print(f"  {name:<8} {factor:>3}x  {len(page) / 1e6:6.2f} MB  "
+                  f"{result['screenings']:>6} screenings  {result['screenings_per_s']:>9,.0f}/s  "
+                  f"{result['mb_per_s']:6.1f} MB/s  peak {result['peak_mb']:6.2f} MB  "
+                  f"({result['relative']:,.0f}/unit)")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    failures = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        if result["screenings"] != expected["screenings"]:
+            failures.append(f"{key}: {result['screenings']} screenings, baseline {expected['screenings']}")
+        floor = expected["relative"] * (1 - tolerance)
+        if result["relative"] < floor:
+            failures.append(f"{key}: {result['relative']:,.0f} screenings/unit, "
+                            f"baseline {expected['relative']:,.0f} (floor {floor:,.0f})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed fractional throughput drop vs baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.rounds)
+
+    if args.update_baseline:
+        baseline = {
+            key: {
+                "screenings": r["screenings"],
+                "screenings_per_s": round(r["screenings_per_s"]),
+                "relative": round(r["relative"]),
+            }
+            for key, r in results.items()
+        }
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {BASELINE}")
+        return
+
+    if not BASELINE.exists():
+        print("No baseline yet; run with --update-baseline")
+        return
+
+    failures = compare(results, json.loads(BASELINE.read_text(encoding="utf-8")), args.tolerance)
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
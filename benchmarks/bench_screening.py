@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Memory and filter speed of Screening records vs the old per-screening dicts.
+
+Builds a multi-month archive for all cinemas, once as plain dicts with ISO
+date / "HH:MM" strings and once as Screening records, then filters a week
+of evenings out of each.
+
+Usage: python benchmarks/bench_screening.py [--months N] [--per-day N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+from pages import HOURS, TITLES
+
+from core import filter_screenings
+from screening import Screening
+
+CINEMAS = ["KIKA", "Mikro", "Agrafka", "Paradox", "Barany", "Kijów"]
+DAYS = ["poniedziałek", "wtorek", "środa", "czwartek", "piątek", "sobota", "niedziela"]
+
+
+def archive_rows(months: int, per_day: int):
+    start = date.today() - timedelta(days=30 * months)
+    for offset in range(30 * months):
+        d = start + timedelta(days=offset)
+        for cinema in CINEMAS:
+            for i in range(per_day):
+                yield (f"{TITLES[(offset + i) % len(TITLES)]} {i % 3}", d.isoformat(),
+                       HOURS[i % len(HOURS)], DAYS[d.weekday()], cinema)
+
+
+def build(kind: str, months: int, per_day: int) -> tuple[list, int]:
+    tracemalloc.start()
+    if kind == "dict":
+        # Copy strings the way a parser produces them: fresh objects per row
+        records = [{"title": "".join(t), "date": "".join(d), "time": "".join(h),
+                    "day": "".join(w), "cinema": c}
+                   for t, d, h, w, c in archive_rows(months, per_day)]
+    else:
+        records = [Screening("".join(t), d, h, w, c) for t, d, h, w, c in archive_rows(months, per_day)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, current
+
+
+def legacy_filter(screenings, from_date, to_date, min_time=None, max_time=None, cinemas=None):
+    """filter_screenings as it was for dict records."""
+    filtered = []
+    for s in screenings:
+        try:
+            d = date.fromisoformat(s["date"])
+        except ValueError:
+            continue
+        if d < from_date or d > to_date:
+            continue
+        if min_time and s["time"] < min_time:
+            continue
+        if max_time and s["time"] > max_time:
+            continue
+        if cinemas and s["cinema"] not in cinemas:
+            continue
+        filtered.append(s)
+    return filtered
+
+
+def best_of(rounds: int, fn, *args) -> tuple[float, list]:
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--per-day", type=int, default=12, help="screenings per cinema per day")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    dicts, dict_bytes = build("dict", args.months, args.per_day)
+    records, record_bytes = build("screening", args.months, args.per_day)
+    print(f"{len(records)} screenings over {args.months} months")
+    print(f"  memory  dict {dict_bytes / 1e6:7.1f} MB   Screening {record_bytes / 1e6:7.1f} MB   "
+          f"({dict_bytes / record_bytes:.1f}x smaller)")
+
+    week = (date.today() - timedelta(days=14), date.today() - timedelta(days=8), "17:00", "22:00")
+    dict_time, dict_result = best_of(args.rounds, legacy_filter, dicts, *week)
+    record_time, record_result = best_of(args.rounds, filter_screenings, records, *week)
+    as_rows = sorted(tuple(s.values()) for s in record_result)
+    if as_rows != sorted(tuple(s.values()) for s in dict_result):
+        raise SystemExit("filter results differ")
+    print(f"  filter  dict {dict_time * 1000:7.1f} ms   Screening (indexed) {record_time * 1000:7.2f} ms   "
+          f"({dict_time / record_time:.1f}x faster, {len(record_result)} hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""GUI search: substring scan over screenings vs search.TitleIndex over titles.
+
+Builds --screenings screenings over --titles distinct titles and replays
+the keystrokes of typing a few queries, as the search box does (one rerun
+per keystroke). The scan checks every screening's title; the index looks
+up the matching titles, then keeps their screenings. Checks the index finds
+everything the scan found, for fixed in-word fragments (PROBES) and a
+random sample, and that folded and misspelled queries match.
+
+Usage: python benchmarks/bench_search.py [--titles N] [--screenings N]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+from bench_titles import films
+from pages import TITLES
+
+from screening import Screening
+from search import TitleIndex
+from titles import canonical_map
+
+CINEMAS = ["KIKA", "Mikro", "Agrafka", "Paradox", "Barany", "Kijów"]
+
+# In-word fragments, short ones included, that the scan finds in the titles below
+PROBES = ["ół", "eź", "no", "eż ", "ęs", "a t", "ż", "o"]
+PROBE_TITLES = ["Rzeź", "Grzeż i morze", "Tęsknota"]
+
+
+def screenings(titles: list[str], count: int) -> list[Screening]:
+    rng = random.Random(count)
+    return [
+        Screening.from_ordinal(rng.choice(titles), 740000 + rng.randrange(30),
+                               rng.randrange(600, 1380, 15), "", rng.choice(CINEMAS))
+        for _ in range(count)
+    ]
+
+
+def scan(records: list[Screening], titles: dict[str, str], search: str) -> list[Screening]:
+    """The search box before the index: substring test on every screening."""
+    search_lower = search.lower()
+    return [
+        s for s in records
+        if search_lower in s.title.lower() or search_lower in titles.get(s.title, "").lower()
+    ]
+
+
+def indexed(records: list[Screening], index: TitleIndex, search: str) -> list[Screening]:
+    matched = set(index.search(search))
+    return [s for s in records if s.title in matched]
+
+
+def keystrokes(queries: list[str]) -> list[str]:
+    return [query[:n] for query in queries for n in range(1, len(query) + 1)]
+
+
+def timed(fn, *args, rounds: int = 5) -> float:
+    best = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(*args)
+        best.append(time.perf_counter() - start)
+    return min(best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=2000)
+    parser.add_argument("--screenings", type=int, default=100000)
+    args = parser.parse_args()
+
+    names = TITLES + PROBE_TITLES + films(args.titles)
+    records = screenings(names, args.screenings)
+    canonical = canonical_map(records)
+
+    start = time.perf_counter()
+    index = TitleIndex(canonical)
+    built = time.perf_counter() - start
+
+    # Correctness: a superset of the scan, plus folding and fuzzy matches
+    rng = random.Random(5)
+    sample = []
+    for name in rng.sample(names, 50):
+        i = rng.randrange(len(name) - 2)
+        sample.append(name[i:i + 3 + rng.randrange(4)].lower())
+    for query in PROBES + sample:
+        found = scan(records, canonical, query)
+        if query in PROBES and not found:
+            raise SystemExit(f"probe {query!r} matches no screening")
+        if query.strip() and set(map(id, found)) - set(map(id, indexed(records, index, query))):
+            raise SystemExit(f"index misses screenings the scan finds for {query!r}")
+    for query in ["zolw", "ZÓŁW", "emilia perez", "zolw zaj", "brutalsta", "dziewczyna igla"]:
+        if not index.search(query):
+            raise SystemExit(f"no match for {query!r}")
+
+    typed = keystrokes(["zolw", "brutal", "dziewczyna z", "wszystko co", "pianstka"] +
+                       [rng.choice(names)[:8] for _ in range(5)])
+    print(f"{len(records)} screenings, {len(index)} distinct titles, index built in {built * 1000:.1f} ms")
+    lookups = [timed(index.search, query) for query in typed]
+    scans = [timed(scan, records, canonical, query) for query in typed]
+    joins = [timed(indexed, records, index, query) for query in typed]
+    print(f"  title lookup     median {statistics.median(lookups) * 1000:7.3f} ms   max {max(lookups) * 1000:7.3f} ms")
+    print(f"  scan screenings  median {statistics.median(scans) * 1000:7.3f} ms   max {max(scans) * 1000:7.3f} ms")
+    print(f"  index + join     median {statistics.median(joins) * 1000:7.3f} ms   max {max(joins) * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
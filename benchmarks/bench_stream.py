@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Buffered vs streaming fetch-and-parse for the cinemas with incremental parsers.
+
+The stand-in server trickles each page out in small pieces, like a slow
+link. Buffered parsing can only start after the last byte; streaming parses
+each completed section or record while the rest is still downloading.
+
+Usage: python benchmarks/bench_stream.py [--count N] [--piece BYTES] [--pause S]
+"""
+
+import argparse
+import codecs
+import random
+import shutil
+import time
+
+from standin import StandIn
+
+import core
+import fetch
+import parse_cache
+from pages import page
+from parsers import PARSERS, STREAM_PARSERS
+
+
+def check_chunking(trials: int = 50):
+    """Stream parsers must match parse() for any split, in both page encodings."""
+    rng = random.Random(0)
+    for cinema, parse_stream in STREAM_PARSERS.items():
+        for encoding in ("utf-8", "iso-8859-2"):
+            data = page(cinema, 300).encode(encoding, errors="replace")
+            expected = PARSERS[cinema][1](data.decode(encoding))
+            for _ in range(trials):
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                sizes = [rng.choice((1, 2, 3, 7, 64, 4096)) for _ in range(len(data))]
+                pieces, pos = [], 0
+                for size in sizes:
+                    if pos >= len(data):
+                        break
+                    pieces.append(decoder.decode(data[pos:pos + size]))
+                    pos += size
+                pieces.append(decoder.decode(b"", final=True))
+                if list(parse_stream(pieces)) != expected:
+                    raise SystemExit(f"{cinema}/{encoding}: stream parse differs from parse()")
+
+
+def cold_fetch(cinema: str, stream: bool):
+    shutil.rmtree(fetch.CACHE_DIR, ignore_errors=True)
+    parse_cache._memory.clear()
+    start = time.perf_counter()
+    screenings, status = core.fetch_and_parse(cinema, stream=stream)
+    return time.perf_counter() - start, screenings, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="screenings per page")
+    parser.add_argument("--piece", type=int, default=64 * 1024, help="bytes per trickled piece")
+    parser.add_argument("--pause", type=float, default=0.02, help="seconds between pieces")
+    args = parser.parse_args()
+
+    check_chunking()
+
+    standin = StandIn(count=args.count, trickle=(args.piece, args.pause))
+    with standin.installed():
+        for cinema in STREAM_PARSERS:
+            size = len(standin.bodies[cinema])
+            buffered, expected, _ = cold_fetch(cinema, stream=False)
+            streamed, got, status = cold_fetch(cinema, stream=True)
+            if got != expected:
+                raise SystemExit(f"{cinema}: streaming output differs ({status})")
+            print(f"  {cinema:<8} {size / 1e6:5.2f} MB  buffered {buffered * 1000:7.1f} ms  "
+                  f"streaming {streamed * 1000:7.1f} ms  ({len(got)} screenings)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Fuzzy title merging: trigram index vs comparing every pair of titles.
+
+Generates --films distinct synthetic titles, each spelled a few ways across
+cinemas (diacritics dropped, "(napisy)" tags, punctuation, a typo), then
+merges them with titles.canonical_titles and with a pairwise reference that
+scores every pair. Checks both find the same groups (up to --check films)
+and reports how each scales. First checks that sequels and parts stay
+apart from their originals, as do titles repeating a word of another,
+while other near spellings still merge.
+
+Usage: python benchmarks/bench_titles.py [--films N ...] [--check N]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+import standin  # noqa: F401  (puts the repo root on sys.path)
+from pages import TITLES
+
+import titles
+
+VOWELS = "aeiouyąęó"
+CONSONANTS = "bcdfghjklmnprstwzłśżćń"
+
+
+def vocabulary(size: int, seed: int = 3) -> list[str]:
+    """Real titles' words plus pseudo-Polish words, so titles are as varied as real ones."""
+    rng = random.Random(seed)
+    words = {w for title in TITLES for w in title.replace(",", "").split()}
+    while len(words) < size:
+        letters = [rng.choice(CONSONANTS if i % 2 else VOWELS) for i in range(rng.randint(3, 10))]
+        if rng.random() < 0.5:
+            letters.insert(0, rng.choice(CONSONANTS))
+        words.add("".join(letters))
+    return sorted(words)
+
+
+def films(count: int, seed: int = 7) -> list[str]:
+    # A bigger catalogue has a bigger vocabulary, as real listings do
+    words = vocabulary(max(5000, 2 * count))
+    rng = random.Random(seed)
+    seen = set()
+    result = []
+    while len(result) < count:
+        title = " ".join(rng.choice(words) for _ in range(rng.randint(2, 4))).capitalize()
+        if rng.random() < 0.1:
+            title += f" {rng.randint(2, 4)}"
+        if titles.fold(title) not in seen:
+            seen.add(titles.fold(title))
+            result.append(title)
+    return result
+
+
+# Titles that must not merge, however similar
+SEQUELS = [
+    ("Ojciec Chrzestny Ii", "Ojciec Chrzestny"),
+    ("Rocky III", "Rocky II"),
+    ("Gwiezdne wojny: Część V", "Gwiezdne wojny: Część IV"),
+    ("Diuna: część druga", "Diuna"),
+    ("Harry Potter i Insygnia Śmierci: część 1", "Harry Potter i Insygnia Śmierci: część 2"),
+    ("Avatar: Part Two", "Avatar"),
+    ("Sing", "Sing Sing"),
+    ("Bogowie", "Bogowie Bogowie"),
+]
+# Titles that must merge: "i" as a conjunction is not a numeral
+SAME = [
+    ("Harry Potter i Zakon Feniksa", "Harry Potter i Zakon Fenksa"),
+    ("Harry Potter i Komnata Tajemnic", "Harry Potter i Komnata Tajemnic (napisy)"),
+    ("Ojciec Chrzestny II", "OJCIEC CHRZESTNY II - dubbing"),
+]
+
+
+def check_sequels():
+    for pairs, merge in ((SEQUELS, False), (SAME, True)):
+        for a, b in pairs:
+            merged = titles.canonical_titles({a: 1, b: 1})
+            if (merged[a] == merged[b]) != merge:
+                raise SystemExit(f"{a!r} and {b!r} {'not ' if merge else ''}merged")
+    print(f"  sequels: {len(SEQUELS)} pairs kept apart, {len(SAME)} pairs merged")
+
+
+def spellings(title: str, rng: random.Random) -> list[str]:
+    plain = title.translate(str.maketrans("ąćęłńóśźżĄĆĘŁŃÓŚŹŻ", "acelnoszzACELNOSZZ"))
+    variants = [title, plain, f"{title} (napisy)", title.upper(), f"{title} - dubbing"]
+    if len(title) > 12:
+        i = rng.randrange(1, len(title) - 1)
+        variants.append(title[:i] + title[i + 1:])  # dropped letter
+    return rng.sample(variants, rng.randint(1, len(variants)))
+
+
+def pairwise(counts: dict[str, int], threshold: float) -> dict[str, str]:
+    """Reference: fold, then score every pair of keys (O(n^2))."""
+    keys = sorted({titles.fold(t) for t in counts})
+    grams = [titles.trigrams(k) for k in keys]
+    numbers = [titles.sequel_numbers(k) for k in keys]
+    clusters = titles._Clusters(len(keys))
+    for i in range(len(keys)):
+        for j in range(i + 1, len(keys)):
+            if len(keys[i]) < 4 or len(keys[j]) < 4 or numbers[i] != numbers[j]:
+                continue
+            if 2 * len(grams[i] & grams[j]) >= threshold * (len(grams[i]) + len(grams[j])):
+                clusters.union(i, j)
+    position = {k: i for i, k in enumerate(keys)}
+    return {t: clusters.find(position[titles.fold(t)]) for t in counts}
+
+
+def groups(mapping: dict[str, object]) -> set[frozenset]:
+    by_value = {}
+    for title, value in mapping.items():
+        by_value.setdefault(value, set()).add(title)
+    return {frozenset(group) for group in by_value.values()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--films", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--check", type=int, default=2000, help="largest size to run pairwise")
+    args = parser.parse_args()
+
+    check_sequels()
+    rng = random.Random(1)
+    for count in args.films:
+        counts = Counter()
+        for film in films(count):
+            for spelling in spellings(film, rng):
+                counts[spelling] += rng.randint(1, 20)
+
+        titles.fold.cache_clear()
+        start = time.perf_counter()
+        merged = titles.canonical_titles(counts)
+        indexed = time.perf_counter() - start
+        line = (f"  {count:>6} films  {len(counts):>6} spellings -> {len(set(merged.values())):>6} titles  "
+                f"index {indexed * 1000:8.1f} ms")
+
+        if count <= args.check:
+            start = time.perf_counter()
+            reference = pairwise(counts, titles.SIMILARITY)
+            naive = time.perf_counter() - start
+            if groups(reference) != groups(merged):
+                raise SystemExit(f"{count} films: index and pairwise merges differ")
+            line += f"   pairwise {naive * 1000:9.1f} ms  ({naive / indexed:.0f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Synthetic repertoire pages shaped like each cinema's real HTML."""
+
+from datetime import date, timedelta
+from html import escape
+
+TITLES = [
+    "Żółw i zając", "Dzikie róże", "Anora", "Brutalista", "Kos",
+    "Pod wulkanem", "Konklawe", "Flow", "Wszystko, co kochamy",
+    "Emilia Pérez", "Prawdziwy ból", "Substancja", "Dziewczyna z igłą",
+    "Lęk", "Światłość", "Ostatnie wakacje", "Pianistka", "Ida",
+]
+HOURS = ["10:30", "13:15", "16:00", "17:45", "18:30", "20:00", "21:15"]
+
+WEEKDAYS = ["poniedziałek", "wtorek", "środa", "czwartek", "piątek", "sobota", "niedziela"]
+MONTHS = ["stycznia", "lutego", "marca", "kwietnia", "maja", "czerwca", "lipca",
+          "sierpnia", "września", "października", "listopada", "grudnia"]
+
+
+def _slots(count: int, start: date):
+    """Yield (index, date, time, title) for count screenings, ~5 per day."""
+    for i in range(count):
+        d = start + timedelta(days=i // 5)
+        yield i, d, HOURS[i % len(HOURS)], TITLES[(i * 7) % len(TITLES)]
+
+
+def kika(count: int, start: date) -> str:
+    parts = ["<html><body><div class=\"repertoire\">"]
+    for i, d, hour, title in _slots(count, start):
+        parts.append(
+            f'<div class="repertoire-once row {d.isoformat()} film-{i}">\n'
+            f'  <a title="Kup bilet - {escape(title)}" href="/kup/{i}">{escape(title)}</a>\n'
+            f'  <p><i class="fa fa-calendar"></i> {WEEKDAYS[d.weekday()].capitalize()}, {d:%d.%m}</p>\n'
+            f'  <p>godz. {hour}</p>\n'
+            f'</div>\n'
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def mikro(count: int, start: date) -> str:
+    parts = ["<html><body>"]
+    current = None
+    for i, d, hour, title in _slots(count, start):
+        if d != current:
+            current = d
+            parts.append(
+                f'<div class="repertoire-separator">{WEEKDAYS[d.weekday()]} - {d.day}/{d.month}</div>\n'
+            )
+        parts.append(
+            f'<div class="repertoire-item film-{i}" data-id="{i}">'
+            f'<div class="repertoire-item-info">'
+            f'<p class="repertoire-item-hour">{hour}</p>'
+            f'<a class="repertoire-item-title" href="/film/{i}">{escape(title)}</a>'
+            f'</div>\n</div>\n'
+        )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def agrafka(count: int, start: date) -> str:
+    parts = ["<html><body>"]
+    current = None
+    for i, d, hour, title in _slots(count, start):
+        if d != current:
+            if current is not None:
+                parts.append("</tbody></table>\n")
+                # The real page keeps years of old repertoire in comments
+                parts.append(
+                    "<!-- <table class=\"repertoire\"><thead><tr><th><h3>1 stycznia 2019 /wtorek/</h3>"
+                    "</th></tr></thead><tbody><tr><td class=\"hour\">12:00</td><td>"
+                    "<a href=\"film.php?id=0\">Stary film</a></td></tr></tbody></table> -->\n"
+                )
+            current = d
+            parts.append(
+                f'<table class="repertoire" id="d{d.toordinal()}"><thead><tr><th>'
+                f'<h3>{d.day} {MONTHS[d.month - 1]} {d.year} /{WEEKDAYS[d.weekday()]}/</h3>'
+                f'</th></tr></thead><tbody>\n'
+            )
+        parts.append(
+            f'<tr><td class="hour">{hour}</td><td>'
+            f'<a href="film.php?id={i}" title="Original {i}"><b>{escape(title)}</b> </a>'
+            f'</td></tr>\n'
+        )
+    if current is not None:
+        parts.append("</tbody></table>\n")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def paradox(count: int, start: date) -> str:
+    parts = ["<html><body>"]
+    for i, d, hour, title in _slots(count, start):
+        parts.append(
+            f'<div class="list-item__content__row" data-date="{d:%d.%m.%Y}">\n'
+            f'  <div class="item-time">{hour}</div>\n'
+            f'  <a class="item-title" href="/film/{i}">\n    {escape(title)}\n  </a>\n'
+            f'</div>\n'
+        )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def baranami(count: int, start: date) -> str:
+    parts = ["<html><body>"]
+    current = None
+    for i, d, hour, title in _slots(count, start):
+        if d != current:
+            if current is not None:
+                parts.append("</ul>\n")
+            current = d
+            parts.append(
+                f'<p class="rep_date"><span>{WEEKDAYS[d.weekday()].capitalize()}</span> '
+                f'{d.day} {MONTHS[d.month - 1]} //</p>\n<ul>\n'
+            )
+        parts.append(
+            f'<li class="film"><a href="film.php?id={i}">{escape(title)}</a> '
+            f'<span>godz. {hour}</span> '
+            f'<a onclick="validateAndShowOrderDialog({i},1,\'{d.year}\',\'{d.month}\')">kup</a></li>\n'
+        )
+    if current is not None:
+        parts.append("</ul>\n")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def kijow(count: int, start: date) -> str:
+    records = []
+    for i, d, hour, title in _slots(count, start):
+        name = escape(title).replace("'", "&#39;")
+        records.append(
+            f"{{'Id': {i}, 'Name': '{name}', 'Date': '{d:%d.%m.%Y}', 'Hour': '{hour}'}}"
+        )
+    return "<html><body><script>var events = [" + ",\n".join(records) + "];</script></body></html>"
+
+
+GENERATORS = {
+    "kika": kika,
+    "mikro": mikro,
+    "agrafka": agrafka,
+    "paradox": paradox,
+    "baranami": baranami,
+    "kijow": kijow,
+}
+
+
+def page(cinema: str, count: int, start: date | None = None) -> str:
+    """Build a synthetic page for cinema with count screenings from start."""
+    return GENERATORS[cinema](count, start or date.today())
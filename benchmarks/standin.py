@@ -0,0 +1,244 @@
+"""Local stand-in server for the cinema sites, for offline benchmarks."""
+
+import gzip as gzip_module
+import hashlib
+import select
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fetch
+from pages import page
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real sites; urllib still closes after each request
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes: without this, Nagle's
+    # algorithm holds the body for the client's delayed ACK on reused connections
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        # An absolute URL means the client takes this server for a proxy: serve it anyway
+        url = urlsplit(self.path)
+        cinema = url.path.strip("/")
+        body = self.server.bodies.get(cinema)
+        time.sleep(self.server.delays.get(cinema, 0.0))
+
+        if body is None:
+            self.send_error(404)
+            return
+
+        # Redirect hop by hop, alternating between 127.0.0.1 and localhost (another pool)
+        hop = int(parse_qs(url.query).get("hop", ["0"])[0])
+        if hop < self.server.redirects.get(cinema, 0):
+            host = "localhost" if hop % 2 == 0 else "127.0.0.1"
+            self.send_response(302 if hop % 2 == 0 else 301)
+            self.send_header("Location", f"{self.server.scheme}://{host}:{self.server.server_port}"
+                                         f"/{cinema}?hop={hop + 1}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with self.server.lock:
+            failing = self.server.failures.get(cinema, 0)
+            if failing:
+                self.server.failures[cinema] = failing - 1
+        if failing:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = self.server.gzipped[cinema]
+            self.send_header("Content-Encoding", "gzip")
+        self.server.bytes_sent += len(body)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.server.last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        # Optionally trickle the body out to simulate a slow link
+        step = self.server.trickle[0] or len(body)
+        for i in range(0, len(body), step):
+            self.wfile.write(body[i:i + step])
+            self.wfile.flush()
+            time.sleep(self.server.trickle[1])
+
+    def do_CONNECT(self):
+        """Tunnel to host:port, as an HTTPS proxy does."""
+        host, _, port = self.path.rpartition(":")
+        with self.server.lock:
+            self.server.tunnels += 1
+        try:
+            upstream = socket.create_connection((host, int(port)), timeout=10)
+        except OSError:
+            self.send_error(502)
+            return
+        self.send_response(200, "Connection established")
+        self.end_headers()
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, _ = select.select(sockets, [], [], 30)
+                if not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandIn:
+    """
+    Serve synthetic pages for every cinema at http://127.0.0.1:<port>/<cinema>.
+
+    Absolute-URL requests are served the same way and CONNECT opens a
+    tunnel, so the server can also play a forward proxy.
+
+    Args:
+        count: Screenings per page
+        delays: Seconds to sleep before answering, per cinema
+        gzip: Send Content-Encoding: gzip to clients that accept it
+        trickle: (bytes, seconds) - send the body in pieces with a pause after each
+        failures: Number of 503 answers per cinema before it serves its page
+        redirects: Number of redirects per cinema before it serves its page
+        tls: Serve HTTPS with a throwaway self-signed certificate (needs the
+            openssl command); clients trust it through ssl_context()
+    """
+
+    def __init__(self, count: int = 200, delays: dict[str, float] | None = None,
+                 gzip: bool = False, trickle: tuple[int, float] = (0, 0.0),
+                 failures: dict[str, int] | None = None, tls: bool = False,
+                 redirects: dict[str, int] | None = None):
+        self.bodies = {}
+        for cinema, (_, encoding) in fetch.CINEMAS.items():
+            self.bodies[cinema] = page(cinema, count).encode(encoding)
+        self.gzipped = {cinema: gzip_module.compress(body) for cinema, body in self.bodies.items()}
+        self.delays = delays or {}
+        self.gzip = gzip
+        self.trickle = trickle
+        self.failures = failures or {}
+        self.redirects = redirects or {}
+        self.tls = tls
+        self.server = None
+        self._certs = None
+
+    def _certificate(self) -> Path:
+        if self._certs is None:
+            self._certs = tempfile.TemporaryDirectory()
+            subprocess.run(
+                ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                 "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+                 "-keyout", f"{self._certs.name}/key.pem", "-out", f"{self._certs.name}/cert.pem"],
+                check=True, capture_output=True,
+            )
+        return Path(self._certs.name)
+
+    def ssl_context(self) -> ssl.SSLContext:
+        """Client context trusting this server's certificate."""
+        return ssl.create_default_context(cafile=self._certificate() / "cert.pem")
+
+    def start(self) -> str:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.bodies = self.bodies
+        self.server.delays = self.delays
+        self.server.gzip = self.gzip
+        self.server.trickle = self.trickle
+        self.server.gzipped = self.gzipped
+        self.server.last_modified = formatdate(usegmt=True)
+        self.server.bytes_sent = 0
+        self.server.not_modified = 0
+        self.server.connections = 0
+        self.server.failures = dict(self.failures)
+        self.server.redirects = self.redirects
+        self.server.tunnels = 0
+        self.server.lock = threading.Lock()
+        scheme = "http"
+        if self.tls:
+            certs = self._certificate()
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certs / "cert.pem", certs / "key.pem")
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            scheme = "https"
+        self.server.scheme = scheme
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"{scheme}://127.0.0.1:{self.server.server_port}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._certs is not None:
+            self._certs.cleanup()
+            self._certs = None
+
+    @contextmanager
+    def installed(self, client=None):
+        """
+        Point fetch.CINEMAS at this server and use a throwaway cache dir.
+
+        fetch uses client (a client.HTTPClient) if given, else a fresh one
+        trusting the server's certificate with tls and ignoring any proxy
+        set in the environment. As this one server stands in for every
+        site, the fresh client allows a request per cinema at once rather
+        than client.PER_HOST.
+        """
+        base = self.start()
+        original_cinemas = dict(fetch.CINEMAS)
+        original_cache = fetch.CACHE_DIR
+        original_client = fetch._client
+        if client is None:
+            from client import HTTPClient
+            client = HTTPClient(per_host=len(original_cinemas), proxies={},
+                                ssl_context=self.ssl_context() if self.tls else None)
+        fetch._client = client
+        with tempfile.TemporaryDirectory() as tmp:
+            fetch.CACHE_DIR = Path(tmp)
+            for cinema, (_, encoding) in original_cinemas.items():
+                fetch.CINEMAS[cinema] = (f"{base}/{cinema}", encoding)
+            try:
+                yield base
+            finally:
+                fetch.CINEMAS.clear()
+                fetch.CINEMAS.update(original_cinemas)
+                fetch.CACHE_DIR = original_cache
+                fetch._client = original_client
+                client.close()
+                self.stop()
@@ -0,0 +1,222 @@
+"""Change feed: which screenings each fetch added to or removed from a cinema.
+
+Every cinema's last parsed listing is kept as fingerprints, a 64-bit hash
+of (cinema, date, time, title) per screening, in cache/<cinema>.prints.json.
+The next parse of a changed page is diffed against it with one pass over
+each side, and the difference is appended to the change log
+cache/changes.jsonl, one JSON line per cinema and fetch that changed:
+
+    {"at": "2026-01-24T18:00:00", "cinema_key": "mikro", "cinema": "Mikro",
+     "added": [["5f0c...", "2026-01-30", "20:15", "Anora"]],
+     "removed": [["9a41...", "2026-01-29", "18:00", "Anora"]]}
+
+Rows are [id, date, time, title], where id is the screening's fingerprint
+(16 hex digits), so a consumer keeping its own copy of the schedule can
+apply the log by inserting added ids and deleting removed ones. Like the
+store, a page is authoritative from its earliest date onwards: screenings
+before it that drop off the page are past, not removed. The first fetch
+of a cinema only records its fingerprints, and an empty page is ignored.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+
+import fetch
+from screening import Screening
+
+LOG_NAME = "changes.jsonl"
+LOG_MAX_BYTES = 1 << 20  # past this size the oldest half of the log is dropped
+
+_log_lock = threading.Lock()
+
+# cinema -> (content key, fingerprints), so repeat fetches in one process skip the JSON load
+_memory = {}
+_lock = threading.Lock()
+
+# cinema -> lock held across a whole record(), so two fetches of one cinema never diff the same prints
+_cinema_locks = {}
+
+
+@dataclass
+class Change:
+    """Screenings one fetch added to and removed from one cinema."""
+
+    at: str
+    cinema_key: str
+    cinema: str
+    added: list = field(default_factory=list)  # [id, date, time, title], by date and time
+    removed: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def log_path():
+    return fetch.CACHE_DIR / LOG_NAME
+
+
+def prints_path(cinema: str):
+    return fetch.CACHE_DIR / f"{cinema}.prints.json"
+
+
+def fingerprint(s: Screening) -> str:
+    """Stable id of a screening: a hash of its cinema, date, time and title."""
+    key = f"{s.cinema}\0{s.ordinal}\0{s.minutes}\0{s.title}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _row(fp: str, title: str, ordinal: int, minutes: int) -> list:
+    day = date.fromordinal(ordinal).isoformat() if ordinal > 0 else ""
+    time = f"{minutes // 60:02d}:{minutes % 60:02d}" if minutes >= 0 else ""
+    return [fp, day, time, title]
+
+
+def diff(previous: dict[str, list], screenings: list[Screening]) -> tuple[dict, list, list]:
+    """
+    Compare a cinema's new listing with its previous fingerprints.
+
+    Args:
+        previous: fingerprint -> [title, ordinal, minutes] of the last listing
+        screenings: The new listing
+
+    Returns:
+        (current, added, removed): the new listing's fingerprints in the
+        same form as previous, and the added and removed rows
+    """
+    current = {fingerprint(s): [s.title, s.ordinal, s.minutes] for s in screenings}
+    dated = [s.ordinal for s in screenings if s.ordinal > 0]
+    start = min(dated) if dated else 0
+
+    added = [_row(fp, *entry) for fp, entry in current.items() if fp not in previous]
+    removed = [
+        _row(fp, *entry) for fp, entry in previous.items()
+        if fp not in current and (entry[1] >= start or entry[1] == 0)
+    ]
+    added.sort(key=lambda row: (row[1], row[2], row[3]))
+    removed.sort(key=lambda row: (row[1], row[2], row[3]))
+    return current, added, removed
+
+
+def _load_prints(cinema: str) -> tuple[str, dict] | None:
+    with _lock:
+        entry = _memory.get(cinema)
+    if entry is None:
+        try:
+            data = json.loads(prints_path(cinema).read_text(encoding="utf-8"))
+            entry = (data["key"], data["screenings"])
+        except (OSError, ValueError, KeyError):
+            return None
+    return entry
+
+
+def _cinema_lock(cinema: str) -> threading.Lock:
+    with _lock:
+        return _cinema_locks.setdefault(cinema, threading.Lock())
+
+
+def record(cinema_key: str, name: str, content_key: str, screenings: list[Screening]) -> Change | None:
+    """
+    Diff a freshly parsed listing against the last one and log the change.
+
+    Nothing is compared when content_key matches the last recorded page.
+    Calls for one cinema run one at a time (a foreground fetch can race the
+    background refresher), so each change is diffed against the one before.
+
+    Returns:
+        The Change (also appended to the log), or None if nothing changed
+    """
+    if not screenings:
+        return None
+    with _cinema_lock(cinema_key):
+        return _record(cinema_key, name, content_key, screenings)
+
+
+def _record(cinema_key: str, name: str, content_key: str, screenings: list[Screening]) -> Change | None:
+    stored = _load_prints(cinema_key)
+    if stored is not None and stored[0] == content_key:
+        return None
+
+    current, added, removed = diff(stored[1] if stored else {}, screenings)
+    change = None
+    if stored is not None and (added or removed):
+        change = Change(datetime.now().isoformat(timespec="seconds"), cinema_key, name, added, removed)
+        _append(change)
+
+    with _lock:
+        _memory[cinema_key] = (content_key, current)
+    path = prints_path(cinema_key)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        fetch.ensure_cache_dir()
+        tmp.write_text(json.dumps({"key": content_key, "screenings": current}, ensure_ascii=False),
+                       encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return change
+
+
+def _append(change: Change) -> None:
+    line = json.dumps(change.to_dict(), ensure_ascii=False) + "\n"
+    path = log_path()
+    with _log_lock:
+        try:
+            fetch.ensure_cache_dir()
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+                size = f.tell()
+            if size > LOG_MAX_BYTES:
+                lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_text("".join(lines[len(lines) // 2:]), encoding="utf-8")
+                os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+def recent(since: str | None = None, cinemas: set[str] | None = None,
+           limit: int | None = None) -> list[Change]:
+    """
+    Logged changes, oldest first.
+
+    Args:
+        since: Only changes at or after this ISO timestamp
+        cinemas: Only these cinemas (display names)
+        limit: Only the newest limit changes
+    """
+    try:
+        with _log_lock:
+            text = log_path().read_text(encoding="utf-8")
+    except OSError:
+        return []
+
+    changes = []
+    for line in text.splitlines():
+        try:
+            change = Change(**json.loads(line))
+        except (ValueError, TypeError):
+            continue  # a line cut short by a crash
+        if since is not None and change.at < since:
+            continue
+        if cinemas is not None and change.cinema not in cinemas:
+            continue
+        changes.append(change)
+    return changes[-limit:] if limit else changes
+
+
+def format_changes(changes: list[Change], max_rows: int = 10) -> list[str]:
+    """Text lines per change: a summary, then up to max_rows screenings."""
+    lines = []
+    for change in changes:
+        lines.append(f"{change.at.replace('T', ' ')[:16]}  {change.cinema}: "
+                     f"{len(change.added)} added, {len(change.removed)} removed")
+        rows = [("+", row) for row in change.added] + [("-", row) for row in change.removed]
+        for sign, (_, day, time, title) in rows[:max_rows]:
+            lines.append(f"  {sign} {day} {time}  {title}")
+        if len(rows) > max_rows:
+            lines.append(f"  … {len(rows) - max_rows} more")
+    return lines
@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 """Cinema schedule aggregator for Krakow cinemas."""
 
+import argparse
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, timedelta
 from pathlib import Path
 
-from core import fetch_all_screenings, filter_screenings, count_results
-from formatting import format_schedule
+import changes
+import parse_pool
+import store
+from batch import Batch, format_results, load_specs
+from core import fetch_report, filter_screenings, format_timings, stored_screenings
+from export import FORMATS, export_files
+from fetch import cache_stats
+from schedule import build_schedule_view
+from titles import canonical_map
 
 OUTPUT_FILE = Path(__file__).parent / "schedule.md"
 
@@ -24,48 +34,212 @@ def prompt_date(label: str, default: date) -> date:
         return default
 
 
-def prompt_time(label: str) -> str | None:
+def valid_time(value: str) -> bool:
+    # Basic validation
+    return len(value) == 5 and value[2] == ":"
+
+
+def prompt_time(label: str, default: str | None = None) -> str | None:
     """Prompt user for minimum time (optional)."""
-    response = input(f"{label}: ").strip()
+    suffix = f" [{default}]" if default else ""
+    response = input(f"{label}{suffix}: ").strip()
     if not response:
-        return None
-    # Basic validation
-    if len(response) == 5 and response[2] == ":":
+        return default
+    if valid_time(response):
         return response
     print("Invalid time format, ignoring filter")
     return None
 
 
-def main():
-    print("\nFetching...")
+def time_arg(value: str) -> str:
+    if not valid_time(value):
+        raise argparse.ArgumentTypeError(f"expected HH:MM, got {value!r}")
+    return value
+
+
+def output_arg(value: str) -> Path:
+    path = Path(value)
+    if path.suffix.lower() not in FORMATS:
+        raise argparse.ArgumentTypeError(f"{value}: unknown format, use one of {', '.join(FORMATS)}")
+    return path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--offline", action="store_true",
+                        help="skip fetching and use screenings stored by earlier runs")
+    parser.add_argument("--no-prompt", action="store_true",
+                        help="take the filters from the options below instead of asking")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="first day (default: today)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="last day (default: six days after --from)")
+    parser.add_argument("--min-time", type=time_arg, metavar="HH:MM",
+                        help="earliest screening time (default: all)")
+    parser.add_argument("--output", type=output_arg, action="append", metavar="PATH",
+                        help=f"file to write, format from its suffix ({', '.join(FORMATS)}); "
+                             f"repeat for several (default: {OUTPUT_FILE.name})")
+    parser.add_argument("--timings-json", type=Path, metavar="PATH",
+                        help="append this run's timings to PATH as one JSON line")
+    parser.add_argument("--batch", type=Path, metavar="SPEC",
+                        help="write every query in the JSON spec file SPEC (see batch.py), no prompts")
+    parser.add_argument("--changes", type=int, nargs="?", const=20, metavar="N",
+                        help="print the last N changes between fetches (default: 20) and exit")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="with --batch, run queries on N threads; grouping holds the GIL, "
+                             "so this only pays off when writing outputs is slow (default: 1)")
+    parser.add_argument("--parse-processes", type=int, default=0, metavar="N",
+                        help=f"parse downloaded pages of {parse_pool.MIN_CHARS:,} characters and more "
+                             f"on N processes (Mikro, Agrafka, Pod Baranami; default: off)")
+    return parser.parse_args()
+
+
+def ask_filters(args: argparse.Namespace) -> tuple[date, date, str | None]:
+    """Date range and earliest time, from the prompts or (with --no-prompt) the options."""
+    from_date = args.from_date or date.today()
+    to_date = args.to_date or from_date + timedelta(days=6)
+    if args.no_prompt:
+        return from_date, to_date, args.min_time
+
+    print()
+    from_date = prompt_date("From date", from_date)
+    to_date = prompt_date("To date", args.to_date or from_date + timedelta(days=6))
+    min_time = prompt_time("Earliest time (empty=all)", args.min_time)
+    return from_date, to_date, min_time
+
+
+def fetch_step(args: argparse.Namespace, pending: Future) -> list:
+    """Wait for the background fetch, print status and timings, return the screenings."""
+    if not pending.done():
+        print("\nWaiting for cinemas...")
+
+    report = pending.result()
+    all_screenings = report.screenings
 
-    all_screenings, status = fetch_all_screenings()
+    print("\nFetched:")
 
-    for msg in status:
+    for msg in report.status:
         print(f"  {msg}")
 
-    if not all_screenings:
-        print("\nAll cinemas failed. Check your internet connection.")
-        sys.exit(1)
+    stats = cache_stats()
+    print(f"  Cache: {stats['hits']} fresh, {stats['revalidated']} revalidated, "
+          f"{stats['misses']} downloaded ({report.total * 1000:.0f} ms)")
 
+    # Per-cinema stage timings
     print()
+    for line in format_timings(report):
+        print(f"  {line}")
+
+    if args.timings_json:
+        report.append_to(args.timings_json)
+        print(f"  Timings appended to: {args.timings_json}")
+
+    # What this fetch added and removed
+    if any(r.added or r.removed for r in report.cinemas):
+        print("\nChanges since the last fetch:")
+        for line in changes.format_changes(changes.recent(since=report.started)):
+            print(f"  {line}")
 
-    # Date prompts
-    today = date.today()
-    from_date = prompt_date("From date", today)
-    to_date = prompt_date("To date", today + timedelta(days=6))
-    min_time = prompt_time("Earliest time (empty=all)")
+    return all_screenings
 
-    # Filter and count
-    filtered = filter_screenings(all_screenings, from_date, to_date, min_time)
-    movie_count, screening_count = count_results(filtered)
 
-    print(f"\nFound {movie_count} movies, {screening_count} screenings")
+def offline_step() -> bool:
+    """Report what the store holds; returns False if it is empty."""
+    print("\nUsing stored screenings:")
+    updated = store.last_updated()
+    for name, when in updated.items():
+        print(f"  {name} (updated {when:%Y-%m-%d %H:%M})")
+    return bool(updated)
 
-    # Format and write output
-    output = format_schedule(all_screenings, from_date, to_date, min_time)
-    OUTPUT_FILE.write_text(output, encoding="utf-8")
-    print(f"Written to: {OUTPUT_FILE}")
+
+def batch_main(args: argparse.Namespace):
+    """Fetch (or load) once, then write every query of the --batch spec file."""
+    try:
+        queries = load_specs(args.batch)
+    except (OSError, ValueError) as e:
+        print(f"Invalid batch spec {args.batch}: {e}")
+        sys.exit(2)
+
+    start = time.perf_counter()
+    if args.offline:
+        if not offline_step():
+            print("\nNo stored screenings yet. Run without --offline first.")
+            sys.exit(1)
+        all_screenings = stored_screenings()
+    else:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            all_screenings = fetch_step(args, pool.submit(fetch_report))
+        if not all_screenings:
+            print("\nAll cinemas failed. Check your internet connection.")
+            sys.exit(1)
+    loaded = time.perf_counter() - start
+
+    batch = Batch(all_screenings)
+    start = time.perf_counter()
+    results = batch.run(queries, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(all_screenings)} screenings loaded in {loaded * 1000:.0f} ms\n")
+    for line in format_results(results, batch.setup, elapsed):
+        print(f"  {line}")
+    for result in results:
+        if not result.error:
+            for path in result.query.outputs:
+                print(f"Written to: {path}")
+    if any(result.error for result in results):
+        sys.exit(1)
+
+
+def changes_main(limit: int):
+    """Print the change log, oldest first."""
+    logged = changes.recent(limit=limit)
+    if not logged:
+        print("No changes logged yet. Changes are recorded from the second fetch on.")
+        return
+    for line in changes.format_changes(logged):
+        print(line)
+
+
+def main():
+    args = parse_args()
+    parse_pool.PROCESSES = args.parse_processes
+    if args.changes is not None:
+        changes_main(args.changes)
+        return
+    if args.batch:
+        batch_main(args)
+        return
+
+    if args.offline:
+        if not offline_step():
+            print("\nNo stored screenings yet. Run without --offline first.")
+            sys.exit(1)
+        from_date, to_date, min_time = ask_filters(args)
+        filtered = store.query(from_date, to_date, min_time)
+    else:
+        # Fetch in the background while the user types the filters
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(fetch_report)
+            print("\nFetching in the background...")
+            from_date, to_date, min_time = ask_filters(args)
+            all_screenings = fetch_step(args, pending)
+        if not all_screenings:
+            print("\nAll cinemas failed. Check your internet connection.")
+            sys.exit(1)
+        filtered = filter_screenings(all_screenings, from_date, to_date, min_time)
+
+    # Group once for both the count and the output, naming films consistently
+    # across the whole fetch rather than just the filtered range
+    titles = canonical_map(all_screenings) if not args.offline else None
+    view = build_schedule_view(filtered, from_date, to_date, titles)
+
+    print(f"\nFound {view.movie_count} movies, {view.screening_count} screenings")
+
+    # Stream every requested format in one pass over the view
+    outputs = args.output or [OUTPUT_FILE]
+    export_files(view, outputs)
+    for path in outputs:
+        print(f"Written to: {path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,325 @@
+"""Pooled keep-alive HTTP(S) client with retries, redirects and per-host limits."""
+
+import base64
+import http.client
+import random
+import socket
+import ssl
+import threading
+import time
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+CONNECT_TIMEOUT = 10  # seconds to open the TCP connection and finish the TLS handshake
+READ_TIMEOUT = 30  # seconds of silence allowed while waiting for / reading the response
+RETRIES = 3  # extra attempts after the first
+BACKOFF_BASE = 0.5  # seconds before the first retry, doubled after each
+BACKOFF_MAX = 8.0
+PER_HOST = 2  # concurrent requests (and pooled connections) per host
+MAX_REDIRECTS = 5  # Location hops followed before giving up
+
+# Answers worth retrying: the site is overloaded or a proxy failed
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection with separate connect and read timeouts."""
+
+    def __init__(self, host, port=None, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        super().__init__(host, port, timeout=connect_timeout)
+        self.read_timeout = read_timeout
+
+    def connect(self):
+        super().connect()
+        self.sock.settimeout(self.read_timeout)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection resuming its pool's last TLS session (no full handshake)."""
+
+    def __init__(self, host, port=None, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 context=None, pool=None):
+        super().__init__(host, port, timeout=connect_timeout, context=context)
+        self.read_timeout = read_timeout
+        self.pool = pool
+
+    def connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout, self.source_address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server_hostname = self.host
+        if self._tunnel_host:
+            # Through a proxy: CONNECT to the site, then speak TLS to it inside the tunnel
+            self.sock = sock
+            try:
+                self._tunnel()
+            except (OSError, http.client.HTTPException):
+                sock.close()
+                raise
+            server_hostname = self._tunnel_host
+        session = self.pool.tls_session if self.pool is not None else None
+        try:
+            self.sock = self._context.wrap_socket(sock, server_hostname=server_hostname, session=session)
+        except (ssl.SSLError, OSError):
+            sock.close()
+            raise
+        self.sock.settimeout(self.read_timeout)
+
+
+class _HostPool:
+    """Idle connections to one (scheme, host, port, proxy) and its concurrency limit."""
+
+    def __init__(self, limit: int):
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(limit)
+        self.tls_session = None
+
+
+class Response:
+    """
+    A response whose connection goes back to the pool once it is closed.
+
+    Use as a context manager. read(), read1() and headers behave like
+    http.client.HTTPResponse; url is the address that answered, after
+    redirects. Reading the body to the end lets the connection be reused;
+    closing early discards it.
+    """
+
+    def __init__(self, client: "HTTPClient", pool: _HostPool, conn, response, reused: bool,
+                 url: str = ""):
+        self._client = client
+        self._pool = pool
+        self._conn = conn
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.reused = reused
+        self.url = url
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._response.read(amt)
+
+    def read1(self, amt: int = -1) -> bytes:
+        return self._response.read1(amt)
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        response = self._response
+        # read1() leaves a Content-Length body read to the end open, with length 0 left;
+        # a 304 or 204 has length 0 from the start. A chunked body closes at its end.
+        reusable = not response.will_close and (response.isclosed() or response.length == 0)
+        # Closing marks the response done, so the connection accepts the next request
+        response.close()
+        self._client._release(self._pool, self._conn, reusable)
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HTTPClient:
+    """
+    GET over persistent connections, pooled per host.
+
+    Each host gets at most per_host concurrent requests; callers beyond that
+    wait. Connections are kept alive between requests, and HTTPS reuses the
+    host's last TLS session. Connection errors, timeouts and RETRY_STATUSES
+    answers are retried with exponential backoff and jitter (Retry-After
+    is honoured, up to backoff_max). Redirects are followed, up to
+    max_redirects hops. Like urlopen, requests go through the proxies of
+    the http_proxy / https_proxy environment variables (minus no_proxy):
+    plain HTTP as absolute-URL requests to the proxy, HTTPS tunnelled with
+    CONNECT.
+
+    Args:
+        per_host: Concurrent requests per host
+        retries: Extra attempts after the first
+        connect_timeout, read_timeout: Seconds, see CONNECT_TIMEOUT / READ_TIMEOUT
+        backoff_base, backoff_max: Retry delays in seconds
+        ssl_context: Context for HTTPS (default: ssl.create_default_context())
+        max_redirects: Redirect hops to follow, see MAX_REDIRECTS
+        proxies: Scheme -> proxy URL (default: from the environment; {} for none)
+    """
+
+    def __init__(self, per_host: int = PER_HOST, retries: int = RETRIES,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX,
+                 ssl_context: ssl.SSLContext | None = None, max_redirects: int = MAX_REDIRECTS,
+                 proxies: dict[str, str] | None = None):
+        self.per_host = per_host
+        self.retries = retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.max_redirects = max_redirects
+        self.proxies = getproxies() if proxies is None else proxies
+        self._pools = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "resumed": 0, "retries": 0,
+                      "redirects": 0}
+
+    def _pool(self, key: tuple) -> _HostPool:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(self.per_host)
+            return pool
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.stats[kind] += 1
+
+    def _proxy(self, scheme: str, host: str) -> tuple[str, int, dict] | None:
+        """(host, port, CONNECT / request headers) of the proxy for a URL, None to go direct."""
+        proxy = self.proxies.get(scheme)
+        if not proxy or proxy_bypass(host):
+            return None
+        if "://" not in proxy:
+            proxy = "http://" + proxy
+        parts = urlsplit(proxy)
+        headers = {}
+        if parts.username:
+            credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+            headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+        return parts.hostname, parts.port or 8080, headers
+
+    def _connection(self, key: tuple, pool: _HostPool):
+        """An idle pooled connection, or a new (not yet connected) one."""
+        with pool.lock:
+            if pool.idle:
+                return pool.idle.pop(), True
+        scheme, host, port, proxy = key
+        self._count("connections")
+        if scheme == "https":
+            if proxy is None:
+                return _HTTPSConnection(host, port, self.connect_timeout, self.read_timeout,
+                                        context=self.ssl_context, pool=pool), False
+            conn = _HTTPSConnection(proxy[0], proxy[1], self.connect_timeout, self.read_timeout,
+                                    context=self.ssl_context, pool=pool)
+            conn.set_tunnel(host, port, headers=dict(proxy[2]))
+            return conn, False
+        if proxy is None:
+            return _HTTPConnection(host, port, self.connect_timeout, self.read_timeout), False
+        return _HTTPConnection(proxy[0], proxy[1], self.connect_timeout, self.read_timeout), False
+
+    def _release(self, pool: _HostPool, conn, reusable: bool) -> None:
+        # TLS 1.3 session tickets arrive after the handshake: take the session once a response was read
+        sock = conn.sock
+        if isinstance(sock, ssl.SSLSocket) and sock.session is not None:
+            pool.tls_session = sock.session
+        if reusable:
+            with pool.lock:
+                pool.idle.append(conn)
+        else:
+            conn.close()
+        pool.slots.release()
+
+    def _delay(self, attempt: int, retry_after: str | None = None) -> float:
+        # Equal jitter: half the exponential delay, plus up to as much again
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        if retry_after and retry_after.strip().isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> Response:
+        """
+        GET url, following redirects and retrying failures.
+
+        Returns the first response that is neither a redirect nor
+        retryable, or the last one once retries run out. Raises OSError or
+        http.client.HTTPException when the last attempt fails without a
+        response, or after more than max_redirects redirects.
+        """
+        self._count("requests")
+        for hop in range(self.max_redirects + 1):
+            response = self._get(url, headers)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            # Drain the (small) redirect body so the connection can be reused
+            try:
+                response.read()
+            finally:
+                response.close()
+            url = urljoin(url, location.strip())
+            if hop < self.max_redirects:
+                self._count("redirects")
+        raise http.client.HTTPException(f"more than {self.max_redirects} redirects, last to {url}")
+
+    def _get(self, url: str, headers: dict[str, str] | None) -> Response:
+        """One GET (no redirects) with retries, on the pool of url's host."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise http.client.InvalidURL(f"cannot fetch {url!r}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        proxy = self._proxy(scheme, parts.hostname)
+        key = (scheme, parts.hostname, port, proxy and (proxy[0], proxy[1], tuple(proxy[2].items())))
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        headers = dict(headers or {})
+        if proxy is not None and scheme == "http":
+            # A plain-HTTP proxy takes the absolute URL
+            target = f"http://{parts.netloc.rpartition('@')[2]}{target}"
+            headers.update(proxy[2])
+        pool = self._pool(key)
+
+        attempt = 0
+        while True:
+            pool.slots.acquire()
+            conn, reused = self._connection(key, pool)
+            try:
+                try:
+                    conn.request("GET", target, headers=headers)
+                    response = conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused:
+                        raise
+                    # The server closed the idle connection: redo on a fresh one, no backoff
+                    conn.close()
+                    conn, reused = self._connection(key, pool)
+                    conn.request("GET", target, headers=headers)
+                    response = conn.getresponse()
+            except (OSError, http.client.HTTPException):
+                self._release(pool, conn, False)
+                if attempt >= self.retries:
+                    raise
+                retry_after = None
+            else:
+                if reused:
+                    self._count("reused")
+                elif isinstance(conn.sock, ssl.SSLSocket) and conn.sock.session_reused:
+                    self._count("resumed")
+                if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                    return Response(self, pool, conn, response, reused, url)
+                retry_after = response.getheader("Retry-After")
+                try:
+                    response.read()
+                    reusable = not response.will_close
+                except (OSError, http.client.HTTPException):
+                    reusable = False
+                self._release(pool, conn, reusable)
+
+            self._count("retries")
+            time.sleep(self._delay(attempt, retry_after))
+            attempt += 1
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            with pool.lock:
+                idle, pool.idle = pool.idle, []
+            for conn in idle:
+                conn.close()
@@ -1,57 +1,394 @@
 """Core logic shared between CLI and GUI."""
 
-from datetime import date
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from functools import partial
+from itertools import chain
+from pathlib import Path
 
-from fetch import fetch_html
-from parsers import PARSERS
+import changes
+import parse_cache
+import parse_pool
+import store
+from fetch import FetchError, FetchTrace, cache_age, fetch_html, is_cache_valid, read_stale, stream_html
+from index import ScreeningIndex, index_for
+from parsers import PARSERS, STREAM_PARSERS, VERSIONS
+from refresh import Refresher
+from screening import Screening
 
+# Upper bound on cinemas fetched at once (1 = sequential)
+MAX_WORKERS = 6
 
-def fetch_all_screenings() -> tuple[list[dict], list[str]]:
+# cinema -> fetch_and_parse_report calls running, for refresh_cinema to skip
+_in_flight = Counter()
+_in_flight_lock = threading.Lock()
+
+
+@dataclass
+class CinemaReport:
     """
-    Fetch and parse screenings from all cinemas.
+    What fetching and parsing one cinema cost.
+
+    stages holds seconds per stage: connect, download, decode, read (disk
+    cache), parse and store (SQLite upsert and change log). When a page is parsed while it
+    downloads, parse is the time spent in the parser between network chunks.
+    age is how old the page was (seconds) when it was served. added and
+    removed count the screenings this fetch changed (see changes.py).
+    """
+
+    cinema: str
+    name: str
+    ok: bool = False
+    count: int = 0
+    cache: str = ""  # page cache: "hit", "miss", "revalidated", "stale" or "error"
+    parse_cached: bool = False
+    streamed: bool = False
+    stages: dict = field(default_factory=dict)
+    bytes_wire: int = 0
+    bytes_body: int = 0
+    total: float = 0.0
+    age: float | None = None
+    added: int = 0
+    removed: int = 0
+    status: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class FetchReport:
+    """Screenings from all cinemas plus a CinemaReport per cinema, in PARSERS order."""
+
+    screenings: list
+    cinemas: list
+    started: str = ""
+    total: float = 0.0
+
+    @property
+    def status(self) -> list[str]:
+        return [msg for report in self.cinemas for msg in report.status]
+
+    def to_dict(self) -> dict:
+        return {
+            "started": self.started,
+            "total": self.total,
+            "screenings": len(self.screenings),
+            "cinemas": [report.to_dict() for report in self.cinemas],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def append_to(self, path: Path) -> None:
+        """Append this run as one JSON line, for charting runs over time."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+
+def fetch_and_parse(cinema_key: str, stream: bool = False) -> tuple[list[Screening], list[str]]:
+    """
+    Fetch and parse screenings from one cinema.
+
+    Parsing is skipped when the page is unchanged since the last parse.
+    Parsed screenings are upserted into the persistent store. With
+    stream=True, cinemas that have an incremental parser are parsed while
+    their page downloads.
 
     Returns:
-        (screenings, status_messages) where screenings is list of dicts
-        with keys: title, date, time, day, cinema
+        (screenings, status_messages) for that cinema
     """
-    all_screenings = []
-    status = []
+    screenings, report = fetch_and_parse_report(cinema_key, stream)
+    return screenings, report.status
+
+
+def fetch_and_parse_report(
+    cinema_key: str,
+    stream: bool = False,
+    stale_ok: bool = False,
+    max_age: float | None = None
+) -> tuple[list[Screening], CinemaReport]:
+    """
+    Like fetch_and_parse, but return a CinemaReport instead of status lines.
+
+    With stale_ok=True, a cached page is used however old it is, and an
+    expired one is refreshed in the background (see background_refresher)
+    instead of making the caller wait. Only a cinema with no cache at all
+    is fetched in the foreground. max_age overrides CACHE_MAX_AGE.
+    """
+    with _in_flight_lock:
+        _in_flight[cinema_key] += 1
+    try:
+        return _fetch_and_parse_report(cinema_key, stream, stale_ok, max_age)
+    finally:
+        with _in_flight_lock:
+            _in_flight[cinema_key] -= 1
+
+
+def _fetch_and_parse_report(cinema_key: str, stream: bool, stale_ok: bool,
+                            max_age: float | None) -> tuple[list[Screening], CinemaReport]:
+    display_name, parse_fn = PARSERS[cinema_key]
+    report = CinemaReport(cinema_key, display_name)
+    trace = FetchTrace()
+    start = time.perf_counter()
+
+    stale = read_stale(cinema_key, trace) if stale_ok else None
+    stream_fn = STREAM_PARSERS.get(cinema_key) if stream else None
+    if stale is not None:
+        html, report.age = stale
+        if trace.cache == "stale":
+            background_refresher().request(cinema_key)
+        screenings = _parse(cinema_key, display_name, parse_fn, html, report)
+    elif stream_fn is not None and not is_cache_valid(cinema_key, max_age):
+        screenings = _stream_and_parse(cinema_key, display_name, parse_fn, stream_fn, trace, report, max_age)
+    else:
+        html = fetch_html(cinema_key, trace=trace, max_age=max_age)
+        screenings = _parse(cinema_key, display_name, parse_fn, html, report)
+
+    report.total = time.perf_counter() - start
+    report.cache = trace.cache
+    report.bytes_wire = trace.bytes_wire
+    report.bytes_body = trace.bytes_body
+    report.stages.update(
+        connect=trace.connect, download=trace.download, decode=trace.decode, read=trace.read
+    )
+    if report.streamed and report.ok:
+        # The parser ran between chunks: whatever the fetch did not account for
+        report.stages["parse"] = max(report.total - sum(report.stages.values()), 0.0)
+    if report.ok:
+        if report.age is None:
+            report.age = cache_age(cinema_key)
+        report.count = len(screenings)
+        report.status = _status(display_name, screenings)
+        if report.cache == "stale":
+            report.status.append(f"↻ {display_name}: page is {report.age / 60:.0f} min old, refreshing")
+        if report.added or report.removed:
+            report.status.append(f"± {display_name}: {report.added} added, {report.removed} removed")
+    return screenings, report
 
-    for cinema_key, (display_name, parse_fn) in PARSERS.items():
-        html = fetch_html(cinema_key)
 
-        if html is None:
-            status.append(f"⚠ {display_name}: fetch failed")
-            continue
+def _parse(cinema_key: str, display_name: str, parse_fn, html: str | None,
+           report: CinemaReport) -> list[Screening]:
+    if html is None:
+        report.status = [f"⚠ {display_name}: fetch failed"]
+        return []
 
+    start = time.perf_counter()
+    key = parse_cache.cache_key(html, VERSIONS[cinema_key])
+    screenings = parse_cache.load(cinema_key, key)
+    report.parse_cached = screenings is not None
+
+    if screenings is None:
         try:
-            screenings = parse_fn(html)
-            for s in screenings:
-                s["cinema"] = display_name
-            all_screenings.extend(screenings)
-            status.append(f"✓ {display_name} ({len(screenings)})")
-
-            if len(screenings) == 0:
-                status.append(f"⚠ WARNING: {display_name} returned 0 screenings")
+            if parse_pool.enabled(cinema_key, html):
+                parsed = parse_pool.parse(cinema_key, html)
+            else:
+                parsed = parse_fn(html)
+            screenings = [s.replace(cinema=display_name) for s in parsed]
         except Exception as e:
-            status.append(f"⚠ {display_name}: parse failed ({e})")
+            report.status = [f"⚠ {display_name}: parse failed ({e})"]
+            return []
+        parse_cache.store(cinema_key, key, screenings)
+
+    report.stages["parse"] = time.perf_counter() - start
+    _save(cinema_key, display_name, key, screenings, report)
+    report.ok = True
+    return screenings
+
+
+def _stream_and_parse(cinema_key: str, display_name: str, parse_fn, stream_fn, trace: FetchTrace,
+                      report: CinemaReport, max_age: float | None = None) -> list[Screening]:
+    """
+    Feed the downloading page straight into an incremental parser.
+
+    Only a downloaded body is streamed: a page answered from the cache
+    (fresh, or revalidated with 304) goes through _parse, which can reuse
+    the parse cached for it.
+    """
+    pages = stream_html(cinema_key, trace=trace, max_age=max_age)
+    try:
+        first = next(pages, None)
+    except FetchError:
+        report.status = [f"⚠ {display_name}: fetch failed"]
+        return []
+    if trace.cache in ("hit", "revalidated"):
+        return _parse(cinema_key, display_name, parse_fn, first, report)
+
+    chunks = []
+    report.streamed = True
+
+    def tee():
+        for chunk in chain(() if first is None else (first,), pages):
+            chunks.append(chunk)
+            yield chunk
+
+    try:
+        screenings = [s.replace(cinema=display_name) for s in stream_fn(tee())]
+    except FetchError:
+        report.status = [f"⚠ {display_name}: fetch failed"]
+        return []
+    except Exception as e:
+        report.status = [f"⚠ {display_name}: parse failed ({e})"]
+        return []
+
+    key = parse_cache.cache_key("".join(chunks), VERSIONS[cinema_key])
+    parse_cache.store(cinema_key, key, screenings)
+    _save(cinema_key, display_name, key, screenings, report)
+    report.ok = True
+    return screenings
 
-    return all_screenings, status
+
+def _save(cinema_key: str, display_name: str, key: str, screenings: list[Screening],
+          report: CinemaReport) -> None:
+    """Upsert into the persistent store and log what changed (no-ops when the page is unchanged)."""
+    start = time.perf_counter()
+    store.save(cinema_key, display_name, key, screenings)
+    change = changes.record(cinema_key, display_name, key, screenings)
+    if change is not None:
+        report.added, report.removed = len(change.added), len(change.removed)
+    report.stages["store"] = time.perf_counter() - start
+
+
+def _status(display_name: str, screenings: list[Screening]) -> list[str]:
+    status = [f"✓ {display_name} ({len(screenings)})"]
+    if len(screenings) == 0:
+        status.append(f"⚠ WARNING: {display_name} returned 0 screenings")
+    return status
+
+
+def fetch_report(
+    max_workers: int = MAX_WORKERS,
+    stream: bool = True,
+    stale_ok: bool = False
+) -> FetchReport:
+    """
+    Fetch and parse screenings from all cinemas, with per-cinema timings.
+
+    Cinemas are fetched concurrently (up to max_workers at a time) and each
+    page is parsed as soon as it arrives (or while it arrives, with stream=True
+    for cinemas in STREAM_PARSERS). Results are still merged in PARSERS
+    order, so screenings and reports are deterministic. With stale_ok=True,
+    expired pages are served from cache and refreshed in the background.
+
+    Returns:
+        FetchReport with all screenings and one CinemaReport per cinema
+    """
+    cinema_keys = list(PARSERS)
+    work = partial(fetch_and_parse_report, stream=stream, stale_ok=stale_ok)
+    started = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+
+    if max_workers <= 1:
+        results = [work(key) for key in cinema_keys]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(work, cinema_keys))
+
+    all_screenings = []
+    for screenings, _ in results:
+        all_screenings.extend(screenings)
+
+    return FetchReport(
+        all_screenings,
+        [report for _, report in results],
+        started,
+        time.perf_counter() - start,
+    )
+
+
+def fetch_all_screenings(
+    max_workers: int = MAX_WORKERS,
+    stream: bool = True
+) -> tuple[list[Screening], list[str]]:
+    """
+    Fetch and parse screenings from all cinemas.
+
+    Same as fetch_report, without the timings.
+
+    Returns:
+        (screenings, status_messages) where screenings is list of Screening
+        records (title, date, time, day, cinema)
+    """
+    report = fetch_report(max_workers, stream)
+    return report.screenings, report.status
+
+
+def format_timings(report: FetchReport) -> list[str]:
+    """Per-cinema timing table (milliseconds) as text lines."""
+    lines = [f"{'':<8} {'cache':<22} {'connect':>8} {'download':>9} {'decode':>7} "
+             f"{'read':>6} {'parse':>7} {'store':>6} {'total':>7} {'KB':>7}"]
+    for r in report.cinemas:
+        ms = {stage: seconds * 1000 for stage, seconds in r.stages.items()}
+        cache = r.cache + (", parsed" if r.parse_cached else "") + (", streamed" if r.streamed else "")
+        lines.append(
+            f"{r.name:<8} {cache:<22} {ms.get('connect', 0):8.1f} {ms.get('download', 0):9.1f} "
+            f"{ms.get('decode', 0):7.1f} {ms.get('read', 0):6.1f} {ms.get('parse', 0):7.1f} "
+            f"{ms.get('store', 0):6.1f} {r.total * 1000:7.1f} {r.bytes_wire / 1024:7.1f}"
+        )
+    return lines
+
+
+def refresh_cinema(cinema_key: str) -> bool:
+    """
+    Revalidate one cinema's page now, then re-parse and store it if it changed.
+
+    Skipped while another fetch of the cinema is in flight (e.g. the GUI's
+    first load on a cold cache): that one is refreshing the page already.
+    """
+    with _in_flight_lock:
+        if _in_flight[cinema_key]:
+            return True
+    _, report = fetch_and_parse_report(cinema_key, stream=True, max_age=0)
+    return report.ok
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def background_refresher() -> Refresher:
+    """The process-wide Refresher keeping every cinema's cache warm (started on first use)."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = Refresher(refresh_cinema, list(PARSERS)).start()
+        return _refresher
+
+
+def stored_screenings(since: date | None = None) -> list[Screening]:
+    """
+    Screenings kept in the persistent store from earlier fetches.
+
+    Lets the CLI and GUI start without fetching; includes past weeks.
+
+    Args:
+        since: Earliest date to load (None = all history)
+    """
+    return store.load_all(since)
 
 
 def filter_screenings(
-    screenings: list[dict],
+    screenings: list[Screening] | ScreeningIndex,
     from_date: date,
     to_date: date,
     min_time: str | None = None,
     max_time: str | None = None,
     cinemas: set[str] | None = None
-) -> list[dict]:
+) -> list[Screening]:
     """
     Filter screenings by date range, time range, and cinemas.
 
+    Backed by a ScreeningIndex built once per screenings list (and reused
+    while the same list is queried again), so each query bisects instead of
+    scanning every row.
+
     Args:
-        screenings: List of screening dicts
+        screenings: List of Screening records (or a prebuilt ScreeningIndex)
         from_date: Start date (inclusive)
         to_date: End date (inclusive)
         min_time: Earliest time as "HH:MM" (optional)
@@ -59,41 +396,17 @@ def filter_screenings(
         cinemas: Set of cinema names to include (None = all)
 
     Returns:
-        Filtered list of screenings
+        Filtered list of screenings, in (date, time) order
     """
-    filtered = []
-
-    for s in screenings:
-        # Date filter
-        try:
-            d = date.fromisoformat(s["date"])
-        except ValueError:
-            continue
-
-        if d < from_date or d > to_date:
-            continue
-
-        # Time filter
-        if min_time and s["time"] < min_time:
-            continue
-        if max_time and s["time"] > max_time:
-            continue
-
-        # Cinema filter
-        if cinemas and s["cinema"] not in cinemas:
-            continue
-
-        filtered.append(s)
-
-    return filtered
+    return index_for(screenings).query(from_date, to_date, min_time, max_time, cinemas)
 
 
-def count_results(screenings: list[dict]) -> tuple[int, int]:
+def count_results(screenings: list[Screening]) -> tuple[int, int]:
     """
     Count unique movies and total screenings.
 
     Returns:
         (movie_count, screening_count)
     """
-    titles = set(s["title"] for s in screenings)
+    titles = set(s.title for s in screenings)
     return len(titles), len(screenings)
@@ -1,6 +1,8 @@
 """Polish date utilities and day collapsing."""
 
 from datetime import date
+from functools import lru_cache
+from itertools import chain
 
 POLISH_MONTHS = {
     'stycznia': 1, 'lutego': 2, 'marca': 3, 'kwietnia': 4,
@@ -17,6 +19,35 @@ POLISH_MONTHS_SHORT = {
 WEEKDAYS = ['poniedziałek', 'wtorek', 'środa', 'czwartek', 'piątek', 'sobota', 'niedziela']
 WEEKDAYS_SHORT = ['Pn', 'Wt', 'Śr', 'Cz', 'Pt', 'So', 'Nd']
 
+# Labels by ordinal % 7 (ordinal 1, 0001-01-01, is a Monday), so collapsing
+# ordinals never builds date objects
+_SHORT_BY_ORDINAL = [WEEKDAYS_SHORT[(r - 1) % 7] for r in range(7)]
+_RANGE_BY_ORDINAL = [
+    [f"{WEEKDAYS_SHORT[(a - 1) % 7]}-{WEEKDAYS_SHORT[(b - 1) % 7].lower()}" for b in range(7)]
+    for a in range(7)
+]
+
+# The same labels flattened for collapse_many: [first % 7 * 8 + last % 7],
+# with last % 7 = 7 for a single day
+_LABELS = [
+    _RANGE_BY_ORDINAL[a][b] if b < 7 else _SHORT_BY_ORDINAL[a] for a in range(7) for b in range(8)
+]
+_ORDINAL_MASK = (1 << 22) - 1
+
+# Below this many dates in total, collapse_many's NumPy path costs more than it saves
+NUMPY_MIN_DATES = 2048
+USE_NUMPY = True
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    # Optional, and slow to import: only loaded for a batch big enough to use it
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 
 def weekday_name(d: date) -> str:
     """Return Polish weekday name for a date."""
@@ -28,6 +59,88 @@ def weekday_short(d: date) -> str:
     return WEEKDAYS_SHORT[d.weekday()]
 
 
+@lru_cache(maxsize=8192)
+def iso_ordinal(date_str: str) -> int:
+    """ISO date -> proleptic ordinal, 0 if invalid. Cached: listings repeat a few dates."""
+    try:
+        return date.fromisoformat(date_str).toordinal()
+    except ValueError:
+        return 0
+
+
+def iso_weekday_name(date_str: str) -> str:
+    """Polish weekday name for an ISO date, "" if invalid."""
+    ordinal = iso_ordinal(date_str)
+    return WEEKDAYS[(ordinal - 1) % 7] if ordinal > 0 else ""
+
+
+def _runs_label(runs: list[tuple[int, int]]) -> str:
+    # (first, last) ordinal of each run of consecutive days
+    return ", ".join(
+        _SHORT_BY_ORDINAL[first % 7] if first == last else _RANGE_BY_ORDINAL[first % 7][last % 7]
+        for first, last in runs
+    )
+
+
+def collapse_ordinals(ordinals: list[int]) -> str:
+    """
+    collapse_days for date ordinals (see Screening.ordinal).
+
+    Ordinals <= 0 (unparseable dates) are ignored. Input already in
+    ascending order, e.g. a chronological slot, is not sorted again.
+    """
+    runs = []
+    first = last = None
+    ordered = all(a <= b for a, b in zip(ordinals, ordinals[1:]))
+    for ordinal in (ordinals if ordered else sorted(ordinals)):
+        if ordinal <= 0 or ordinal == last:
+            continue
+        if last is not None and ordinal == last + 1:
+            last = ordinal
+            continue
+        if last is not None:
+            runs.append((first, last))
+        first = last = ordinal
+    if last is not None:
+        runs.append((first, last))
+    return _runs_label(runs)
+
+
+def collapse_many(groups: list[list[int]]) -> list[str]:
+    """
+    collapse_ordinals for many groups at once.
+
+    With NumPy and enough dates, all groups are collapsed in one vectorized
+    pass: dates are keyed by group, sorted and deduplicated together, and a
+    run breaks wherever the key steps by anything but one day.
+    """
+    total = sum(len(group) for group in groups)
+    numpy = _numpy() if USE_NUMPY and total >= NUMPY_MIN_DATES else None
+    if numpy is None:
+        return [collapse_ordinals(group) for group in groups]
+
+    # Group number in the high bits, ordinal (< 2**22 until year 11000) in the low ones
+    sizes = numpy.fromiter(map(len, groups), dtype=numpy.int64, count=len(groups))
+    owner = numpy.repeat(numpy.arange(len(groups), dtype=numpy.int64), sizes)
+    ordinals = numpy.fromiter(chain.from_iterable(groups), dtype=numpy.int64, count=total)
+    keys = (owner << 22) | numpy.maximum(ordinals, 0)
+    keys.sort()
+    keep = numpy.ones(len(keys), dtype=bool)
+    keep[1:] = keys[1:] != keys[:-1]
+    keys = keys[keep & ((keys & _ORDINAL_MASK) > 0)]
+    if not len(keys):
+        return [""] * len(groups)
+
+    breaks = numpy.flatnonzero(numpy.diff(keys) != 1)
+    firsts = keys[numpy.concatenate(([0], breaks + 1))]
+    lasts = keys[numpy.concatenate((breaks, [len(keys) - 1]))]
+    # Label of each run, as an index into _LABELS
+    label_ids = ((firsts & _ORDINAL_MASK) % 7) * 8 + numpy.where(firsts == lasts, 7, (lasts & _ORDINAL_MASK) % 7)
+    labels = [_LABELS[i] for i in label_ids.tolist()]
+    bounds = numpy.searchsorted(firsts >> 22, numpy.arange(len(groups) + 1)).tolist()
+    return [", ".join(labels[bounds[g]:bounds[g + 1]]) for g in range(len(groups))]
+
+
 def collapse_days(dates: list[date]) -> str:
     """
     Collapse consecutive dates into ranges.
@@ -37,42 +150,4 @@ def collapse_days(dates: list[date]) -> str:
         [Mon, Wed, Fri] -> "Pn, śr, pt"
         [Mon, Tue, Thu, Fri] -> "Pn-wt, cz-pt"
     """
-    if not dates:
-        return ""
-
-    dates = sorted(set(dates))
-    if len(dates) == 1:
-        return WEEKDAYS_SHORT[dates[0].weekday()]
-
-    # Group into consecutive runs
-    runs = []
-    current_run = [dates[0]]
-
-    for d in dates[1:]:
-        prev = current_run[-1]
-        # Check if consecutive (1 day apart)
-        if (d - prev).days == 1:
-            current_run.append(d)
-        else:
-            runs.append(current_run)
-            current_run = [d]
-    runs.append(current_run)
-
-    # Format each run
-    parts = []
-    for run in runs:
-        if len(run) >= 3:
-            # Range: "Pn-śr"
-            start = WEEKDAYS_SHORT[run[0].weekday()].lower()
-            end = WEEKDAYS_SHORT[run[-1].weekday()].lower()
-            parts.append(f"{start.capitalize()}-{end}")
-        elif len(run) == 2:
-            # Two days: "Pn-wt"
-            start = WEEKDAYS_SHORT[run[0].weekday()].lower()
-            end = WEEKDAYS_SHORT[run[-1].weekday()].lower()
-            parts.append(f"{start.capitalize()}-{end}")
-        else:
-            # Single day
-            parts.append(WEEKDAYS_SHORT[run[0].weekday()])
-
-    return ", ".join(parts)
+    return collapse_ordinals([d.toordinal() for d in dates if d is not None])
@@ -0,0 +1,225 @@
+"""Streaming schedule export: Apple Notes markdown, JSON Lines, CSV and iCalendar.
+
+Writers write each movie to their file handle as the view is walked, so
+nothing but the current movie's rows is held in memory, and one walk over
+a ScheduleView feeds any number of formats. The per-screening rows are
+built once per movie and shared by every writer that wants them:
+
+    with open("schedule.md", "w") as md, open("schedule.ics", "w", newline="") as ics:
+        export(view, [MarkdownWriter(md), ICSWriter(ics)])
+
+or simply export_files(view, ["schedule.md", "schedule.ics"]).
+"""
+
+import csv
+import hashlib
+import json
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TextIO
+
+from formatting import markdown_header, movie_lines
+from schedule import MovieGroup, ScheduleView
+from screening import parse_minutes
+
+# Length of a calendar event when the listing gives no running time
+EVENT_DURATION = timedelta(hours=2)
+
+FIELDS = ("title", "listed_title", "date", "time", "day", "cinema")
+
+
+def screening_rows(movie: MovieGroup):
+    """One dict per screening of a movie (FIELDS), slot by slot."""
+    for slot in movie.slots:
+        for s in slot.screenings:
+            yield {
+                "title": movie.title,
+                "listed_title": s.title,
+                "date": s.date,
+                "time": s.time,
+                "day": s.day,
+                "cinema": s.cinema,
+            }
+
+
+class MarkdownWriter:
+    """The Apple Notes markdown of formatting.render_markdown, byte for byte."""
+
+    rows = False  # works from the movie's slots, not per-screening rows
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.first = True
+
+    def start(self, view: ScheduleView) -> None:
+        self.file.write(markdown_header(view))
+
+    def movie(self, movie: MovieGroup, rows: list[dict] | None) -> None:
+        separator = "\n" if self.first else "\n---\n"
+        self.first = False
+        self.file.write(separator + "\n".join(movie_lines(movie)))
+
+    def finish(self) -> None:
+        pass
+
+
+class JSONLinesWriter:
+    """One JSON object per screening and line."""
+
+    rows = True
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def start(self, view: ScheduleView) -> None:
+        pass
+
+    def movie(self, movie: MovieGroup, rows: list[dict]) -> None:
+        encode = self.encode
+        self.file.write("".join(encode(row) + "\n" for row in rows))
+
+    def finish(self) -> None:
+        pass
+
+
+class CSVWriter:
+    """A header row, then one row per screening (open the file with newline="")."""
+
+    rows = True
+
+    def __init__(self, file: TextIO):
+        self.writer = csv.writer(file)
+
+    def start(self, view: ScheduleView) -> None:
+        self.writer.writerow(FIELDS)
+
+    def movie(self, movie: MovieGroup, rows: list[dict]) -> None:
+        self.writer.writerows([row[field] for field in FIELDS] for row in rows)
+
+    def finish(self) -> None:
+        pass
+
+
+def _ics_text(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _ics_line(line: str) -> str:
+    """Fold a content line at 75 octets, as RFC 5545 requires."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while data:
+        # Never split a UTF-8 sequence: back off to a lead byte
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+class ICSWriter:
+    """
+    An iCalendar file with one event per screening (open the file with newline="").
+
+    Times are floating local times, as listed by the cinema; events last
+    EVENT_DURATION. Screenings without a valid date or time are skipped.
+    """
+
+    rows = True
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def _write(self, *lines: str) -> None:
+        self.file.write("".join(_ics_line(line) for line in lines))
+
+    def start(self, view: ScheduleView) -> None:
+        self._write(
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//krakow-cinema//schedule//PL",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_ics_text(f'Kino {view.from_date} – {view.to_date}')}",
+        )
+
+    def movie(self, movie: MovieGroup, rows: list[dict]) -> None:
+        summary = _ics_line(f"SUMMARY:{_ics_text(movie.title)}")
+        locations = {}
+        events = []
+        for row in rows:
+            if not row["date"] or not row["time"]:
+                continue
+            # Late shows may be listed past midnight ("24:15")
+            start = datetime.fromisoformat(row["date"]) + timedelta(minutes=parse_minutes(row["time"]))
+            key = f"{row['cinema']}|{row['date']}|{row['time']}|{row['listed_title']}"
+            location = locations.get(row["cinema"])
+            if location is None:
+                location = locations[row["cinema"]] = _ics_line(f"LOCATION:{_ics_text(row['cinema'])}")
+            events.append(
+                "BEGIN:VEVENT\r\n"
+                f"UID:{hashlib.sha1(key.encode()).hexdigest()}@krakow-cinema\r\n"
+                f"DTSTAMP:{self.stamp}\r\n"
+                f"DTSTART:{start:%Y%m%dT%H%M%S}\r\n"
+                f"DTEND:{start + EVENT_DURATION:%Y%m%dT%H%M%S}\r\n"
+                f"{summary}{location}"
+                "END:VEVENT\r\n"
+            )
+        self.file.write("".join(events))
+
+    def finish(self) -> None:
+        self._write("END:VCALENDAR")
+
+
+# File suffix -> writer; CSV and iCalendar files are opened with newline=""
+FORMATS = {
+    ".md": MarkdownWriter,
+    ".jsonl": JSONLinesWriter,
+    ".csv": CSVWriter,
+    ".ics": ICSWriter,
+}
+_RAW_NEWLINES = (CSVWriter, ICSWriter)
+
+
+def export(view: ScheduleView, writers: list) -> None:
+    """Walk the view once, feeding every movie to every writer."""
+    view.fill_day_ranges()
+    want_rows = any(writer.rows for writer in writers)
+    for writer in writers:
+        writer.start(view)
+    for movie in view.movies:
+        rows = list(screening_rows(movie)) if want_rows else None
+        for writer in writers:
+            writer.movie(movie, rows)
+    for writer in writers:
+        writer.finish()
+
+
+def export_files(view: ScheduleView, paths: list[Path | str]) -> None:
+    """
+    Write the view to every path in one pass, in the format of its suffix.
+
+    Raises:
+        ValueError: For a suffix not in FORMATS
+    """
+    paths = [Path(path) for path in paths]
+    for path in paths:
+        if path.suffix.lower() not in FORMATS:
+            raise ValueError(f"{path}: unknown export format (use {', '.join(FORMATS)})")
+
+    with ExitStack() as stack:
+        writers = []
+        for path in paths:
+            writer_class = FORMATS[path.suffix.lower()]
+            newline = "" if writer_class in _RAW_NEWLINES else None
+            file = stack.enter_context(open(path, "w", encoding="utf-8", newline=newline))
+            writers.append(writer_class(file))
+        export(view, writers)
@@ -1,13 +1,20 @@
 """HTTP fetching with file caching."""
 
+import codecs
+import gzip
+import json
 import os
+import threading
 import time
+import zlib
+from dataclasses import dataclass
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
 
 CACHE_DIR = Path(__file__).parent / "cache"
 CACHE_MAX_AGE = 3600  # 1 hour
+CACHE_COMPRESS = False  # store cache/<cinema>.html.gz instead of plain .html
+
+READ_CHUNK = 64 * 1024
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
 
@@ -22,49 +29,456 @@ CINEMAS = {
 }
 
 
+# Cache counters: served from disk, downloaded, or confirmed unchanged by a 304
+_stats_lock = threading.Lock()
+CACHE_STATS = {"hits": 0, "misses": 0, "revalidated": 0, "stale": 0, "errors": 0}
+
+
+def _count(kind: str):
+    with _stats_lock:
+        CACHE_STATS[kind] += 1
+
+
+def cache_stats() -> dict[str, int]:
+    """Return a snapshot of cache hit/miss/revalidation counts."""
+    with _stats_lock:
+        return dict(CACHE_STATS)
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        for kind in CACHE_STATS:
+            CACHE_STATS[kind] = 0
+
+
 def ensure_cache_dir():
     CACHE_DIR.mkdir(exist_ok=True)
 
 
 def cache_path(cinema: str) -> Path:
-    return CACHE_DIR / f"{cinema}.html"
+    """Path the cache is written to in the current CACHE_COMPRESS mode."""
+    suffix = ".html.gz" if CACHE_COMPRESS else ".html"
+    return CACHE_DIR / f"{cinema}{suffix}"
+
+
+def _other_cache_path(cinema: str) -> Path:
+    """Path of the variant the current CACHE_COMPRESS mode does not write."""
+    return CACHE_DIR / (f"{cinema}.html" if CACHE_COMPRESS else f"{cinema}.html.gz")
+
+
+def cached_file(cinema: str) -> Path | None:
+    """Return the existing cache snapshot (plain or compressed), if any."""
+    preferred = cache_path(cinema)
+    if preferred.exists():
+        return preferred
+    other = _other_cache_path(cinema)
+    if other.exists():
+        return other
+    return None
 
 
-def is_cache_valid(cinema: str) -> bool:
-    """Check if cache exists and is less than CACHE_MAX_AGE seconds old."""
+def parsed_cache_path(cinema: str) -> Path:
+    """Parsed screenings built from the current snapshot (see parse_cache)."""
+    return CACHE_DIR / f"{cinema}.parsed.json"
+
+
+# What reading a missing, unreadable or truncated (.gz) snapshot raises
+CACHE_READ_ERRORS = (OSError, EOFError, zlib.error)
+
+
+def read_cache(cinema: str) -> str:
+    """
+    Read a cache snapshot, transparently decompressing .html.gz files.
+
+    Raises one of CACHE_READ_ERRORS if the snapshot cannot be read.
+    """
+    path = cached_file(cinema)
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        data = gzip.decompress(data)
+    return data.decode('utf-8', errors='replace')
+
+
+def write_cache(cinema: str, html: str) -> None:
+    """
+    Write a cache snapshot in the current mode and drop the other variant.
+
+    The snapshot is written to a temporary file and renamed over the old
+    one, so a crash or a concurrent reader never sees a half-written page.
+    """
     path = cache_path(cinema)
-    if not path.exists():
+    data = html.encode('utf-8')
+    if CACHE_COMPRESS:
+        data = gzip.compress(data, compresslevel=6)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    # The other variant is an older snapshot: its body no longer matches the saved validators
+    _other_cache_path(cinema).unlink(missing_ok=True)
+
+    # A new snapshot invalidates whatever was parsed from the old one
+    parsed = parsed_cache_path(cinema)
+    if parsed.exists():
+        parsed.unlink()
+
+
+def meta_path(cinema: str) -> Path:
+    """Sidecar file holding the response validators for the cached page."""
+    return CACHE_DIR / f"{cinema}.meta.json"
+
+
+def load_validators(cinema: str) -> dict[str, str]:
+    """Return stored ETag / Last-Modified for a cinema (empty if unknown)."""
+    try:
+        meta = json.loads(meta_path(cinema).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return {k: v for k, v in meta.items() if k in ("etag", "last_modified") and v}
+
+
+def save_validators(cinema: str, headers) -> None:
+    """Store ETag / Last-Modified from response headers (or drop stale ones)."""
+    meta = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+    path = meta_path(cinema)
+    if meta["etag"] or meta["last_modified"]:
+        path.write_text(json.dumps(meta), encoding='utf-8')
+    elif path.exists():
+        path.unlink()
+
+
+def cache_age(cinema: str) -> float | None:
+    """Seconds since the cache snapshot was written or revalidated, None if absent."""
+    path = cached_file(cinema)
+    if path is None:
+        return None
+    try:
+        return max(time.time() - path.stat().st_mtime, 0.0)
+    except OSError:
+        return None
+
+
+def is_cache_valid(cinema: str, max_age: float | None = None) -> bool:
+    """Check if cache exists and is less than max_age (default CACHE_MAX_AGE) seconds old."""
+    age = cache_age(cinema)
+    if age is None:
         return False
-    age = time.time() - path.stat().st_mtime
-    return age < CACHE_MAX_AGE
+    return age < (CACHE_MAX_AGE if max_age is None else max_age)
 
 
-def fetch_html(cinema: str, force: bool = False) -> str | None:
+def read_stale(cinema: str, trace: "FetchTrace | None" = None) -> tuple[str, float] | None:
+    """
+    Return (html, age) for whatever snapshot is cached, however old.
+
+    For stale-while-revalidate callers: the page is served at once and the
+    caller decides whether to schedule a refresh. Returns None without a
+    cache. A page past CACHE_MAX_AGE is counted (and traced) as "stale".
+    """
+    age = cache_age(cinema)
+    if age is None:
+        return None
+    trace = trace if trace is not None else FetchTrace()
+    kind = "hit" if age < CACHE_MAX_AGE else "stale"
+    try:
+        return _from_cache(cinema, kind, trace), age
+    except CACHE_READ_ERRORS:
+        return None
+
+
+def _decompressor(content_encoding: str, first_chunk: bytes):
+    """Return a zlib decompressor for a Content-Encoding, or None for identity."""
+    if content_encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if content_encoding == "deflate":
+        # Servers send either zlib-wrapped or raw deflate under this name
+        wrapped = len(first_chunk) >= 2 and (first_chunk[0] & 0x0F) == 8 \
+            and (first_chunk[0] * 256 + first_chunk[1]) % 31 == 0
+        return zlib.decompressobj(zlib.MAX_WBITS if wrapped else -zlib.MAX_WBITS)
+    return None
+
+
+def iter_body(response, trace: "FetchTrace | None" = None):
+    """Yield a response body chunk by chunk, decompressing gzip/deflate on the fly."""
+    content_encoding = (response.headers.get("Content-Encoding") or "").strip().lower()
+    decompressor = None
+
+    while True:
+        chunk = response.read1(READ_CHUNK) if hasattr(response, "read1") else response.read(READ_CHUNK)
+        if not chunk:
+            break
+        if trace is not None:
+            trace.bytes_wire += len(chunk)
+        if decompressor is None:
+            decompressor = _decompressor(content_encoding, chunk) or False
+        yield decompressor.decompress(chunk) if decompressor else chunk
+
+    if decompressor:
+        yield decompressor.flush()
+
+
+def read_body(response, trace: "FetchTrace | None" = None) -> bytes:
+    """Read a whole response body, decompressing gzip/deflate on the fly."""
+    return b"".join(iter_body(response, trace))
+
+
+class FetchError(Exception):
+    """Raised by stream_html when a page cannot be fetched."""
+
+
+@dataclass
+class FetchTrace:
+    """
+    Where one fetch spent its time (seconds) and how much it transferred.
+
+    connect: sending the request until response headers arrive
+    download: reading (and decompressing) the body
+    decode: bytes -> text in the site's encoding
+    read: loading the page from the disk cache
+    """
+
+    cache: str = ""  # "hit", "miss", "revalidated", "stale" or "error"
+    connect: float = 0.0
+    download: float = 0.0
+    decode: float = 0.0
+    read: float = 0.0
+    bytes_wire: int = 0
+    bytes_body: int = 0
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def http_client() -> "HTTPClient":
+    """The process-wide pooled client (see client.HTTPClient), created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # http.client and ssl are slow to import: only pay for them when going to the network
+                from client import HTTPClient
+                _client = HTTPClient()
+    return _client
+
+
+def site(cinema: str) -> tuple[str, str] | None:
+    """
+    A cinema's (url, encoding): from CINEMAS for built-in cinemas, else the
+    URL and ENCODING of its plugin parser module. None if neither knows it.
+    """
+    if cinema in CINEMAS:
+        return CINEMAS[cinema]
+    from parsers import specs
+
+    spec = specs().get(cinema)
+    try:
+        return spec.site if spec is not None else None
+    except ImportError:
+        return None
+
+
+def _request(url: str, cinema: str, cached: Path | None, force: bool) -> "Response":
+    """GET a cinema's page, conditional if a cached copy exists."""
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    if not force and cached is not None:
+        validators = load_validators(cinema)
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return http_client().get(url, headers)
+
+
+def _from_cache(cinema: str, kind: str, trace: FetchTrace) -> str:
+    start = time.perf_counter()
+    html = read_cache(cinema)
+    trace.read = time.perf_counter() - start
+    trace.cache = kind
+    _count("hits" if kind == "hit" else kind)
+    return html
+
+
+def fetch_html(
+    cinema: str,
+    force: bool = False,
+    trace: FetchTrace | None = None,
+    max_age: float | None = None
+) -> str | None:
     """
     Fetch HTML for a cinema, using cache if valid.
+
+    Pages are requested with gzip/deflate transfer encoding over pooled
+    keep-alive connections, following redirects, through the environment's
+    proxy if any, and retrying transient failures (see client.py).
+    An expired cache is revalidated with If-None-Match / If-Modified-Since; on 304 Not Modified
+    its lifetime is renewed without downloading the page.
+    max_age overrides CACHE_MAX_AGE (0 always revalidates).
+    Stage timings and byte counts are recorded in trace, if given.
     Returns HTML string or None on error.
     """
     ensure_cache_dir()
-    path = cache_path(cinema)
-    url, encoding = CINEMAS[cinema]
+    trace = trace if trace is not None else FetchTrace()
+    cached = cached_file(cinema)
 
     # Use cache if valid and not forced
-    if not force and is_cache_valid(cinema):
-        return path.read_text(encoding='utf-8', errors='replace')
+    if not force and is_cache_valid(cinema, max_age):
+        try:
+            return _from_cache(cinema, "hit", trace)
+        except CACHE_READ_ERRORS:
+            cached = None  # unreadable: download the page again
+
+    located = site(cinema)
+    if located is None:
+        # A plugin parser without a URL: nothing to fetch
+        trace.cache = "error"
+        _count("errors")
+        return None
+    url, encoding = located
+
+    from http.client import HTTPException
 
     # Fetch from web
+    start = time.perf_counter()
     try:
-        req = Request(url, headers={"User-Agent": USER_AGENT})
-        with urlopen(req, timeout=30) as response:
-            raw = response.read()
+        with _request(url, cinema, cached, force) as response:
+            trace.connect = time.perf_counter() - start
+            if response.status == 304 and cached is not None:
+                # Unchanged: renew cache lifetime, keep the body we already have
+                try:
+                    os.utime(cached)
+                    return _from_cache(cinema, "revalidated", trace)
+                except CACHE_READ_ERRORS:
+                    # The snapshot turned out unreadable: download the full page
+                    response.close()
+                    return fetch_html(cinema, True, trace, max_age)
+            if response.status != 200:
+                trace.cache = "error"
+                _count("errors")
+                return None
+
+            start = time.perf_counter()
+            raw = read_body(response, trace)
+            trace.download = time.perf_counter() - start
+            trace.bytes_body = len(raw)
+
+            start = time.perf_counter()
             html = raw.decode(encoding, errors='replace')
+            trace.decode = time.perf_counter() - start
+
             # Save to cache
-            path.write_text(html, encoding='utf-8')
+            write_cache(cinema, html)
+            save_validators(cinema, response.headers)
+            trace.cache = "miss"
+            _count("misses")
             return html
-    except (URLError, HTTPError, TimeoutError) as e:
+    except (OSError, HTTPException, zlib.error):
+        trace.cache = "error"
+        _count("errors")
         return None
 
 
+def stream_html(
+    cinema: str,
+    force: bool = False,
+    trace: FetchTrace | None = None,
+    max_age: float | None = None
+):
+    """
+    Like fetch_html, but yield the page as decoded text chunks while it downloads.
+
+    Multi-byte characters split across network chunks are held back by an
+    incremental decoder, so every chunk is valid text. The full page is
+    cached once the download completes. A fresh or revalidated cache is
+    yielded as a single chunk.
+    Raises FetchError on error (possibly after some chunks were yielded).
+    """
+    ensure_cache_dir()
+    trace = trace if trace is not None else FetchTrace()
+    cached = cached_file(cinema)
+
+    if not force and is_cache_valid(cinema, max_age):
+        try:
+            html = _from_cache(cinema, "hit", trace)
+        except CACHE_READ_ERRORS:
+            cached = None  # unreadable: download the page again
+        else:
+            yield html
+            return
+
+    located = site(cinema)
+    if located is None:
+        trace.cache = "error"
+        _count("errors")
+        raise FetchError(f"{cinema}: no URL known")
+    url, encoding = located
+
+    from http.client import HTTPException
+
+    start = time.perf_counter()
+    try:
+        response = _request(url, cinema, cached, force)
+    except (OSError, HTTPException) as e:
+        trace.cache = "error"
+        _count("errors")
+        raise FetchError(f"{cinema}: {e}") from e
+    trace.connect = time.perf_counter() - start
+    if response.status != 200:
+        response.close()
+        if response.status == 304 and cached is not None:
+            try:
+                os.utime(cached)
+                html = _from_cache(cinema, "revalidated", trace)
+            except CACHE_READ_ERRORS:
+                # The snapshot turned out unreadable: download the full page
+                yield from stream_html(cinema, True, trace, max_age)
+            else:
+                yield html
+            return
+        trace.cache = "error"
+        _count("errors")
+        raise FetchError(f"{cinema}: HTTP {response.status}")
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    parts = []
+    try:
+        with response:
+            body = iter_body(response, trace)
+            while True:
+                # Time spent in here is the fetch's; time between yields is the parser's
+                start = time.perf_counter()
+                raw = next(body, None)
+                middle = time.perf_counter()
+                if raw is None:
+                    text = decoder.decode(b"", final=True)
+                else:
+                    trace.bytes_body += len(raw)
+                    text = decoder.decode(raw)
+                trace.download += middle - start
+                trace.decode += time.perf_counter() - middle
+                if text:
+                    parts.append(text)
+                    yield text
+                if raw is None:
+                    break
+            headers = response.headers
+    except (OSError, HTTPException, zlib.error) as e:
+        trace.cache = "error"
+        _count("errors")
+        raise FetchError(f"{cinema}: {e}") from e
+
+    write_cache(cinema, "".join(parts))
+    save_validators(cinema, headers)
+    trace.cache = "miss"
+    _count("misses")
+
+
 def fetch_all(force: bool = False) -> dict[str, str | None]:
     """
     Fetch HTML for all cinemas.
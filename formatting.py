@@ -3,7 +3,10 @@
 from datetime import date
 from urllib.parse import quote
 
-from dates import collapse_days
+from index import index_for
+from schedule import MovieGroup, ScheduleView, build_schedule_view
+from screening import Screening
+from titles import canonical_map
 
 
 def normalize_title(title: str) -> str:
@@ -12,7 +15,7 @@ def normalize_title(title: str) -> str:
 
 
 def format_schedule(
-    all_screenings: list[dict],
+    all_screenings: list[Screening],
     from_date: date,
     to_date: date,
     min_time: str | None = None
@@ -20,68 +23,41 @@ def format_schedule(
     """
     Format screenings as markdown for Apple Notes.
 
-    Input: list of {title, date, time, day, cinema}
+    Input: list of Screening records (title, date, time, day, cinema)
     Output: markdown string
     """
-    # Filter by date range and min time
-    filtered = []
-    for s in all_screenings:
-        try:
-            d = date.fromisoformat(s["date"])
-        except ValueError:
-            continue
+    filtered = index_for(all_screenings).query(from_date, to_date, min_time)
+    view = build_schedule_view(filtered, from_date, to_date, canonical_map(all_screenings))
+    return render_markdown(view)
 
-        if d < from_date or d > to_date:
-            continue
 
-        if min_time and s["time"] < min_time:
-            continue
+def markdown_header(view: ScheduleView) -> str:
+    """Title line of the Apple Notes markdown (the whole text if nothing matched)."""
+    if not view.movies:
+        return f"# Cinema Schedule: {view.from_date} → {view.to_date}\n\nNo screenings found."
+    return f"# Cinema Schedule: {view.from_date} → {view.to_date}\n"
 
-        filtered.append(s)
 
-    if not filtered:
-        return f"# Cinema Schedule: {from_date} → {to_date}\n\nNo screenings found."
+def movie_lines(movie: MovieGroup) -> list[str]:
+    """Markdown lines for one movie: IMDb link, then its day ranges, times and cinemas."""
+    parts = [f"{slot.day_range} {slot.time}, {slot.cinema}" for slot in movie.slots]
 
-    # Group by movie title
-    movies = {}
-    for s in filtered:
-        title = s["title"]
-        if title not in movies:
-            movies[title] = []
-        movies[title].append(s)
+    encoded = quote(movie.title)
+    title_link = f"[{movie.title}](https://www.imdb.com/find/?q={encoded})"
+    if len(parts) == 1:
+        return [f"{title_link} — {parts[0]}"]
+    return [title_link] + parts
 
-    # For each movie, group screenings by (time, cinema)
-    lines = [f"# Cinema Schedule: {from_date} → {to_date}\n"]
 
-    for title in sorted(movies.keys(), key=str.lower):
-        screenings = movies[title]
-
-        # Group by (time, cinema)
-        time_cinema_groups = {}
-        for s in screenings:
-            key = (s["time"], s["cinema"])
-            if key not in time_cinema_groups:
-                time_cinema_groups[key] = []
-            time_cinema_groups[key].append(date.fromisoformat(s["date"]))
-
-        # Format each group
-        parts = []
-        for (time_str, cinema), dates in sorted(time_cinema_groups.items()):
-            day_range = collapse_days(dates)
-            parts.append(f"{day_range} {time_str}, {cinema}")
-
-        encoded = quote(title)
-        title_link = f"[{title}](https://www.imdb.com/find/?q={encoded})"
-        if len(parts) == 1:
-            lines.append(f"{title_link} — {parts[0]}")
-        else:
-            lines.append(title_link)
-            for part in parts:
-                lines.append(part)
-        lines.append("---")
-
-    # Remove trailing separator
-    if lines and lines[-1] == "---":
-        lines.pop()
+def render_markdown(view: ScheduleView) -> str:
+    """Render a ScheduleView as Apple Notes markdown (see export.py to stream it to a file)."""
+    if not view.movies:
+        return markdown_header(view)
 
+    view.fill_day_ranges()
+    lines = [markdown_header(view)]
+    for i, movie in enumerate(view.movies):
+        if i:
+            lines.append("---")
+        lines.extend(movie_lines(movie))
     return "\n".join(lines)
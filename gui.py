@@ -2,25 +2,115 @@
 """Streamlit web interface for cinema schedule."""
 
 import streamlit as st
-from datetime import date, timedelta, time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, time
+import json
 from pathlib import Path
 from urllib.parse import quote
 
-from core import fetch_all_screenings, filter_screenings, count_results
-from formatting import format_schedule
+import changes
+import store
+from core import FetchReport, background_refresher, fetch_report, filter_screenings, stored_screenings
+from export import FORMATS, export_files
+from fetch import CACHE_MAX_AGE
+from index import ScreeningIndex
 from parsers import PARSERS
+from schedule import MovieGroup, ScheduleView, build_schedule_view
+from search import TitleIndex
+from titles import canonical_map
 
 OUTPUT_FILE = Path(__file__).parent / "schedule.md"
 ALL_CINEMAS = [name for _, (name, _) in PARSERS.items()]
+DATASET_TTL = CACHE_MAX_AGE  # seconds before the shared dataset is fetched again
+PAGE_SIZE = 25  # movies rendered per page
+CHANGES_SHOWN = 20  # newest change-log entries in the sidebar
 
 st.set_page_config(page_title="Krakow Cinema", page_icon="🎬", layout="wide")
 st.title("🎬 Krakow Cinema Schedule")
 
-# Initialize session state
-if "screenings" not in st.session_state:
-    st.session_state.screenings = []
-    st.session_state.status = []
-    st.session_state.fetched = False
+
+@dataclass
+class Dataset:
+    """Screenings shared by every session, with their query index."""
+
+    index: ScreeningIndex
+    titles: dict  # title -> canonical title (see titles.canonical_map)
+    search: TitleIndex
+    status: list
+    report: FetchReport | None
+    loaded_at: datetime
+
+
+@st.cache_resource(ttl=DATASET_TTL, show_spinner="Fetching from all cinemas...")
+def load_dataset(_fresh: bool = False) -> Dataset:
+    """
+    Fetch once per DATASET_TTL for the whole process, not once per browser tab.
+
+    Expired pages are served from cache and refreshed in the background,
+    unless _fresh (the Fetch button) asks to wait for them to be fetched
+    again; being unhashed, it does not split the cache entry every session
+    shares. If every cinema fails, falls back to screenings stored by
+    earlier fetches.
+    """
+    report = fetch_report(stale_ok=not _fresh)
+    # Then keep every cinema's cache warm while the app runs, so later fetches are served at
+    # once. Started only now: on a cold cache it would download the pages fetched above again.
+    background_refresher()
+    screenings, status = report.screenings, report.status
+    if not screenings:
+        screenings = stored_screenings()
+        status = status + [
+            f"• {name}: stored {when:%Y-%m-%d %H:%M}" for name, when in store.last_updated().items()
+        ]
+    titles = canonical_map(screenings)
+    return Dataset(
+        ScreeningIndex(screenings), titles, TitleIndex(titles), status, report, datetime.now()
+    )
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def schedule_view(
+    _dataset: Dataset,
+    loaded_at: datetime,
+    from_date: date,
+    to_date: date,
+    min_time: str | None,
+    max_time: str | None,
+    cinemas: tuple[str, ...],
+    search: str
+) -> ScheduleView:
+    """Filter and group once per distinct set of inputs (loaded_at identifies the dataset)."""
+    filtered = filter_screenings(
+        _dataset.index, from_date, to_date, min_time, max_time, set(cinemas) or None
+    )
+    if search:
+        # Search the distinct titles, then keep the screenings of the matches
+        matched = set(_dataset.search.search(search))
+        filtered = [s for s in filtered if s.title in matched]
+    return build_schedule_view(filtered, from_date, to_date, _dataset.titles)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def recent_changes(loaded_at: datetime) -> list[changes.Change]:
+    """The newest change-log entries, read once per dataset (loaded_at identifies it)."""
+    return changes.recent(limit=CHANGES_SHOWN)
+
+
+def movie_markdown(movie: MovieGroup) -> str:
+    """One markdown block per movie: fewer elements to send than one per slot."""
+    lines = []
+    for slot in movie.slots:
+        group = slot.screenings
+        if len(group) == 1:
+            lines.append(f"• {group[0].day} {group[0].date} **{slot.time}** — {slot.cinema}")
+        else:
+            date_range = f"{group[0].day}–{group[-1].day}"
+            lines.append(f"• {date_range} **{slot.time}** — {slot.cinema}")
+    lines.append(f"[🔗 Search on IMDB](https://www.imdb.com/find/?q={quote(movie.title)})")
+    return "  \n".join(lines)
+
+
+dataset = load_dataset(st.session_state.pop("force_fetch", False))
 
 # Sidebar: inputs
 with st.sidebar:
@@ -51,92 +141,92 @@ with st.sidebar:
     fetch_clicked = st.button("🔄 Fetch Screenings", type="primary", use_container_width=True)
 
     # Status messages
-    if st.session_state.status:
+    if dataset.status:
         st.divider()
-        st.caption("Fetch status:")
-        for msg in st.session_state.status:
+        st.caption(f"Fetch status ({dataset.loaded_at:%H:%M}):")
+        for msg in dataset.status:
             st.text(msg)
 
-# Fetch on button click
+    # Per-cinema stage timings
+    report = dataset.report
+    if report is not None:
+        with st.expander(f"Timings ({report.total * 1000:.0f} ms)"):
+            st.dataframe(
+                [
+                    {
+                        "cinema": r.name,
+                        "cache": r.cache,
+                        "age (min)": round(r.age / 60, 1) if r.age is not None else None,
+                        **{stage: round(seconds * 1000, 1) for stage, seconds in r.stages.items()},
+                        "total": round(r.total * 1000, 1),
+                        "KB": round(r.bytes_wire / 1024, 1),
+                    }
+                    for r in report.cinemas
+                ],
+                hide_index=True,
+            )
+            st.caption("Milliseconds per stage")
+            st.download_button(
+                "Download timings (JSON)",
+                report.to_json(),
+                file_name=f"timings-{report.started.replace(':', '')}.json",
+                mime="application/json",
+            )
+
+    # What recent fetches added and removed
+    logged = recent_changes(dataset.loaded_at)
+    if logged:
+        with st.expander(f"Changes ({len(logged)})"):
+            st.text("\n".join(changes.format_changes(list(reversed(logged)), max_rows=5)))
+            st.download_button(
+                "Download change log (JSON Lines)",
+                "".join(json.dumps(change.to_dict(), ensure_ascii=False) + "\n" for change in logged),
+                file_name="changes.jsonl",
+                mime="application/jsonl",
+            )
+
+# Fetch on button click: drop the shared dataset so every session sees the new one,
+# and rebuild it from freshly fetched pages rather than stale ones
 if fetch_clicked:
-    with st.spinner("Fetching from all cinemas..."):
-        screenings, status = fetch_all_screenings()
-        st.session_state.screenings = screenings
-        st.session_state.status = status
-        st.session_state.fetched = True
+    load_dataset.clear()
+    st.session_state["force_fetch"] = True
     st.rerun()
 
 # Main area
-if not st.session_state.fetched:
-    st.info("Click **Fetch Screenings** to load the schedule.")
-elif not st.session_state.screenings:
+if not len(dataset.index):
     st.error("No screenings found. Check your internet connection.")
 else:
-    # Apply filters
-    cinema_set = set(selected_cinemas) if selected_cinemas else None
-    filtered = filter_screenings(
-        st.session_state.screenings,
-        from_date,
-        to_date,
-        min_time,
-        max_time,
-        cinema_set
-    )
-
     # Search box
     search = st.text_input("🔍 Search movies", placeholder="Type to filter...")
-    if search:
-        search_lower = search.lower()
-        filtered = [s for s in filtered if search_lower in s["title"].lower()]
+
+    # Filter and group once per input combination; the same view feeds the page and the export
+    view = schedule_view(
+        dataset, dataset.loaded_at, from_date, to_date, min_time, max_time,
+        tuple(selected_cinemas), search
+    )
 
     # Stats
-    movie_count, screening_count = count_results(filtered)
-    st.info(f"**{movie_count}** movies, **{screening_count}** screenings")
+    st.info(f"**{view.movie_count}** movies, **{view.screening_count}** screenings")
 
-    if not filtered:
+    if not view.movies:
         st.warning("No screenings match your filters.")
     else:
-        # Group by title
-        movies = {}
-        for s in filtered:
-            title = s["title"]
-            if title not in movies:
-                movies[title] = []
-            movies[title].append(s)
-
-        # Display movies
-        for title in sorted(movies.keys(), key=str.lower):
-            screenings = movies[title]
-
-            # Group by (time, cinema) for compact display
-            time_cinema_groups = {}
-            for s in screenings:
-                key = (s["time"], s["cinema"])
-                if key not in time_cinema_groups:
-                    time_cinema_groups[key] = []
-                time_cinema_groups[key].append(s)
-
-            with st.expander(f"**{title}** ({len(screenings)} screenings)"):
-                for (time_str, cinema), group in sorted(time_cinema_groups.items()):
-                    dates = [s["date"] for s in group]
-                    days = [s["day"] for s in group]
-                    if len(dates) == 1:
-                        st.write(f"• {days[0]} {dates[0]} **{time_str}** — {cinema}")
-                    else:
-                        date_range = f"{days[0]}–{days[-1]}"
-                        st.write(f"• {date_range} **{time_str}** — {cinema}")
-
-                encoded = quote(title)
-                st.markdown(f"[🔗 Search on IMDB](https://www.imdb.com/find/?q={encoded})")
-
-    # Export button
+        # Display one page of movies, so reruns stay fast however many titles match
+        pages = -(-view.movie_count // PAGE_SIZE)
+        page = 1
+        if pages > 1:
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+        for movie in view.movies[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]:
+            with st.expander(f"**{movie.title}** ({movie.count} screenings)"):
+                st.markdown(movie_markdown(movie))
+
+    # Export buttons
     st.divider()
-    if st.button("📥 Export to schedule.md"):
-        output = format_schedule(
-            st.session_state.screenings,
-            from_date,
-            to_date,
-            min_time
-        )
-        OUTPUT_FILE.write_text(output, encoding="utf-8")
-        st.success(f"Written to: {OUTPUT_FILE}")
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        suffix = st.selectbox("Format", list(FORMATS), label_visibility="collapsed")
+    output = OUTPUT_FILE.with_suffix(suffix)
+    with col2:
+        if st.button(f"📥 Export to {output.name}"):
+            export_files(view, [output])
+            st.success(f"Written to: {output}")
@@ -0,0 +1,145 @@
+"""Sorted screening index for date-range, time-window and cinema queries."""
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from heapq import merge
+
+from screening import Screening, parse_minutes
+
+# Sort key = ordinal * SLOT + (minutes + 1): one int orders by (date, time).
+# The +1 keeps unparseable times (-1) inside their own day.
+SLOT = 2048
+MAX_MINUTES = SLOT - 2
+
+
+def _key(s: Screening) -> int:
+    return s.ordinal * SLOT + min(s.minutes, MAX_MINUTES) + 1
+
+
+class _Postings:
+    """Records sorted by (date, time) with a parallel array of sort keys."""
+
+    __slots__ = ("keys", "records", "days")
+
+    def __init__(self, records: list[Screening], keys: list[int]):
+        # records must already be in key order
+        self.records = records
+        self.keys = keys
+        self.days = sorted({key // SLOT for key in keys})
+
+    def range(self, from_ord: int, to_ord: int, lo_min: int, hi_min: int) -> list[Screening]:
+        keys = self.keys
+        records = self.records
+
+        if lo_min <= -1 and hi_min >= MAX_MINUTES:
+            # No time window: the date range is one contiguous slice
+            lo = bisect_left(keys, from_ord * SLOT)
+            hi = bisect_left(keys, (to_ord + 1) * SLOT)
+            return records[lo:hi]
+
+        # Time window: one slice per day that has screenings
+        result = []
+        first = bisect_left(self.days, from_ord)
+        last = bisect_right(self.days, to_ord)
+        lo = 0
+        for day in self.days[first:last]:
+            base = day * SLOT + 1
+            lo = bisect_left(keys, base + lo_min, lo)
+            hi = bisect_right(keys, base + hi_min, lo)
+            result.extend(records[lo:hi])
+            lo = hi
+        return result
+
+
+class ScreeningIndex:
+    """
+    Query index built once per dataset.
+
+    Holds the screenings sorted by (date, time), plus the same order per
+    cinema, so a query bisects to the matching slices instead of scanning
+    every row. Results come back in chronological order.
+    """
+
+    def __init__(self, screenings: list[Screening]):
+        screenings = list(screenings)
+        unsorted_keys = [_key(s) for s in screenings]
+        order = sorted(range(len(screenings)), key=unsorted_keys.__getitem__)
+        records = [screenings[i] for i in order]
+        keys = [unsorted_keys[i] for i in order]
+        self.all = _Postings(records, keys)
+
+        # Per-cinema postings keep the global order, so no second sort
+        by_cinema = {}
+        for s, key in zip(records, keys):
+            postings = by_cinema.get(s.cinema)
+            if postings is None:
+                postings = by_cinema[s.cinema] = ([], [])
+            postings[0].append(s)
+            postings[1].append(key)
+        self.by_cinema = {cinema: _Postings(*postings) for cinema, postings in by_cinema.items()}
+
+    def __len__(self) -> int:
+        return len(self.all.records)
+
+    def __iter__(self):
+        return iter(self.all.records)
+
+    @property
+    def cinemas(self) -> list[str]:
+        return sorted(self.by_cinema)
+
+    def query(
+        self,
+        from_date: date,
+        to_date: date,
+        min_time: str | None = None,
+        max_time: str | None = None,
+        cinemas: set[str] | None = None
+    ) -> list[Screening]:
+        """Screenings in [from_date, to_date], [min_time, max_time], at cinemas."""
+        from_ord = max(from_date.toordinal(), 1)
+        to_ord = to_date.toordinal()
+        lo_min = parse_minutes(min_time) if min_time else -1
+        hi_min = parse_minutes(max_time) if max_time else MAX_MINUTES
+        if from_ord > to_ord:
+            return []
+
+        if not cinemas:
+            return self.all.range(from_ord, to_ord, lo_min, hi_min)
+
+        parts = [
+            self.by_cinema[cinema].range(from_ord, to_ord, lo_min, hi_min)
+            for cinema in sorted(cinemas)
+            if cinema in self.by_cinema
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        return list(merge(*parts, key=_key))
+
+
+# Indexes for recently queried lists, keyed by identity. The list itself is
+# kept alive alongside its index so the id cannot be reused.
+_INDEX_CACHE_SIZE = 4
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def index_for(screenings: list[Screening]) -> ScreeningIndex:
+    """Return the (cached) index for a screening list; lists must not be mutated."""
+    if isinstance(screenings, ScreeningIndex):
+        return screenings
+
+    with _index_lock:
+        entry = _index_cache.get(id(screenings))
+        if entry is not None and entry[0] is screenings and entry[1] == len(screenings):
+            _index_cache.move_to_end(id(screenings))
+            return entry[2]
+
+    index = ScreeningIndex(screenings)
+    with _index_lock:
+        _index_cache[id(screenings)] = (screenings, len(screenings), index)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,63 @@
+"""Cache of parsed screenings, keyed by page content, parser version and date."""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+
+from fetch import parsed_cache_path
+from screening import Screening
+
+# cinema -> (key, screenings), so repeat fetches in one process skip even the JSON load
+_memory = {}
+_lock = threading.Lock()
+
+
+def cache_key(html: str, version: int) -> str:
+    """
+    Hash of the page content, the version of the parser reading it and today's date.
+
+    Parsers resolve dates against today ("Dzisiaj", "24/1" without a year), so
+    the same page can parse differently tomorrow.
+    """
+    digest = hashlib.sha256(html.encode('utf-8', errors='replace'))
+    digest.update(f"\0parser-v{version}\0{date.today().isoformat()}".encode())
+    return digest.hexdigest()
+
+
+def load(cinema: str, key: str) -> list[Screening] | None:
+    """Return cached screenings for a cinema if they were built from key."""
+    with _lock:
+        entry = _memory.get(cinema)
+    if entry is None or entry[0] != key:
+        try:
+            data = json.loads(parsed_cache_path(cinema).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key:
+            return None
+        entry = (key, [Screening.from_ordinal(*row) for row in data["screenings"]])
+        with _lock:
+            _memory[cinema] = entry
+
+    return list(entry[1])
+
+
+def store(cinema: str, key: str, screenings: list[Screening]) -> None:
+    """Remember the parse result for a cinema's current page."""
+    with _lock:
+        _memory[cinema] = (key, list(screenings))
+
+    data = {
+        "key": key,
+        "screenings": [[s.title, s.ordinal, s.minutes, s.day, s.cinema] for s in screenings],
+    }
+    path = parsed_cache_path(cinema)
+    # One temp file per writer: the background refresher may store the same cinema at once
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,134 @@
+"""Optional process-pool parse stage for large pages.
+
+The regex parsers hold the GIL, so fetch threads parse one page at a time.
+A parser module that defines split(html) can instead have a large page
+parsed on several cores: split returns the spans of the page's
+self-contained sections (Mikro's date separators, Agrafka's repertoire
+tables, Pod Baranami's date headers), neighbouring spans are grouped into
+TASKS_PER_PROCESS tasks of similar size per worker, every task's text is
+parsed by the module's own parse() in a worker process, and the results
+are joined in document order - the same list parse(html) returns.
+
+Off by default (PROCESSES = 0). The pool is started on first use and
+keeps its size until shutdown(). It pays off only with spare cores and for
+pages of MIN_CHARS and more: below that, shipping text to the workers and
+screenings back costs more than it saves (see benchmarks/bench_parse_pool.py
+for the crossover on a given machine).
+"""
+
+import importlib
+import threading
+from itertools import repeat
+
+from parsers import specs
+from screening import Screening
+
+PROCESSES = 0  # worker processes; below 2, every page is parsed in the calling thread
+MIN_CHARS = 1_000_000  # smaller pages are parsed in the calling thread
+TASKS_PER_PROCESS = 2  # more, smaller tasks even out sections of uneven size
+
+_pool = None  # ProcessPoolExecutor
+_pool_lock = threading.Lock()
+
+
+def enabled(cinema_key: str, html: str) -> bool:
+    """Whether parse() would use the pool for this page."""
+    return PROCESSES > 1 and len(html) >= MIN_CHARS and specs()[cinema_key].has_split
+
+
+def pool(processes: int):
+    """
+    The process-wide worker pool, started with processes workers if not running.
+
+    A running pool is returned whatever processes asks for: other threads
+    may have tasks on it, so it is never swapped for one of another size.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Only pay for importing multiprocessing when the pool is used
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Fetch threads may be running: forking them could copy a held lock
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(processes, mp_context=context)
+        return _pool
+
+
+def shutdown() -> None:
+    """Stop the worker pool (it is started again on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def tasks(html: str, spans: list[tuple[int, int]], count: int) -> list[str]:
+    """Group consecutive spans into about count texts of similar length."""
+    target = sum(end - start for start, end in spans) / max(count, 1)
+    texts = []
+    group = []
+    size = 0
+    for span in spans:
+        group.append(span)
+        size += span[1] - span[0]
+        if size >= target:
+            texts.append(_text(html, group))
+            group, size = [], 0
+    if group:
+        texts.append(_text(html, group))
+    return texts
+
+
+def _text(html: str, spans: list[tuple[int, int]]) -> str:
+    if all(spans[i][1] == spans[i + 1][0] for i in range(len(spans) - 1)):
+        return html[spans[0][0]:spans[-1][1]]
+    return "".join(html[start:end] for start, end in spans)
+
+
+def _parse_task(module_path: str, text: str) -> list[tuple]:
+    """
+    Runs in a worker: parse one group of sections.
+
+    Returns plain (title, ordinal, minutes, day, cinema) tuples, which
+    pickle an order of magnitude faster than Screening records.
+    """
+    return [(s.title, s.ordinal, s.minutes, s.day, s.cinema)
+            for s in importlib.import_module(module_path).parse(text)]
+
+
+def parse(cinema_key: str, html: str, processes: int | None = None) -> list[Screening]:
+    """
+    Parse a page on the worker pool, split at its section boundaries.
+
+    Returns the same records as the cinema's parse(html). Falls back to
+    parsing in the calling thread when the page has a single section or
+    anything goes wrong on the pool; a broken pool (a worker was killed)
+    is shut down, to be started again on next use.
+
+    Args:
+        cinema_key: A cinema whose parser module defines split(html)
+        html: The page
+        processes: Worker processes if the pool is not running yet (default PROCESSES)
+    """
+    from concurrent.futures.process import BrokenProcessPool
+
+    spec = specs()[cinema_key]
+    processes = processes or PROCESSES
+    texts = tasks(html, spec.split(html), processes * TASKS_PER_PROCESS)
+    if len(texts) <= 1:
+        return spec.parse(html)
+
+    try:
+        parts = pool(processes).map(_parse_task, repeat(spec.module_path), texts)
+        from_ordinal = Screening.from_ordinal
+        return [from_ordinal(*row) for part in parts for row in part]
+    except BrokenProcessPool:
+        shutdown()
+        return spec.parse(html)
+    except Exception:
+        # e.g. a page too large to pickle: the calling thread can still parse it
+        return spec.parse(html)
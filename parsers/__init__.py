@@ -1,17 +1,145 @@
-"""Cinema HTML parsers."""
-
-from parsers.kika import parse as parse_kika
-from parsers.mikro import parse as parse_mikro
-from parsers.agrafka import parse as parse_agrafka
-from parsers.paradox import parse as parse_paradox
-from parsers.baranami import parse as parse_baranami
-from parsers.kijow import parse as parse_kijow
-
-PARSERS = {
-    "kika": ("KIKA", parse_kika),
-    "mikro": ("Mikro", parse_mikro),
-    "agrafka": ("Agrafka", parse_agrafka),
-    "paradox": ("Paradox", parse_paradox),
-    "baranami": ("Barany", parse_baranami),
-    "kijow": ("Kijów", parse_kijow),
+"""Cinema HTML parsers.
+
+PARSERS, VERSIONS and STREAM_PARSERS are lazy registries: a parser module
+(and the regexes it compiles at import) is loaded the first time one of its
+functions is called or its VERSION is needed, so listing cinemas imports
+nothing.
+
+Third-party parsers plug in through the "cinema_parsers" entry point group.
+The entry point name is the cinema key and its value a module path, e.g.
+
+    [project.entry-points.cinema_parsers]
+    kino_x = "kino_x_parser"
+
+The module provides NAME (display name), VERSION, URL (the page to
+fetch), parse(html) and optionally ENCODING (default utf-8),
+parse_stream(chunks) and split(html) (see parse_pool), like the built-in
+modules. Built-in cinemas keep their URL and encoding in fetch.CINEMAS.
+"""
+
+import importlib
+import threading
+from collections.abc import Mapping
+
+ENTRY_POINT_GROUP = "cinema_parsers"
+
+
+class ParserSpec:
+    """One cinema's parser module, imported on first use."""
+
+    def __init__(self, key: str, module: str, name: str | None = None,
+                 stream: bool | None = None):
+        self.key = key
+        self.module_path = module
+        self._name = name
+        self._stream = stream
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def module(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.module_path)
+        return self._module
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            self._name = getattr(self.module, "NAME", self.key.title())
+        return self._name
+
+    @property
+    def version(self) -> int:
+        return self.module.VERSION
+
+    @property
+    def site(self) -> tuple[str, str] | None:
+        """(url, encoding) declared by the module, None if it has no URL."""
+        url = getattr(self.module, "URL", None)
+        return (url, getattr(self.module, "ENCODING", "utf-8")) if url else None
+
+    @property
+    def has_stream(self) -> bool:
+        if self._stream is None:
+            self._stream = hasattr(self.module, "parse_stream")
+        return self._stream
+
+    @property
+    def has_split(self) -> bool:
+        return hasattr(self.module, "split")
+
+    def parse(self, html: str):
+        return self.module.parse(html)
+
+    def split(self, html: str) -> list[tuple[int, int]]:
+        return self.module.split(html)
+
+    def parse_stream(self, chunks):
+        return self.module.parse_stream(chunks)
+
+
+# Built-in cinemas: key -> (module, display name, has parse_stream)
+_BUILTIN = {
+    "kika": ("parsers.kika", "KIKA", False),
+    "mikro": ("parsers.mikro", "Mikro", True),
+    "agrafka": ("parsers.agrafka", "Agrafka", False),
+    "paradox": ("parsers.paradox", "Paradox", False),
+    "baranami": ("parsers.baranami", "Barany", True),
+    "kijow": ("parsers.kijow", "Kijów", True),
 }
+
+_specs = None
+_specs_lock = threading.Lock()
+
+
+def specs() -> dict[str, ParserSpec]:
+    """All parser specs, built-ins first, then entry-point plugins (discovered once)."""
+    global _specs
+    if _specs is None:
+        with _specs_lock:
+            if _specs is None:
+                # importlib.metadata is slow to import; only pay for it here
+                from importlib.metadata import entry_points
+
+                found = {
+                    key: ParserSpec(key, module, name, stream)
+                    for key, (module, name, stream) in _BUILTIN.items()
+                }
+                for ep in entry_points(group=ENTRY_POINT_GROUP):
+                    # Built-ins win; a plugin cannot silently replace one
+                    found.setdefault(ep.name, ParserSpec(ep.name, ep.value))
+                _specs = found
+    return _specs
+
+
+class _Registry(Mapping):
+    """Read-only cinema key -> value view over specs(), computed on access."""
+
+    def __init__(self, value, include=lambda spec: True):
+        self._value = value
+        self._include = include
+
+    def __getitem__(self, key: str):
+        spec = specs()[key]
+        if not self._include(spec):
+            raise KeyError(key)
+        return self._value(spec)
+
+    def __iter__(self):
+        return (key for key, spec in specs().items() if self._include(spec))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+# key -> (display name, parse function); the function imports its module when called
+PARSERS = _Registry(lambda spec: (spec.name, spec.parse))
+
+# Each parser module has a VERSION, bumped whenever its output changes, so
+# screenings cached by parse_cache are rebuilt with the new parser
+VERSIONS = _Registry(lambda spec: spec.version)
+
+# Incremental parsers fed with text chunks while the page downloads
+STREAM_PARSERS = _Registry(lambda spec: spec.parse_stream, lambda spec: spec.has_stream)
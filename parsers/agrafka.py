@@ -1,63 +1,112 @@
 """Parser for Agrafka cinema (kinoagrafka.pl)."""
 
 import re
+from collections.abc import Iterator
 from dates import POLISH_MONTHS
 from formatting import normalize_title
+from screening import Screening
 
+VERSION = 2
 
-def parse(html: str) -> list[dict]:
+# HTML comments hold a huge amount of old repertoire. Instead of stripping
+# them from a copy of the page, the scanner matches and skips them in place.
+COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+TABLE_START_RE = re.compile(r'<!--.*?-->|<table class="repertoire"[^>]*>', re.DOTALL)
+TABLE_END_RE = re.compile(r'<!--.*?-->|</table>', re.DOTALL)
+
+DATE_RE = re.compile(r'<h3>([^<]+)</h3>')
+ROW_RE = re.compile(r'<tr>(.*?)</tr>', re.DOTALL)
+TIME_RE = re.compile(r'<td class="hour">([^<]+)</td>')
+# Polish title from anchor text (not title attribute which has original title)
+# Handle optional <b> tag and whitespace: <a href="..."><b>TITLE</b> </a>
+TITLE_RE = re.compile(r'<a[^>]*href="film\.php[^"]*"[^>]*>\s*(?:<b>)?([^<]+)(?:</b>)?\s*</a>')
+
+
+def parse(html: str) -> list[Screening]:
     """
     Parse Agrafka HTML.
-    Returns list of {title, date, time, day}.
+    Returns list of Screening (title, date, time, day).
     """
     results = []
 
-    # Remove HTML comments (huge amount of old data)
-    html = re.sub(r'<!--.*?-->', '', html, flags=re.DOTALL)
+    for start_match, end_match, has_comment in _tables(html):
+        start, end = start_match.end(), end_match.start()
+        if has_comment:
+            # Rare: comments inside a table; parse a cleaned copy of just that table
+            table = COMMENT_RE.sub('', html[start:end])
+            _parse_table(table, 0, len(table), results)
+        else:
+            _parse_table(html, start, end, results)
+
+    return results
+
+
+def split(html: str) -> list[tuple[int, int]]:
+    """
+    Spans of the repertoire tables outside comments, tags included.
+    Parsing the tables one by one, in order, gives the same records as
+    parse(html) (see parse_pool).
+    """
+    return [(start_match.start(), end_match.end()) for start_match, end_match, _ in _tables(html)]
+
 
-    # Find all repertoire tables
-    table_pattern = r'<table class="repertoire"[^>]*>(.*?)</table>'
-    for table_match in re.finditer(table_pattern, html, re.DOTALL):
-        table = table_match.group(1)
+def _tables(html: str) -> Iterator[tuple[re.Match, re.Match, bool]]:
+    """Each repertoire table outside comments: (start tag, end tag, has a comment inside)."""
+    pos = 0
 
-        # Extract date from thead h3: "24 stycznia 2026 /piątek/"
-        date_match = re.search(r'<h3>([^<]+)</h3>', table)
-        if not date_match:
+    while True:
+        # Next repertoire table outside a comment
+        start_match = TABLE_START_RE.search(html, pos)
+        if not start_match:
+            return
+        pos = start_match.end()
+        if start_match.group().startswith('<!--'):
             continue
 
-        date_str = date_match.group(1).replace('/', ' ')
-        parts = date_str.strip().split()
+        # Its closing tag, again ignoring anything inside comments
+        has_comment = False
+        while True:
+            end_match = TABLE_END_RE.search(html, pos)
+            if not end_match:
+                return
+            pos = end_match.end()
+            if not end_match.group().startswith('<!--'):
+                break
+            has_comment = True
 
-        if len(parts) < 4:
+        yield start_match, end_match, has_comment
+
+
+def _parse_table(text: str, start: int, end: int, results: list[Screening]):
+    """Parse one repertoire table occupying text[start:end]."""
+    # Extract date from thead h3: "24 stycznia 2026 /piątek/"
+    date_match = DATE_RE.search(text, start, end)
+    if not date_match:
+        return
+
+    date_str = date_match.group(1).replace('/', ' ')
+    parts = date_str.strip().split()
+
+    if len(parts) < 4:
+        return
+
+    day_num, month_name, year, day_name = parts[0], parts[1], parts[2], parts[3]
+    month = POLISH_MONTHS.get(month_name.lower(), 1)
+    iso_date = f"{year}-{month:02d}-{int(day_num):02d}"
+
+    # Find all tbody rows
+    for row_match in ROW_RE.finditer(text, start, end):
+        row_start, row_end = row_match.span(1)
+
+        # Extract time
+        time_match = TIME_RE.search(text, row_start, row_end)
+        if not time_match:
             continue
+        time_str = time_match.group(1).strip()
 
-        day_num, month_name, year, day_name = parts[0], parts[1], parts[2], parts[3]
-        month = POLISH_MONTHS.get(month_name.lower(), 1)
-        iso_date = f"{year}-{month:02d}-{int(day_num):02d}"
-
-        # Find all tbody rows
-        row_pattern = r'<tr>(.*?)</tr>'
-        for row_match in re.finditer(row_pattern, table, re.DOTALL):
-            row = row_match.group(1)
-
-            # Extract time
-            time_match = re.search(r'<td class="hour">([^<]+)</td>', row)
-            if not time_match:
-                continue
-            time_str = time_match.group(1).strip()
-
-            # Extract Polish title from anchor text (not title attribute which has original title)
-            # Handle optional <b> tag and whitespace: <a href="..."><b>TITLE</b> </a>
-            title_match = re.search(r'<a[^>]*href="film\.php[^"]*"[^>]*>\s*(?:<b>)?([^<]+)(?:</b>)?\s*</a>', row)
-            if not title_match:
-                continue
-            title = normalize_title(title_match.group(1))
-
-            results.append({
-                "title": title,
-                "date": iso_date,
-                "time": time_str,
-                "day": day_name.lower(),
-            })
+        title_match = TITLE_RE.search(text, row_start, row_end)
+        if not title_match:
+            continue
+        title = normalize_title(title_match.group(1))
 
-    return results
+        results.append(Screening(title, iso_date, time_str, day_name.lower()))
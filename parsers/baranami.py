@@ -1,57 +1,90 @@
 """Parser for Pod Baranami cinema (kinopodbaranami.pl)."""
 
 import re
+from collections.abc import Iterable, Iterator
 from dates import POLISH_MONTHS
 from formatting import normalize_title
+from parsers.sections import iter_sections
+from screening import Screening
+
+VERSION = 2
 
 DAYS_PL = {
     'Poniedziałek': 'poniedziałek', 'Wtorek': 'wtorek', 'Środa': 'środa',
     'Czwartek': 'czwartek', 'Piątek': 'piątek', 'Sobota': 'sobota', 'Niedziela': 'niedziela'
 }
 
+# Date headers: <p class="rep_date"><span>Dzień</span> DD miesiąc //
+HEADER_RE = re.compile(r'<p class="rep_date"><span>([^<]+)</span>\s+(\d+)\s+(\w+)\s+//')
+HEADER_LT = 3  # '<' characters in a header, for streaming
+# Infer year from onclick handlers
+YEAR_RE = re.compile(r"validateAndShowOrderDialog\([^,]+,[^,]+,'(\d{4})'")
+# List items with title and time; Polish title is the anchor text
+# (first text node before any nested tags)
+ITEM_RE = re.compile(
+    r'<li[^>]*>.*?<a[^>]*href="film\.php[^"]*"[^>]*>\s*([^<]+?)\s*(?:<|</a>).*?<span>.*?(\d{1,2}:\d{2}).*?</span>.*?</li>',
+    re.DOTALL,
+)
+
 
-def parse(html: str) -> list[dict]:
+def parse(html: str) -> list[Screening]:
     """
     Parse Pod Baranami HTML.
-    Returns list of {title, date, time, day}.
+    Returns list of Screening (title, date, time, day).
     """
     results = []
 
-    # Split by date headers: <p class="rep_date"><span>Dzień</span> DD miesiąc //
-    sections = re.split(r'<p class="rep_date"><span>([^<]+)</span>\s+(\d+)\s+(\w+)\s+//', html)
+    # Each date section runs from its header to the next one
+    headers = HEADER_RE.finditer(html)
+    header = next(headers, None)
 
-    # sections layout: [before, day1, num1, month1, content1, day2, num2, month2, content2, ...]
-    for i in range(1, len(sections), 4):
-        if i + 3 >= len(sections):
-            break
+    while header is not None:
+        following = next(headers, None)
+        start = header.end()
+        end = following.start() if following is not None else len(html)
+        _parse_section(html, header, start, end, results)
+        header = following
 
-        day_name_raw = sections[i].strip()
-        day_num = sections[i + 1].strip()
-        month_name = sections[i + 2].strip()
-        content = sections[i + 3]
+    return results
 
-        day_name = DAYS_PL.get(day_name_raw, day_name_raw.lower())
-        month = POLISH_MONTHS.get(month_name.lower(), 1)
 
-        # Infer year from onclick handlers
-        year_match = re.search(r"validateAndShowOrderDialog\([^,]+,[^,]+,'(\d{4})'", content)
-        year = year_match.group(1) if year_match else "2026"
+def split(html: str) -> list[tuple[int, int]]:
+    """
+    Spans of the date sections, each from its header to the next.
+    Parsing the sections one by one, in order, gives the same records as
+    parse(html) (see parse_pool).
+    """
+    starts = [m.start() for m in HEADER_RE.finditer(html)]
+    return list(zip(starts, starts[1:] + [len(html)]))
 
-        iso_date = f"{year}-{month:02d}-{int(day_num):02d}"
 
-        # Find all list items with title and time
-        # Extract Polish title from anchor text (first text node before any nested tags)
-        li_pattern = r'<li[^>]*>.*?<a[^>]*href="film\.php[^"]*"[^>]*>\s*([^<]+?)\s*(?:<|</a>).*?<span>.*?(\d{1,2}:\d{2}).*?</span>.*?</li>'
-        for li_match in re.finditer(li_pattern, content, re.DOTALL):
-            title = normalize_title(li_match.group(1).strip())
-            time_str = li_match.group(2).strip()
+def parse_stream(chunks: Iterable[str]) -> Iterator[Screening]:
+    """
+    Parse Pod Baranami HTML arriving as text chunks, yielding the screenings
+    of each date section as soon as the next header (or the end) arrives.
+    Yields the same records as parse().
+    """
+    for text, header, start, end in iter_sections(chunks, HEADER_RE, HEADER_LT):
+        results = []
+        _parse_section(text, header, start, end, results)
+        yield from results
 
-            if title and time_str:
-                results.append({
-                    "title": title,
-                    "date": iso_date,
-                    "time": time_str,
-                    "day": day_name,
-                })
 
-    return results
+def _parse_section(html: str, header: re.Match, start: int, end: int, results: list[Screening]):
+    """Parse one date section occupying html[start:end]."""
+    day_name_raw, day_num, month_name = (g.strip() for g in header.groups())
+
+    day_name = DAYS_PL.get(day_name_raw, day_name_raw.lower())
+    month = POLISH_MONTHS.get(month_name.lower(), 1)
+
+    year_match = YEAR_RE.search(html, start, end)
+    year = year_match.group(1) if year_match else "2026"
+
+    iso_date = f"{year}-{month:02d}-{int(day_num):02d}"
+
+    for li_match in ITEM_RE.finditer(html, start, end):
+        title = normalize_title(li_match.group(1).strip())
+        time_str = li_match.group(2).strip()
+
+        if title and time_str:
+            results.append(Screening(title, iso_date, time_str, day_name))
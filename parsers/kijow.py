@@ -2,47 +2,70 @@
 
 import re
 import html as html_module
-from datetime import date
-from dates import weekday_name
+from collections.abc import Iterable, Iterator
+from dates import iso_weekday_name
 from formatting import normalize_title
+from screening import Screening
 
+VERSION = 2
 
-def parse(html: str) -> list[dict]:
+# Records of the embedded JavaScript data structure
+RECORD_RE = re.compile(r"'Id': (\d+), 'Name': '([^']+)', 'Date': '([^']+)', 'Hour': '([^']+)'")
+RECORD_START = "'Id': "
+
+
+def parse(html: str) -> list[Screening]:
     """
     Parse Kijów HTML (extracts from embedded JavaScript).
-    Returns list of {title, date, time, day}.
+    Returns list of Screening (title, date, time, day).
     """
     results = []
 
-    # Extract from JavaScript data structure
-    js_pattern = r"'Id': (\d+), 'Name': '([^']+)', 'Date': '([^']+)', 'Hour': '([^']+)'"
+    for match in RECORD_RE.finditer(html):
+        screening = _record(match)
+        if screening is not None:
+            results.append(screening)
+
+    return results
+
 
-    for match in re.finditer(js_pattern, html):
-        _, name, date_str, hour = match.groups()
+def parse_stream(chunks: Iterable[str]) -> Iterator[Screening]:
+    """
+    Parse Kijów HTML arriving as text chunks, yielding each screening as soon
+    as its JavaScript record is complete. Yields the same records as parse().
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        end = 0
+        for match in RECORD_RE.finditer(buffer):
+            screening = _record(match)
+            if screening is not None:
+                yield screening
+            end = match.end()
 
-        # Decode HTML entities and normalize
-        title = normalize_title(html_module.unescape(name))
+        # Keep only a record that may still be incomplete
+        start = buffer.rfind(RECORD_START, end)
+        if start == -1:
+            start = max(end, len(buffer) - len(RECORD_START) + 1)
+        buffer = buffer[start:]
 
-        # Convert DD.MM.YYYY to YYYY-MM-DD
-        parts = date_str.split('.')
-        if len(parts) != 3:
-            continue
 
-        day_num, month, year = parts
-        iso_date = f"{year}-{month.zfill(2)}-{day_num.zfill(2)}"
+def _record(match: re.Match) -> Screening | None:
+    _, name, date_str, hour = match.groups()
 
-        # Derive day name from date
-        try:
-            d = date.fromisoformat(iso_date)
-            day_name = weekday_name(d)
-        except ValueError:
-            day_name = ""
+    # Decode HTML entities and normalize
+    title = normalize_title(html_module.unescape(name))
 
-        results.append({
-            "title": title,
-            "date": iso_date,
-            "time": hour,
-            "day": day_name,
-        })
+    # Convert DD.MM.YYYY to YYYY-MM-DD
+    parts = date_str.split('.')
+    if len(parts) != 3:
+        return None
 
-    return results
+    day_num, month, year = parts
+    iso_date = f"{year}-{month.zfill(2)}-{day_num.zfill(2)}"
+
+    # Derive day name from date
+    day_name = iso_weekday_name(iso_date)
+
+    return Screening(title, iso_date, hour, day_name)
@@ -1,59 +1,60 @@
 """Parser for KIKA cinema (bilety.kinokika.pl)."""
 
 import re
-from dates import weekday_name
-from datetime import date
+from dates import iso_weekday_name
 from formatting import normalize_title
+from screening import Screening
 
+VERSION = 2
 
-def parse(html: str) -> list[dict]:
+# Repertoire-once row blocks with date in class
+BLOCK_RE = re.compile(r'<div class="repertoire-once row (\d{4}-\d{2}-\d{2})[^"]*"')
+TITLE_RE = re.compile(r'<a title="Kup bilet - ([^"]+)"')
+DAY_RE = re.compile(r'fa-calendar[^>]*>[^<]*</i>\s*([^,]+),')
+TIME_RE = re.compile(r'godz\.\s*(\d{1,2}:\d{2})')
+
+
+def parse(html: str) -> list[Screening]:
     """
     Parse KIKA HTML.
-    Returns list of {title, date, time, day}.
+    Returns list of Screening (title, date, time, day).
     """
     results = []
 
-    # Split by repertoire-once row blocks with date in class
-    pattern = r'<div class="repertoire-once row (\d{4}-\d{2}-\d{2})[^"]*"'
-    matches = list(re.finditer(pattern, html))
+    # Each block runs from the end of its header to the start of the next;
+    # blocks are searched in place with pos/endpos rather than sliced out
+    blocks = BLOCK_RE.finditer(html)
+    match = next(blocks, None)
 
-    for i, match in enumerate(matches):
+    while match is not None:
+        following = next(blocks, None)
         iso_date = match.group(1)
         start = match.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(html)
-        block = html[start:end]
+        end = following.start() if following is not None else len(html)
+        match = following
 
         # Extract title from: <a title="Kup bilet - TITLE"
-        title_match = re.search(r'<a title="Kup bilet - ([^"]+)"', block)
+        title_match = TITLE_RE.search(html, start, end)
         if not title_match:
             continue
         title = normalize_title(title_match.group(1))
 
         # Extract day name from date line
         day_name = ""
-        day_match = re.search(r'fa-calendar[^>]*>[^<]*</i>\s*([^,]+),', block)
+        day_match = DAY_RE.search(html, start, end)
         if day_match:
             day_name = day_match.group(1).strip().lower()
 
         # Fallback: derive from date
         if not day_name:
-            try:
-                d = date.fromisoformat(iso_date)
-                day_name = weekday_name(d)
-            except ValueError:
-                pass
+            day_name = iso_weekday_name(iso_date)
 
         # Extract time from: godz. HH:MM
-        time_match = re.search(r'godz\.\s*(\d{1,2}:\d{2})', block)
+        time_match = TIME_RE.search(html, start, end)
         if not time_match:
             continue
         time_str = time_match.group(1)
 
-        results.append({
-            "title": title,
-            "date": iso_date,
-            "time": time_str,
-            "day": day_name,
-        })
+        results.append(Screening(title, iso_date, time_str, day_name))
 
     return results
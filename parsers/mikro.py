@@ -1,81 +1,113 @@
 """Parser for Mikro cinema (kinomikro.pl)."""
 
 import re
+from collections.abc import Iterable, Iterator
 from datetime import date
 from dates import weekday_name, WEEKDAYS
 from formatting import normalize_title
+from parsers.sections import iter_sections
+from screening import Screening
 
+VERSION = 2
 
-def parse(html: str) -> list[dict]:
+SEPARATOR_RE = re.compile(r'<div class="repertoire-separator">([^<]+)</div>')
+SEPARATOR_LT = 2  # '<' characters in a separator, for streaming
+ITEM_RE = re.compile(r'<div class="repertoire-item[^"]*"[^>]*>(.*?)</div>\s*</div>', re.DOTALL)
+TIME_RE = re.compile(r'<p class="repertoire-item-hour">([^<]+)</p>')
+TITLE_RE = re.compile(r'repertoire-item-title"[^>]*>([^<]+)</a>')
+
+
+def parse(html: str) -> list[Screening]:
     """
     Parse Mikro HTML.
-    Returns list of {title, date, time, day}.
+    Returns list of Screening (title, date, time, day).
     """
     results = []
     today = date.today()
-    current_year = today.year
-
-    # Split by date separators
-    sections = re.split(r'<div class="repertoire-separator">([^<]+)</div>', html)
-
-    # sections[0] is content before first separator
-    # sections[1] is first date, sections[2] is content after first date, etc.
-    for i in range(1, len(sections), 2):
-        if i + 1 >= len(sections):
-            break
-
-        date_str = sections[i].strip()
-        content = sections[i + 1]
-
-        # Handle "Dzisiaj" (Today)
-        if date_str == "Dzisiaj":
-            iso_date = today.isoformat()
-            day_name = weekday_name(today)
-        else:
-            # Parse "sobota - 24/1" or "piątek - 7/2"
-            parts = date_str.split(' - ')
-            if len(parts) != 2:
-                continue
-
-            day_name = parts[0].strip().lower()
-            date_part = parts[1].strip()
-
-            # Parse DD/M or D/M
-            dm = date_part.split('/')
-            if len(dm) != 2:
-                continue
-
-            day_num, month = int(dm[0]), int(dm[1])
-
-            # Infer year - if month < today's month and we're late in year, it's next year
-            year = current_year
-            if month < today.month and today.month >= 10:
-                year = current_year + 1
-
-            iso_date = f"{year}-{month:02d}-{day_num:02d}"
-
-        # Find all repertoire items
-        item_pattern = r'<div class="repertoire-item[^"]*"[^>]*>(.*?)</div>\s*</div>'
-        for item_match in re.finditer(item_pattern, content, re.DOTALL):
-            item = item_match.group(1)
-
-            # Extract time
-            time_match = re.search(r'<p class="repertoire-item-hour">([^<]+)</p>', item)
-            if not time_match:
-                continue
-            time_str = time_match.group(1).strip()
-
-            # Extract title
-            title_match = re.search(r'repertoire-item-title"[^>]*>([^<]+)</a>', item)
-            if not title_match:
-                continue
-            title = normalize_title(title_match.group(1))
-
-            results.append({
-                "title": title,
-                "date": iso_date,
-                "time": time_str,
-                "day": day_name,
-            })
+
+    # Each date section runs from its separator to the next one
+    separators = SEPARATOR_RE.finditer(html)
+    separator = next(separators, None)
+
+    while separator is not None:
+        following = next(separators, None)
+        start = separator.end()
+        end = following.start() if following is not None else len(html)
+        _parse_section(html, separator.group(1), start, end, today, results)
+        separator = following
 
     return results
+
+
+def split(html: str) -> list[tuple[int, int]]:
+    """
+    Spans of the date sections, each from its separator to the next.
+    Parsing the sections one by one, in order, gives the same records as
+    parse(html) (see parse_pool).
+    """
+    starts = [m.start() for m in SEPARATOR_RE.finditer(html)]
+    return list(zip(starts, starts[1:] + [len(html)]))
+
+
+def parse_stream(chunks: Iterable[str]) -> Iterator[Screening]:
+    """
+    Parse Mikro HTML arriving as text chunks, yielding the screenings of each
+    date section as soon as the next separator (or the end) arrives.
+    Yields the same records as parse().
+    """
+    today = date.today()
+    for text, separator, start, end in iter_sections(chunks, SEPARATOR_RE, SEPARATOR_LT):
+        results = []
+        _parse_section(text, separator.group(1), start, end, today, results)
+        yield from results
+
+
+def _parse_section(html: str, date_str: str, start: int, end: int, today: date,
+                   results: list[Screening]):
+    """Parse the items of one date section occupying html[start:end]."""
+    date_str = date_str.strip()
+
+    # Handle "Dzisiaj" (Today)
+    if date_str == "Dzisiaj":
+        iso_date = today.isoformat()
+        day_name = weekday_name(today)
+    else:
+        # Parse "sobota - 24/1" or "piątek - 7/2"
+        parts = date_str.split(' - ')
+        if len(parts) != 2:
+            return
+
+        day_name = parts[0].strip().lower()
+        date_part = parts[1].strip()
+
+        # Parse DD/M or D/M
+        dm = date_part.split('/')
+        if len(dm) != 2:
+            return
+
+        day_num, month = int(dm[0]), int(dm[1])
+
+        # Infer year - if month < today's month and we're late in year, it's next year
+        year = today.year
+        if month < today.month and today.month >= 10:
+            year = today.year + 1
+
+        iso_date = f"{year}-{month:02d}-{day_num:02d}"
+
+    # Find all repertoire items
+    for item_match in ITEM_RE.finditer(html, start, end):
+        item_start, item_end = item_match.span(1)
+
+        # Extract time
+        time_match = TIME_RE.search(html, item_start, item_end)
+        if not time_match:
+            continue
+        time_str = time_match.group(1).strip()
+
+        # Extract title
+        title_match = TITLE_RE.search(html, item_start, item_end)
+        if not title_match:
+            continue
+        title = normalize_title(title_match.group(1))
+
+        results.append(Screening(title, iso_date, time_str, day_name))
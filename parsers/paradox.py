@@ -1,27 +1,36 @@
 """Parser for Paradox cinema (kinoparadox.pl)."""
 
 import re
-from datetime import date
-from dates import weekday_name
+from dates import iso_weekday_name
 from formatting import normalize_title
+from screening import Screening
 
+VERSION = 2
 
-def parse(html: str) -> list[dict]:
+# Screening rows with data-date attribute
+ROW_RE = re.compile(r'<div class="list-item__content__row" data-date="([^"]+)"')
+TIME_RE = re.compile(r'<div class="item-time">(\d{1,2}:\d{2})</div>')
+TITLE_RE = re.compile(r'class="item-title"[^>]*>\s*([^\n<]+)')
+
+
+def parse(html: str) -> list[Screening]:
     """
     Parse Paradox HTML.
-    Returns list of {title, date, time, day}.
+    Returns list of Screening (title, date, time, day).
     """
     results = []
 
-    # Find all screening rows with data-date attribute
-    pattern = r'<div class="list-item__content__row" data-date="([^"]+)"'
-    matches = list(re.finditer(pattern, html))
+    # Each row runs until the next one; rows are searched in place with
+    # pos/endpos rather than sliced out
+    rows = ROW_RE.finditer(html)
+    match = next(rows, None)
 
-    for i, match in enumerate(matches):
+    while match is not None:
+        following = next(rows, None)
         date_str = match.group(1)  # DD.MM.YYYY
         start = match.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(html)
-        block = html[start:end]
+        end = following.start() if following is not None else len(html)
+        match = following
 
         # Convert DD.MM.YYYY to YYYY-MM-DD
         parts = date_str.split('.')
@@ -31,29 +40,20 @@ def parse(html: str) -> list[dict]:
         iso_date = f"{year}-{month}-{day_num}"
 
         # Derive day name from date
-        try:
-            d = date.fromisoformat(iso_date)
-            day_name = weekday_name(d)
-        except ValueError:
-            day_name = ""
+        day_name = iso_weekday_name(iso_date)
 
         # Extract time
-        time_match = re.search(r'<div class="item-time">(\d{1,2}:\d{2})</div>', block)
+        time_match = TIME_RE.search(html, start, end)
         if not time_match:
             continue
         time_str = time_match.group(1)
 
         # Extract title
-        title_match = re.search(r'class="item-title"[^>]*>\s*([^\n<]+)', block)
+        title_match = TITLE_RE.search(html, start, end)
         if not title_match:
             continue
         title = normalize_title(title_match.group(1))
 
-        results.append({
-            "title": title,
-            "date": iso_date,
-            "time": time_str,
-            "day": day_name,
-        })
+        results.append(Screening(title, iso_date, time_str, day_name))
 
     return results
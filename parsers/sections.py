@@ -0,0 +1,57 @@
+"""Incremental splitting of a page into header-delimited sections."""
+
+import re
+from collections.abc import Iterable, Iterator
+
+
+def iter_sections(
+    chunks: Iterable[str],
+    header_re: re.Pattern,
+    header_lt: int
+) -> Iterator[tuple[str, re.Match, int, int]]:
+    """
+    Split text arriving in chunks into sections, each starting after a header.
+
+    A section is yielded as soon as the next header (or the end of input)
+    arrives, as (text, header, start, end) with the section's content in
+    text[start:end] - the same bounds a finditer over the whole page gives.
+
+    Args:
+        chunks: Decoded text chunks
+        header_re: Pattern matching a section header; its variable parts
+            must not contain '<'
+        header_lt: Number of '<' characters in a header, used to find a
+            header cut in two by a chunk boundary
+    """
+    buffer = ""
+    header = None
+    scan_from = 0
+
+    for chunk in chunks:
+        buffer += chunk
+        content_start = 0
+        for match in header_re.finditer(buffer, scan_from):
+            if header is not None:
+                yield buffer, header, content_start, match.start()
+            header = match
+            content_start = match.end()
+
+        partial = _partial_header_start(buffer, content_start, header_lt)
+        if header is None:
+            # Nothing before the first header is needed, except a partial one
+            content_start = partial
+        buffer = buffer[content_start:]
+        scan_from = partial - content_start
+
+    if header is not None:
+        yield buffer, header, 0, len(buffer)
+
+
+def _partial_header_start(buffer: str, start: int, header_lt: int) -> int:
+    """Earliest position after start where a header cut at the end could begin."""
+    pos = len(buffer)
+    for _ in range(header_lt):
+        pos = buffer.rfind('<', start, pos)
+        if pos == -1:
+            return start
+    return pos
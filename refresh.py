@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Background cache refresh: renew each cinema's page shortly before it expires."""
+
+import argparse
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fetch import CACHE_MAX_AGE, cache_age
+
+REFRESH_LEAD = 300  # seconds before expiry to start a refresh
+STAGGER = 15  # seconds between the first refreshes of different cinemas
+MIN_INTERVAL = 60  # never refresh one cinema more often than this
+BACKOFF_BASE = 30  # first retry delay after a failure
+BACKOFF_MAX = 1800
+
+
+class Refresher:
+    """
+    Refreshes cinema pages on a schedule, on background threads.
+
+    Each cinema is refreshed lead seconds before its cached page would
+    expire; cinemas due at the same time are spread stagger seconds apart.
+    A failing site is retried with exponential backoff and jitter, reset by
+    its next success. request() asks for an immediate refresh, e.g. when a
+    caller was just served a stale page; a cinema already refreshing is not
+    queued twice.
+
+    Args:
+        refresh_fn: Called with a cinema key; returns True on success
+        cinemas: Cinema keys to keep fresh
+        lead: Seconds before expiry to refresh
+        stagger: Minimum spacing of the initial refreshes
+        max_workers: Refreshes running at once
+    """
+
+    def __init__(
+        self,
+        refresh_fn,
+        cinemas: list[str],
+        lead: float = REFRESH_LEAD,
+        stagger: float = STAGGER,
+        max_workers: int = 2
+    ):
+        self.refresh_fn = refresh_fn
+        self.cinemas = list(cinemas)
+        self.lead = lead
+        self.stagger = stagger
+        self.failures = {cinema: 0 for cinema in self.cinemas}
+        self.last_result = {}  # cinema -> (finished at, ok)
+
+        self._heap = []  # (due, cinema)
+        self._due = {}  # cinema -> earliest scheduled time
+        self._running = set()
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._thread = None
+        self._stopped = False
+
+    def start(self) -> "Refresher":
+        """Schedule every cinema and start the scheduler thread."""
+        now = time.time()
+        with self._cond:
+            for i, cinema in enumerate(self.cinemas):
+                self._schedule(cinema, max(self._next_due(cinema, now), now + i * self.stagger))
+            self._thread = threading.Thread(target=self._loop, name="refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def request(self, cinema: str) -> None:
+        """Refresh a cinema as soon as possible, unless it already is refreshing."""
+        with self._cond:
+            if cinema in self._running:
+                return
+            self._schedule(cinema, time.time())
+            self._cond.notify()
+
+    def _next_due(self, cinema: str, now: float) -> float:
+        """When a cinema's cache enters the refresh window (now if missing)."""
+        age = cache_age(cinema)
+        if age is None:
+            return now
+        return now + CACHE_MAX_AGE - age - self.lead
+
+    def _backoff(self, failures: int) -> float:
+        # Exponential with "equal jitter": never immediate, never in lockstep
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _schedule(self, cinema: str, due: float) -> None:
+        # Caller holds the lock. An earlier entry for the cinema wins.
+        if cinema in self._due and self._due[cinema] <= due:
+            return
+        self._due[cinema] = due
+        heapq.heappush(self._heap, (due, cinema))
+
+    def _loop(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, cinema = self._heap[0]
+                wait = due - time.time()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                if self._due.get(cinema) != due:
+                    continue  # superseded by an earlier request
+                del self._due[cinema]
+                if cinema in self._running:
+                    continue
+                self._running.add(cinema)
+                self._pool.submit(self._refresh, cinema)
+
+    def _refresh(self, cinema: str) -> None:
+        try:
+            ok = bool(self.refresh_fn(cinema))
+        except Exception:
+            ok = False
+
+        now = time.time()
+        with self._cond:
+            self._running.discard(cinema)
+            self.last_result[cinema] = (now, ok)
+            if ok:
+                self.failures[cinema] = 0
+                due = max(self._next_due(cinema, now), now + MIN_INTERVAL)
+            else:
+                self.failures[cinema] = self.failures.get(cinema, 0) + 1
+                due = now + self._backoff(self.failures[cinema])
+            if not self._stopped:
+                self._schedule(cinema, due)
+                self._cond.notify()
+
+
+def main():
+    from core import refresh_cinema
+    from parsers import PARSERS
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lead", type=float, default=REFRESH_LEAD,
+                        help="seconds before expiry to refresh a page")
+    parser.add_argument("--stagger", type=float, default=STAGGER,
+                        help="seconds between the first refreshes of different cinemas")
+    args = parser.parse_args()
+
+    def refresh_and_log(cinema: str) -> bool:
+        ok = refresh_cinema(cinema)
+        print(f"{time.strftime('%H:%M:%S')}  {PARSERS[cinema][0]:<8} {'ok' if ok else 'failed'}",
+              flush=True)
+        return ok
+
+    refresher = Refresher(refresh_and_log, list(PARSERS), args.lead, args.stagger).start()
+    print(f"Refreshing {len(PARSERS)} cinemas {args.lead:.0f}s before their "
+          f"{CACHE_MAX_AGE}s cache expires (Ctrl+C to stop)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        refresher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Grouped schedule view shared by the markdown and Streamlit renderers."""
+
+from datetime import date
+
+from dates import collapse_many, collapse_ordinals
+from screening import Screening
+from titles import canonical_map
+
+
+class SlotGroup:
+    """Screenings of one movie at one (time, cinema), across several days."""
+
+    __slots__ = ("time", "cinema", "screenings", "_day_range")
+
+    def __init__(self, time: str, cinema: str):
+        self.time = time
+        self.cinema = cinema
+        self.screenings = []
+        self._day_range = None
+
+    @property
+    def day_range(self) -> str:
+        """Collapsed weekdays, e.g. "Pn-śr, pt" (computed on first use)."""
+        if self._day_range is None:
+            self._day_range = collapse_ordinals([s.ordinal for s in self.screenings])
+        return self._day_range
+
+
+class MovieGroup:
+    """All screenings of one title, grouped by (time, cinema)."""
+
+    __slots__ = ("title", "slots", "count")
+
+    def __init__(self, title: str, slots: list[SlotGroup]):
+        self.title = title
+        self.slots = slots
+        self.count = sum(len(slot.screenings) for slot in slots)
+
+
+class ScheduleView:
+    """Movies sorted by title, each with its (time, cinema) slots sorted."""
+
+    def __init__(self, from_date: date, to_date: date, movies: list[MovieGroup]):
+        self.from_date = from_date
+        self.to_date = to_date
+        self.movies = movies
+        self.movie_count = len(movies)
+        self.screening_count = sum(movie.count for movie in movies)
+
+    def fill_day_ranges(self) -> None:
+        """Compute every slot's day_range in one batch (see dates.collapse_many)."""
+        slots = [slot for movie in self.movies for slot in movie.slots if slot._day_range is None]
+        ranges = collapse_many([[s.ordinal for s in slot.screenings] for slot in slots])
+        for slot, day_range in zip(slots, ranges):
+            slot._day_range = day_range
+
+
+def build_schedule_view(
+    screenings: list[Screening],
+    from_date: date,
+    to_date: date,
+    titles: dict[str, str] | None = None
+) -> ScheduleView:
+    """
+    Group already-filtered screenings into a ScheduleView in a single pass.
+
+    Spellings of the same film (diacritics, "(napisy)" tags, small
+    differences between cinemas) are grouped under one canonical title.
+
+    Args:
+        screenings: Screenings to show (e.g. from core.filter_screenings)
+        from_date, to_date: Date range the screenings were filtered to
+        titles: Title -> canonical title, e.g. titles.canonical_map() of the
+            unfiltered screenings so names do not depend on the filter
+            (default: built from screenings)
+
+    Returns:
+        ScheduleView with movies sorted case-insensitively by title
+    """
+    if titles is None:
+        titles = canonical_map(screenings)
+
+    # title -> (time, cinema) -> SlotGroup
+    movies = {}
+    for s in screenings:
+        title = titles.get(s.title, s.title)
+        slots = movies.get(title)
+        if slots is None:
+            slots = movies[title] = {}
+        key = (s.time, s.cinema)
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = SlotGroup(*key)
+        slot.screenings.append(s)
+
+    groups = [
+        MovieGroup(title, [slots[key] for key in sorted(slots)])
+        for title, slots in movies.items()
+    ]
+    groups.sort(key=lambda movie: movie.title.lower())
+    return ScheduleView(from_date, to_date, groups)
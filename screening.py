@@ -0,0 +1,156 @@
+"""Compact, immutable screening record."""
+
+import datetime
+import sys
+import threading
+from collections.abc import Mapping
+
+from dates import iso_ordinal
+
+KEYS = ("title", "date", "time", "day", "cinema")
+
+
+class _CodeTable:
+    """Interns a small set of repeated strings (days, cinemas) as int codes."""
+
+    def __init__(self):
+        self.names = [""]
+        self.codes = {"": 0}
+        self._lock = threading.Lock()
+
+    def code(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(name)
+                if code is None:
+                    code = len(self.names)
+                    self.names.append(sys.intern(name))
+                    self.codes[name] = code
+        return code
+
+
+DAYS = _CodeTable()
+CINEMAS = _CodeTable()
+
+
+def parse_minutes(time_str: str) -> int:
+    """Convert "HH:MM" (or "H:MM") to minutes since midnight, -1 if invalid."""
+    hours, sep, minutes = time_str.strip().partition(":")
+    if not sep or not hours.isdigit() or not minutes.isdigit():
+        return -1
+    return int(hours) * 60 + int(minutes)
+
+
+def parse_ordinal(date_str: str) -> int:
+    """Convert an ISO date to a proleptic ordinal, 0 if invalid (cached, see dates.iso_ordinal)."""
+    return iso_ordinal(date_str)
+
+
+class Screening(Mapping):
+    """
+    One screening: title, date, time, day, cinema.
+
+    Dates are stored as ordinals and times as minutes since midnight, so
+    filters compare ints instead of parsing strings. Day and cinema names are
+    interned codes. The record is read-only and still behaves like the old
+    dict: s["date"] -> "2026-01-24", s["time"] -> "18:00", dict(s) etc.
+    An unparseable date is stored as ordinal 0, an unparseable time as -1.
+    """
+
+    __slots__ = ("title", "ordinal", "minutes", "_day", "_cinema")
+
+    def __init__(self, title: str, date: str, time: str, day: str, cinema: str = ""):
+        set_ = object.__setattr__
+        set_(self, "title", sys.intern(title))
+        set_(self, "ordinal", parse_ordinal(date))
+        set_(self, "minutes", parse_minutes(time))
+        set_(self, "_day", DAYS.code(day))
+        set_(self, "_cinema", CINEMAS.code(cinema))
+
+    @classmethod
+    def from_ordinal(cls, title: str, ordinal: int, minutes: int, day: str, cinema: str = "") -> "Screening":
+        """Build a record from already-converted values, skipping string parsing."""
+        s = object.__new__(cls)
+        set_ = object.__setattr__
+        set_(s, "title", sys.intern(title))
+        set_(s, "ordinal", ordinal)
+        set_(s, "minutes", minutes)
+        set_(s, "_day", DAYS.code(day))
+        set_(s, "_cinema", CINEMAS.code(cinema))
+        return s
+
+    @property
+    def date(self) -> str:
+        return datetime.date.fromordinal(self.ordinal).isoformat() if self.ordinal > 0 else ""
+
+    @property
+    def date_value(self) -> datetime.date | None:
+        return datetime.date.fromordinal(self.ordinal) if self.ordinal > 0 else None
+
+    @property
+    def time(self) -> str:
+        if self.minutes < 0:
+            return ""
+        return f"{self.minutes // 60:02d}:{self.minutes % 60:02d}"
+
+    @property
+    def day(self) -> str:
+        return DAYS.names[self._day]
+
+    @property
+    def cinema(self) -> str:
+        return CINEMAS.names[self._cinema]
+
+    def replace(self, **changes) -> "Screening":
+        """Return a copy with some fields changed, e.g. s.replace(cinema="KIKA")."""
+        if set(changes) <= {"day", "cinema"}:
+            return Screening.from_ordinal(
+                self.title, self.ordinal, self.minutes,
+                changes.get("day", self.day), changes.get("cinema", self.cinema),
+            )
+        fields = self.to_dict()
+        fields.update(changes)
+        return Screening(**fields)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in KEYS}
+
+    # Mapping interface (dict-compatible view)
+
+    def __getitem__(self, key: str):
+        if key not in KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(KEYS)
+
+    def __len__(self) -> int:
+        return len(KEYS)
+
+    # Value semantics
+
+    def _key(self) -> tuple:
+        return (self.title, self.ordinal, self.minutes, self._day, self._cinema)
+
+    def __eq__(self, other):
+        if isinstance(other, Screening):
+            return self._key() == other._key()
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Screening is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Screening is immutable")
+
+    def __reduce__(self):
+        return (Screening.from_ordinal, (self.title, self.ordinal, self.minutes, self.day, self.cinema))
+
+    def __repr__(self) -> str:
+        return (f"Screening(title={self.title!r}, date={self.date!r}, time={self.time!r}, "
+                f"day={self.day!r}, cinema={self.cinema!r})")
@@ -0,0 +1,140 @@
+"""Title search index: prefix, substring and fuzzy matching over distinct titles."""
+
+from titles import fold_text, trigrams
+
+# Minimum trigram Dice similarity for a fuzzy token match ("zolw" ~ "zółwie")
+FUZZY_SIMILARITY = 0.5
+
+
+class _Node:
+    """Prefix trie node holding the titles of every token below it."""
+
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children = {}
+        self.ids = set()
+
+
+class TitleIndex:
+    """
+    Search index built once per dataset over its distinct titles.
+
+    Titles and queries are folded (case, diacritics, punctuation), so "zolw"
+    finds "Żółw". Each query word must match a word of the title: as a
+    prefix (trie), as a substring (trigram postings for three letters or
+    more, a scan of the distinct titles for shorter words, so "ół" finds
+    "Żółw") or, when nothing else matches, as a similar word (trigram
+    Dice). A title
+    containing the whole query also matches, so "a te" still finds "...a
+    tęsknota". Titles match through their canonical name too (see
+    titles.canonical_map).
+    """
+
+    def __init__(self, titles: dict[str, str] | list[str]):
+        """
+        Args:
+            titles: Distinct titles, or title -> canonical title
+        """
+        canonical = titles if isinstance(titles, dict) else {title: title for title in titles}
+        self.titles = sorted(canonical)
+        self.folded = [
+            f"{fold_text(title)}\n{fold_text(canonical[title])}" for title in self.titles
+        ]
+
+        self.root = _Node()
+        words = {}  # word -> title ids
+        for i, text in enumerate(self.folded):
+            for word in text.split():
+                words.setdefault(word, set()).add(i)
+        self.words = words
+
+        for word, ids in words.items():
+            node = self.root
+            for char in word:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                child.ids |= ids
+                node = child
+
+        # Substring postings: trigram -> title ids; fuzzy postings: padded trigram -> words
+        self.substrings = {}
+        for i, text in enumerate(self.folded):
+            for gram in {text[k:k + 3] for k in range(len(text) - 2)}:
+                self.substrings.setdefault(gram, set()).add(i)
+        self.word_grams = {word: trigrams(word) for word in words}
+        self.fuzzy = {}
+        for word, grams in self.word_grams.items():
+            for gram in grams:
+                self.fuzzy.setdefault(gram, []).append(word)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _prefix(self, word: str) -> set[int]:
+        node = self.root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+    def _substring(self, word: str) -> set[int]:
+        postings = sorted(
+            (self.substrings.get(word[k:k + 3], set()) for k in range(len(word) - 2)), key=len
+        )
+        # Rarest trigram first; the survivors are checked, as trigrams may be out of order
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids &= posting
+            if not ids:
+                break
+        return {i for i in ids if word in self.folded[i]}
+
+    def _scan(self, word: str) -> set[int]:
+        # Too short for the trigram postings: test every distinct title
+        return {i for i, text in enumerate(self.folded) if word in text}
+
+    def _similar(self, word: str, threshold: float) -> set[int]:
+        grams = trigrams(word)
+        shared = {}
+        for gram in grams:
+            for other in self.fuzzy.get(gram, ()):
+                shared[other] = shared.get(other, 0) + 1
+        ids = set()
+        for other, count in shared.items():
+            if 2 * count >= threshold * (len(grams) + len(self.word_grams[other])):
+                ids |= self.words[other]
+        return ids
+
+    def search(self, query: str, fuzzy: bool = True, threshold: float = FUZZY_SIMILARITY) -> list[str]:
+        """
+        Titles matching every word of query, in sorted order.
+
+        Args:
+            query: Search text; an empty query matches every title
+            fuzzy: Fall back to similar words for a word matching nothing
+            threshold: Minimum trigram Dice similarity of a fuzzy match
+
+        Returns:
+            Matching titles (as given, not folded)
+        """
+        phrase = fold_text(query)
+        if not phrase:
+            return list(self.titles)
+
+        matched = None
+        for word in phrase.split():
+            if len(word) >= 3:
+                ids = self._prefix(word) | self._substring(word)
+                if not ids and fuzzy:
+                    ids = self._similar(word, threshold)
+            else:
+                ids = self._scan(word)  # prefix matches included
+            matched = set(ids) if matched is None else matched & ids
+            if not matched:
+                break
+        if " " in phrase and len(phrase) >= 3:
+            matched |= self._substring(phrase)
+        return [self.titles[i] for i in sorted(matched)]
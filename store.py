@@ -0,0 +1,206 @@
+"""Persistent SQLite store of screenings, kept across runs and weeks."""
+
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+
+import fetch
+from screening import Screening, parse_minutes
+
+DB_NAME = "screenings.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS screenings (
+    cinema_key  TEXT    NOT NULL,
+    ordinal     INTEGER NOT NULL,
+    minutes     INTEGER NOT NULL,
+    title       TEXT    NOT NULL,
+    title_norm  TEXT    NOT NULL,
+    day         TEXT    NOT NULL,
+    cinema      TEXT    NOT NULL,
+    first_seen  REAL    NOT NULL,
+    last_seen   REAL    NOT NULL,
+    PRIMARY KEY (cinema_key, ordinal, minutes, title)
+);
+CREATE INDEX IF NOT EXISTS screenings_when ON screenings (ordinal, minutes);
+CREATE INDEX IF NOT EXISTS screenings_cinema ON screenings (cinema, ordinal, minutes);
+CREATE INDEX IF NOT EXISTS screenings_title ON screenings (title_norm);
+
+CREATE TABLE IF NOT EXISTS cinemas (
+    cinema_key  TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    content_key TEXT NOT NULL,
+    updated     REAL NOT NULL,
+    count       INTEGER NOT NULL
+);
+"""
+
+# One writer at a time; SQLite would otherwise make concurrent fetch threads retry
+_write_lock = threading.Lock()
+
+# Database files whose schema was already created by this process
+_ready = set()
+
+
+def db_path():
+    return fetch.CACHE_DIR / DB_NAME
+
+
+def normalize(title: str) -> str:
+    """Key titles are indexed under: whitespace- and case-insensitive."""
+    return " ".join(title.split()).casefold()
+
+
+def connect() -> sqlite3.Connection:
+    """Open the store, creating the schema on first use."""
+    fetch.ensure_cache_dir()
+    path = db_path()
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if path not in _ready:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _ready.add(path)
+    return conn
+
+
+def save(cinema_key: str, name: str, content_key: str, screenings: list[Screening]) -> bool:
+    """
+    Upsert one cinema's freshly parsed screenings in a single transaction.
+
+    The page is authoritative from its earliest date onwards: stored rows
+    in that window that the page no longer lists (cancelled or moved
+    screenings) are deleted, while everything before it is kept as history.
+    Nothing is written when content_key matches the last save for the cinema.
+    An empty page updates nothing but the refresh time, so a broken page does
+    not wipe the stored schedule.
+
+    Returns:
+        True if the store was updated, False if unchanged or unavailable
+    """
+    now = time.time()
+    rows = [
+        (cinema_key, s.ordinal, s.minutes, s.title, normalize(s.title), s.day, s.cinema, now, now)
+        for s in screenings
+    ]
+    dated = [row[1] for row in rows if row[1] > 0]
+
+    try:
+        with _write_lock:
+            conn = connect()
+            try:
+                with conn:
+                    stored = conn.execute(
+                        "SELECT content_key FROM cinemas WHERE cinema_key = ?", (cinema_key,)
+                    ).fetchone()
+                    if stored is not None and stored[0] == content_key:
+                        return False
+
+                    if rows:
+                        conn.execute("CREATE TEMP TABLE IF NOT EXISTS page "
+                                     "(ordinal INTEGER, minutes INTEGER, title TEXT)")
+                        conn.execute("DELETE FROM temp.page")
+                        conn.executemany("INSERT INTO temp.page VALUES (?, ?, ?)",
+                                         [row[1:4] for row in rows])
+                        conn.execute(
+                            """
+                            DELETE FROM screenings
+                            WHERE cinema_key = ? AND (ordinal >= ? OR ordinal = 0)
+                              AND (ordinal, minutes, title) NOT IN (SELECT * FROM temp.page)
+                            """,
+                            (cinema_key, min(dated) if dated else 0),
+                        )
+                        conn.executemany(
+                            """
+                            INSERT INTO screenings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT (cinema_key, ordinal, minutes, title) DO UPDATE SET
+                                title_norm = excluded.title_norm,
+                                day = excluded.day,
+                                cinema = excluded.cinema,
+                                last_seen = excluded.last_seen
+                            """,
+                            rows,
+                        )
+
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cinemas VALUES (?, ?, ?, ?, ?)",
+                        (cinema_key, name, content_key, now, len(rows)),
+                    )
+            finally:
+                conn.close()
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def query(
+    from_date: date,
+    to_date: date,
+    min_time: str | None = None,
+    max_time: str | None = None,
+    cinemas: set[str] | None = None,
+    title: str | None = None
+) -> list[Screening]:
+    """
+    Stored screenings matching a filter, in (date, time) order.
+
+    Same filters as core.filter_screenings, run as an indexed SQL query
+    (screenings at the same date and time may come back in a different
+    order). title matches whole titles, ignoring case and spacing.
+    """
+    clauses = ["ordinal BETWEEN ? AND ?"]
+    params = [max(from_date.toordinal(), 1), to_date.toordinal()]
+    if min_time:
+        clauses.append("minutes >= ?")
+        params.append(parse_minutes(min_time))
+    if max_time:
+        clauses.append("minutes <= ?")
+        params.append(parse_minutes(max_time))
+    if cinemas:
+        clauses.append(f"cinema IN ({', '.join('?' * len(cinemas))})")
+        params.extend(sorted(cinemas))
+    if title:
+        clauses.append("title_norm = ?")
+        params.append(normalize(title))
+
+    return _select(" AND ".join(clauses), params)
+
+
+def load_all(since: date | None = None) -> list[Screening]:
+    """Every stored screening (from since onwards), in (date, time) order."""
+    if since is None:
+        return _select("1", [])
+    return _select("ordinal >= ?", [since.toordinal()])
+
+
+def _select(where: str, params: list) -> list[Screening]:
+    sql = (f"SELECT title, ordinal, minutes, day, cinema FROM screenings "
+           f"WHERE {where} ORDER BY ordinal, minutes, rowid")
+    try:
+        conn = connect()
+    except sqlite3.Error:
+        return []
+    try:
+        return [Screening.from_ordinal(*row) for row in conn.execute(sql, params)]
+    except sqlite3.Error:
+        return []
+    finally:
+        conn.close()
+
+
+def last_updated() -> dict[str, datetime]:
+    """When each stored cinema was last refreshed, keyed by display name."""
+    try:
+        conn = connect()
+    except sqlite3.Error:
+        return {}
+    try:
+        return {
+            name: datetime.fromtimestamp(updated)
+            for name, updated in conn.execute("SELECT name, updated FROM cinemas")
+        }
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
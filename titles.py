@@ -0,0 +1,228 @@
+"""Canonical movie titles: merge spellings of the same film across cinemas."""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+
+# Dice similarity of title trigrams at or above which two titles are one film
+SIMILARITY = 0.8
+
+# Screening-version tags cinemas append to titles, in brackets or after a dash
+TAGS = (
+    "napisy", "z napisami", "dubbing", "lektor", "wersja oryginalna", "wersja polska",
+    "pl", "2d", "3d", "imax", "premiera", "przedpremiera", "pokaz specjalny",
+    "pokaz przedpremierowy", "seans specjalny", "kino dla seniora", "kino dla dzieci",
+)
+_TAG = "|".join(re.escape(tag) for tag in sorted(TAGS, key=len, reverse=True))
+TAG_RE = re.compile(
+    rf"\s*(?:[(\[]\s*(?:{_TAG})(?:\s*[,/+]\s*(?:{_TAG}))*\s*[)\]]|[-–|/]\s*(?:{_TAG})\b)",
+    re.IGNORECASE,
+)
+NON_WORD_RE = re.compile(r"[\W_]+")
+DIGITS_RE = re.compile(r"\d+")
+
+# Sequel and part numbers spelled out, as they appear in folded keys
+ROMAN = {numeral: n for n, numeral in enumerate(
+    ("i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x",
+     "xi", "xii", "xiii", "xiv", "xv", "xvi", "xvii", "xviii", "xix", "xx"), 1)}
+PART_WORDS = {"czesc", "part"}
+NUMBER_WORDS = {
+    "pierwsza": 1, "druga": 2, "trzecia": 3, "czwarta": 4, "piata": 5,
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+}
+
+# Letters NFKD does not decompose
+_FOLD_EXTRA = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+
+def strip_tags(title: str) -> str:
+    """Drop "(napisy)", "- dubbing", "[2D]" and similar version tags."""
+    stripped = TAG_RE.sub("", title).strip()
+    return stripped or title.strip()
+
+
+def fold_text(text: str) -> str:
+    """Case and diacritics folded, punctuation collapsed: "Żółw!" -> "zolw"."""
+    text = text.casefold().translate(_FOLD_EXTRA)
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return NON_WORD_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=65536)
+def fold(title: str) -> str:
+    """
+    Comparison key for a title: tags removed, then fold_text.
+    "Emilia Pérez (napisy)" -> "emilia perez".
+    """
+    return fold_text(strip_tags(title))
+
+
+def sequel_numbers(key: str) -> tuple[int, ...]:
+    """
+    The numbers telling a film from its sequels, from a folded key.
+
+    Digits, Roman numerals up to xx and the number after "czesc"/"part"
+    all count, so "ojciec chrzestny ii" -> (2,) and "diuna czesc druga"
+    -> (2,). A lone "i" is the Polish "and" unless it ends the title or
+    follows "czesc"/"part".
+    """
+    words = key.split()
+    numbers = []
+    for n, word in enumerate(words):
+        after_part = n > 0 and words[n - 1] in PART_WORDS
+        if word in ROMAN and (word != "i" or after_part or n == len(words) - 1):
+            numbers.append(ROMAN[word])
+        elif after_part and word in NUMBER_WORDS:
+            numbers.append(NUMBER_WORDS[word])
+        else:
+            numbers.extend(int(digits) for digits in DIGITS_RE.findall(word))
+    return tuple(numbers)
+
+
+def trigrams(key: str) -> frozenset[str]:
+    """
+    Padded trigrams of key, each repeat tagged with its count ("sin", "sin2"...).
+
+    Set intersections then count repeated trigrams as a multiset would, so
+    "sing sing" is not a near-copy of "sing".
+    """
+    padded = f"  {key} "
+    seen = Counter()
+    grams = []
+    for i in range(len(padded) - 2):
+        gram = padded[i:i + 3]
+        seen[gram] += 1
+        grams.append(gram if seen[gram] == 1 else f"{gram}{seen[gram]}")
+    return frozenset(grams)
+
+
+def _display_rank(title: str, count: int):
+    # Prefer the most screened spelling, then one keeping its diacritics, then the shortest
+    return (-count, -sum(ord(c) > 127 for c in title), len(title), title)
+
+
+class _Clusters:
+    """Union-find over title keys."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def similar_keys(keys: list[str], threshold: float = SIMILARITY) -> list[tuple[int, int]]:
+    """
+    Pairs (i, j) of keys whose trigram Dice similarity reaches threshold.
+
+    Uses prefix filtering instead of comparing every pair: trigrams are
+    ordered rarest first, and two keys similar enough must share one of the
+    first few trigrams of each (how many follows from threshold). Only those
+    prefixes are indexed, so common trigrams (" po", "ie "...) never produce
+    candidates, and no similar pair is missed. Keys with different sequel
+    numbers ("Toy Story 3" / "Toy Story 4", "Ojciec chrzestny II" /
+    "Ojciec chrzestny", see sequel_numbers) are never paired, nor are keys
+    shorter than four characters.
+    """
+    eligible = [i for i, key in enumerate(keys) if len(key) >= 4]
+    grams = {i: trigrams(keys[i]) for i in eligible}
+    numbers = {i: sequel_numbers(keys[i]) for i in eligible}
+    frequency = Counter(gram for i in eligible for gram in grams[i])
+    # Global order of trigrams, rarest first
+    rank = {gram: n for n, gram in enumerate(sorted(frequency, key=lambda g: (frequency[g], g)))}
+
+    # A Dice score >= t needs the smaller set to be at least t / (2 - t) of the
+    # larger, so the two share at least t * (1 + ratio) / 2 of the larger set
+    ratio = threshold / (2 - threshold)
+    share = threshold * (1 + ratio) / 2
+
+    # gram -> ([key], [trigram count of key]), both in ascending size
+    postings = {}
+    pairs = []
+    # Shortest first: candidates are always earlier, no larger than the key
+    for i in sorted(eligible, key=lambda i: len(grams[i])):
+        key_grams = grams[i]
+        size = len(key_grams)
+        prefix = size - math.ceil(share * size - 1e-9) + 1
+        smallest = ratio * size - 1e-9
+
+        candidates = set()
+        for gram in sorted(key_grams, key=rank.__getitem__)[:prefix]:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = ([], [])
+            else:
+                # Skip keys too short to reach the threshold
+                candidates.update(posting[0][bisect_left(posting[1], smallest):])
+            posting[0].append(i)
+            posting[1].append(size)
+
+        for j in candidates:
+            if numbers[j] != numbers[i]:
+                continue
+            if 2 * len(key_grams & grams[j]) >= threshold * (size + len(grams[j])):
+                pairs.append((min(i, j), max(i, j)))
+    return pairs
+
+
+def canonical_titles(titles: Counter | dict[str, int], threshold: float = SIMILARITY) -> dict[str, str]:
+    """
+    Map every title to the canonical title of its film.
+
+    Titles are first merged when their folded keys are equal, then when the
+    keys are similar (see similar_keys). Each group is named after its most
+    screened spelling, with version tags removed.
+
+    Args:
+        titles: Title -> number of screenings (a Counter works)
+        threshold: Minimum trigram Dice similarity for a fuzzy merge
+
+    Returns:
+        Dict from each input title to its canonical title
+    """
+    by_key = {}
+    for title, count in titles.items():
+        key = fold(title)
+        by_key.setdefault(key, []).append((title, count))
+
+    keys = list(by_key)
+    clusters = _Clusters(len(keys))
+    for i, j in similar_keys(keys, threshold):
+        clusters.union(i, j)
+
+    members = {}
+    for i, key in enumerate(keys):
+        members.setdefault(clusters.find(i), []).extend(by_key[key])
+
+    mapping = {}
+    for group in members.values():
+        # Spellings differing only in tags count as one for choosing the name
+        spellings = Counter()
+        for title, count in group:
+            spellings[strip_tags(title)] += count
+        canonical = min(spellings.items(), key=lambda item: _display_rank(*item))[0]
+        for title, _ in group:
+            mapping[title] = canonical
+    return mapping
+
+
+@lru_cache(maxsize=8)
+def _canonical_for(items: frozenset) -> dict[str, str]:
+    return canonical_titles(dict(items))
+
+
+def canonical_map(screenings) -> dict[str, str]:
+    """canonical_titles for the titles of some screenings, memoized per title set."""
+    return _canonical_for(frozenset(Counter(s.title for s in screenings).items()))